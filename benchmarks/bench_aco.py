@@ -0,0 +1,82 @@
+"""
+Benchmark of the graph solvers in resources/aco.py on random euclidean TSP instances of the sizes
+of the common TSPLIB instances eil51, kroA100 and ch150.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_aco
+    python -m benchmarks.bench_aco --sizes 51 100 --iterations 200 --json results.json
+"""
+import argparse
+import json
+import time
+
+from resources.aco import TSPSolver, nearest_neighbour_length, random_instance
+
+
+def run_benchmark(sizes=(51, 100, 150), iterations=100, variants=("as", "mmas"), seed=0):
+    """
+    Solves one random instance per size with every variant.
+    ----------
+
+    Args:
+    sizes (tuple):
+        The numbers of nodes.
+    iterations (int):
+        The iterations per run.
+    variants (tuple):
+        The update rules to compare.
+    seed (int):
+        Seed of the instances and the solvers.
+    ----------
+
+    Returns:
+    list:
+        One dictionary per run with the best length, the nearest neighbour length and the timings.
+    """
+    results = []
+    for n_nodes in sizes:
+        _, distances = random_instance(n_nodes, seed=seed)
+        reference = nearest_neighbour_length(distances)
+        for variant in variants:
+            solver = TSPSolver(distances, variant=variant, beta=5, seed=seed)
+            start = time.perf_counter()
+            _, best_length = solver.solve(iterations)
+            elapsed = time.perf_counter() - start
+            results.append({
+                "nodes": n_nodes,
+                "variant": variant,
+                "ants": solver.n_ants,
+                "iterations": iterations,
+                "best length": best_length,
+                "nearest neighbour length": reference,
+                "ratio": best_length / reference,
+                "seconds": elapsed,
+                "ms per iteration": 1000 * elapsed / iterations,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ACO graph solvers on random TSP instances.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[51, 100, 150])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--variants", nargs="+", default=["as", "mmas"], choices=["as", "mmas"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.iterations, args.variants, args.seed)
+
+    print(f"{'nodes':>6} {'variant':>8} {'best':>10} {'NN':>10} {'ratio':>6} {'ms/iter':>8}")
+    for result in results:
+        print(f"{result['nodes']:>6} {result['variant']:>8} {result['best length']:>10.1f} "
+              f"{result['nearest neighbour length']:>10.1f} {result['ratio']:>6.3f} {result['ms per iteration']:>8.2f}")
+
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(results, json_file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
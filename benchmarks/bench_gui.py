@@ -0,0 +1,168 @@
+"""
+Frame cost benchmark of SimulationWidget. The widget is driven without a visible window, through the offscreen
+video driver of SDL, for scripted scenes that vary the ant count, the pheromone display and the zoom level. For every
+scene the number of canvas instructions, the milliseconds of the redraw after an epoch (update_canvas) and of the
+frames in between (render_frame, which only moves the ants) are reported, so renderer changes can be measured
+separately from the simulation engine.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_gui
+    python -m benchmarks.bench_gui --ants 1000 10000 --zoom 1 --json frames.json
+    python -m benchmarks.bench_gui --mock-gl
+
+With --mock-gl Kivy uses its mock OpenGL backend, which only measures building the instructions on the CPU.
+"""
+import argparse
+import json
+import os
+import time
+from collections import Counter
+
+import numpy as np
+
+from benchmarks.bench_simulation import BASE_CASE, BOUNDS, build_case, get_metadata
+
+
+def load_widget(mock_gl=False):
+    """
+    Imports the GUI with a hidden window and returns the GUI module and a new SimulationWidget.
+    The environment has to be set before Kivy is imported for the first time.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+    if mock_gl:
+        os.environ["KIVY_GL_BACKEND"] = "mock"
+    from resources import gui
+
+    gui.sim.clear()
+    gui.sim.bounds = BOUNDS
+    return gui, gui.SimulationWidget()
+
+
+def count_instructions(widget):
+    """
+    Counts the canvas instructions of the static and the dynamic layer by type.
+    """
+    counts = Counter()
+    for layer in (widget.static_layer, widget.epoch_layer, widget.ant_layer):
+        counts.update(type(instruction).__name__ for instruction in layer.children)
+    return counts
+
+
+def time_scene(gui, widget, ants, show_pheromone, zoom, frames=20, epochs=10, seed=0):
+    """
+    Draws one scene repeatedly.
+    ----------
+
+    Args:
+    gui (module):
+        The GUI module, its simulation is filled with the scene.
+    widget (SimulationWidget):
+        The widget to draw.
+    ants (int):
+        The number of ants.
+    show_pheromone (bool):
+        Whether the pheromone grid is drawn.
+    zoom (float):
+        The scale of the widget. Small scales and many ants switch to the heatmap.
+    frames (int):
+        The number of timed frames.
+    epochs (int):
+        The number of epochs run before drawing, so the ants spread and leave pheromone.
+    seed (int):
+        Seed of the scene.
+    ----------
+
+    Returns:
+    dict:
+        The scene with the time of the first redraw, which also draws the static layer, the mean, median and maximum
+        time of the following redraws and the mean time of the frames between epochs in milliseconds and the number
+        of instructions per frame.
+    """
+    sim = build_case({**BASE_CASE, "ants": ants}, seed, simulation=gui.sim)
+    for _ in range(epochs):
+        sim.next_epoch()
+    for colony in sim.colonies:
+        colony.show_pheromone = show_pheromone
+    widget.is_running = False
+    widget.static_layer_key = None
+    widget.scale = zoom
+
+    start = time.perf_counter()
+    widget.update_canvas()
+    first = time.perf_counter() - start
+
+    times = np.empty(frames)
+    for frame in range(frames):
+        start = time.perf_counter()
+        widget.update_canvas()
+        times[frame] = time.perf_counter() - start
+
+    widget.is_running = True
+    widget.previous_positions = widget.current_positions = {id(colony): colony.get_ant_positions() for colony in sim.colonies}
+    frame_times = np.empty(frames)
+    for frame in range(frames):
+        start = time.perf_counter()
+        widget.render_frame(0)
+        frame_times[frame] = time.perf_counter() - start
+    widget.is_running = False
+
+    instructions = count_instructions(widget)
+    return {"ants": ants,
+            "pheromone": show_pheromone,
+            "zoom": zoom,
+            "heatmap": widget.heatmap_active,
+            "instructions": sum(instructions.values()),
+            "instruction types": dict(instructions),
+            "first frame ms": first * 1000,
+            "mean ms": float(times.mean() * 1000),
+            "median ms": float(np.median(times) * 1000),
+            "max ms": float(times.max() * 1000),
+            "frame ms": float(frame_times.mean() * 1000)}
+
+
+def run_benchmark(ant_counts=(100, 1000, 10000), pheromone=(False, True), zooms=(0.4, 1, 2.5), frames=20, seed=0, mock_gl=False):
+    """
+    Draws every combination of ant count, pheromone display and zoom level.
+    ----------
+
+    Returns:
+    dict:
+        The metadata and one result per scene.
+    """
+    gui, widget = load_widget(mock_gl)
+    results = [time_scene(gui, widget, ants, show_pheromone, zoom, frames, seed=seed)
+               for ants in ant_counts for show_pheromone in pheromone for zoom in zooms]
+    metadata = get_metadata()
+    metadata["gl backend"] = os.environ.get("KIVY_GL_BACKEND", "default")
+    return {"metadata": metadata, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the frame cost of the simulation widget without a visible window.")
+    parser.add_argument("--ants", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--pheromone", choices=["off", "on", "both"], default="both")
+    parser.add_argument("--zoom", type=float, nargs="+", default=[0.4, 1, 2.5])
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mock-gl", action="store_true", help="use the mock OpenGL backend of Kivy")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    pheromone = {"off": (False,), "on": (True,), "both": (False, True)}[args.pheromone]
+    report = run_benchmark(args.ants, pheromone, args.zoom, args.frames, args.seed, args.mock_gl)
+
+    print(f"{'ants':>7} {'pheromone':>9} {'zoom':>5} {'heatmap':>7} {'instructions':>12} {'first ms':>9} {'mean ms':>8} {'max ms':>8} {'frame ms':>8}")
+    for result in report["results"]:
+        print(f"{result['ants']:>7} {str(result['pheromone']):>9} {result['zoom']:>5} {str(result['heatmap']):>7} "
+              f"{result['instructions']:>12} {result['first frame ms']:>9.2f} {result['mean ms']:>8.2f} {result['max ms']:>8.2f} {result['frame ms']:>8.2f}")
+
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(report, json_file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
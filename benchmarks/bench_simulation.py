@@ -0,0 +1,304 @@
+"""
+Scaling benchmark of Simulation.next_epoch. Starting from a base case, one variable at a time is swept
+(ant count, pheromone grid shape, search radius, obstacle count, food count, colony count), so every sweep
+gives a complexity curve of the time per epoch over that variable.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_simulation
+    python -m benchmarks.bench_simulation --preset full --json results.json
+    python -m benchmarks.bench_simulation --baseline results.json --threshold 0.15
+
+With a baseline the cases are compared with the saved results, and the exit code is 1 if any case got slower
+than the threshold allows. Results are only comparable on the same machine, see the metadata in the JSON.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from resources.colony import Colony
+from resources.food import Food
+from resources.obstacle import Obstacle
+from resources.simulation import Simulation
+
+BOUNDS = (0, 720, -480, 0)
+
+BASE_CASE = {"ants": 1000, "grid": (48, 72), "search radius": 1, "obstacles": 0, "food": 1, "colonies": 1}
+
+PRESETS = {
+    "quick": {
+        "ants": [100, 1000, 10000],
+        "grid": [(24, 36), (48, 72), (96, 144)],
+        "search radius": [1, 4, 16],
+        "obstacles": [0, 10, 50],
+        "food": [1, 10, 50],
+        "colonies": [1, 2, 4],
+    },
+    "full": {
+        "ants": [100, 300, 1000, 3000, 10000, 30000, 100000],
+        "grid": [(12, 18), (24, 36), (48, 72), (96, 144), (192, 288), (480, 720)],
+        "search radius": [1, 2, 4, 8, 16, 32],
+        "obstacles": [0, 10, 50, 200],
+        "food": [1, 10, 50, 200],
+        "colonies": [1, 2, 4, 8],
+    },
+}
+
+
+def build_case(case, seed=0, simulation=None):
+    """
+    Builds a simulation for one benchmark case. Obstacles and food are placed at random, the ants are split
+    evenly between the colonies and start spread over the simulation area.
+    ----------
+
+    Args:
+    case (dict):
+        The variables of the case, with the keys of BASE_CASE.
+    seed (int):
+        Seed of the placement and the simulation.
+    simulation (Simulation, optional):
+        The simulation to fill, existing objects are removed. Defaults to a new one.
+    ----------
+
+    Returns:
+    Simulation:
+        The filled simulation.
+    """
+    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
+    sim = Simulation() if simulation is None else simulation
+    sim.clear()
+    sim.bounds = BOUNDS
+    min_x, max_x, min_y, max_y = BOUNDS
+
+    for _ in range(case["obstacles"]):
+        size = tuple(rng.uniform(20, 60, 2).round())
+        coordinates = (rng.uniform(min_x, max_x - size[0]), rng.uniform(min_y, max_y - size[1]))
+        sim.add_obstacle(Obstacle(coordinates=coordinates, size=size))
+
+    for index in range(case["colonies"]):
+        amount = case["ants"] // case["colonies"] + (index < case["ants"] % case["colonies"])
+        coordinates = (rng.uniform(min_x, max_x - 100), rng.uniform(min_y, max_y - 100))
+        colony = Colony(grid_pheromone_shape=tuple(case["grid"]), amount=0, size=(100, 100), coordinates=coordinates, color=(1, 0, 0, 1))
+        colony.amount = amount
+        colony.add_ants(search_radius=case["search radius"])
+        for ant in colony.ants:
+            ant.coordinates = (rng.uniform(min_x, max_x), rng.uniform(min_y, max_y))
+        sim.add_colony(colony)
+
+    for _ in range(case["food"]):
+        coordinates = (rng.uniform(min_x, max_x - 100), rng.uniform(min_y, max_y - 100))
+        sim.add_food(Food(size=(100, 100), coordinates=coordinates, amount_of_food=10 ** 6))
+    return sim
+
+
+def time_case(case, epochs=20, warmup=3, seed=0):
+    """
+    Times the epochs of one case.
+    ----------
+
+    Args:
+    case (dict):
+        The variables of the case.
+    epochs (int):
+        The number of timed epochs.
+    warmup (int):
+        The number of epochs run before timing, so the pheromone trails and caches are built up.
+    seed (int):
+        Seed of the case.
+    ----------
+
+    Returns:
+    dict:
+        The case with the mean, median and minimum milliseconds per epoch and the phase profile.
+    """
+    sim = build_case(case, seed)
+    for _ in range(warmup):
+        sim.next_epoch()
+
+    sim.profiler.enabled = True
+    times = np.empty(epochs)
+    for epoch in range(epochs):
+        start = time.perf_counter()
+        sim.next_epoch()
+        times[epoch] = time.perf_counter() - start
+
+    return {**case,
+            "grid": list(case["grid"]),
+            "epochs": epochs,
+            "mean ms": float(times.mean() * 1000),
+            "median ms": float(np.median(times) * 1000),
+            "min ms": float(times.min() * 1000),
+            "phases": {name: phase["p50_ms"] for name, phase in sim.profiler.get_summary().items()}}
+
+
+def get_case_key(result):
+    """
+    Returns the variables of a case as a string, used to match results with the baseline.
+    """
+    return ", ".join(f"{name}={tuple(result[name]) if name == 'grid' else result[name]}" for name in BASE_CASE)
+
+
+def get_metadata():
+    """
+    Describes the machine and the code the benchmark ran on.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"date": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit,
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu count": os.cpu_count()}
+
+
+def run_benchmark(preset="quick", variables=None, epochs=20, warmup=3, seed=0):
+    """
+    Sweeps every variable of a preset while the other variables keep the values of the base case.
+    ----------
+
+    Args:
+    preset (str):
+        "quick" or "full".
+    variables (list, optional):
+        The variables to sweep. Defaults to all variables of the preset.
+    epochs (int):
+        The number of timed epochs per case.
+    warmup (int):
+        The number of epochs run before timing.
+    seed (int):
+        Seed of the cases.
+    ----------
+
+    Returns:
+    dict:
+        The metadata and one result per case. Every result names the variable it belongs to in "sweep".
+    """
+    sweeps = PRESETS[preset]
+    results = []
+    for variable in variables or list(sweeps):
+        for value in sweeps[variable]:
+            case = {**BASE_CASE, variable: value}
+            results.append({"sweep": variable, **time_case(case, epochs, warmup, seed)})
+    return {"metadata": get_metadata(), "preset": preset, "results": results}
+
+
+def get_complexity_curves(results):
+    """
+    Collects the time per epoch over the swept value of every sweep and fits the exponent k of time ~ value^k
+    on a log-log scale. For the grid the number of cells is used as value.
+    ----------
+
+    Args:
+    results (list):
+        The results of run_benchmark().
+    ----------
+
+    Returns:
+    dict:
+        For every swept variable the points (value, mean ms) and the fitted exponent, None for fewer than two
+        positive values.
+    """
+    curves = {}
+    for result in results:
+        variable = result["sweep"]
+        value = int(np.prod(result["grid"])) if variable == "grid" else result[variable]
+        curves.setdefault(variable, {"points": []})["points"].append((value, result["mean ms"]))
+
+    for curve in curves.values():
+        points = np.array([point for point in curve["points"] if point[0] > 0], dtype=float)
+        curve["exponent"] = None
+        if len(np.unique(points[:, 0])) >= 2:
+            curve["exponent"] = float(np.polyfit(np.log(points[:, 0]), np.log(points[:, 1]), 1)[0])
+    return curves
+
+
+def compare_with_baseline(results, baseline, threshold=0.1):
+    """
+    Compares the mean time per epoch of every case with the same case in a baseline.
+    ----------
+
+    Args:
+    results (list):
+        The current results.
+    baseline (list):
+        The saved results.
+    threshold (float):
+        The allowed relative slowdown, 0.1 allows 10 %.
+    ----------
+
+    Returns:
+    list:
+        One dictionary per case found in both, with the times, their ratio and whether it is a regression.
+    """
+    saved = {get_case_key(result): result for result in baseline}
+    comparison = []
+    for result in results:
+        key = get_case_key(result)
+        if key not in saved:
+            continue
+        ratio = result["mean ms"] / saved[key]["mean ms"]
+        comparison.append({"case": key,
+                           "baseline ms": saved[key]["mean ms"],
+                           "current ms": result["mean ms"],
+                           "ratio": ratio,
+                           "regression": ratio > 1 + threshold})
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Simulation.next_epoch over ant count, grid, search radius, obstacles, food and colonies.")
+    parser.add_argument("--preset", default="quick", choices=list(PRESETS))
+    parser.add_argument("--variables", nargs="+", choices=list(BASE_CASE), help="sweep only these variables")
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare with the results in this file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative slowdown against the baseline")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.preset, args.variables, args.epochs, args.warmup, args.seed)
+    report["curves"] = get_complexity_curves(report["results"])
+
+    print(f"{'sweep':>14} {'value':>12} {'mean ms':>10} {'median ms':>10}")
+    for result in report["results"]:
+        print(f"{result['sweep']:>14} {str(result[result['sweep']]):>12} {result['mean ms']:>10.2f} {result['median ms']:>10.2f}")
+    print()
+    for variable, curve in report["curves"].items():
+        exponent = "-" if curve["exponent"] is None else f"{curve['exponent']:.2f}"
+        print(f"{variable:>14}: time per epoch ~ {variable}^{exponent}")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r") as json_file:
+            baseline = json.load(json_file)
+        report["comparison"] = compare_with_baseline(report["results"], baseline["results"], args.threshold)
+        print()
+        for entry in report["comparison"]:
+            flag = "REGRESSION" if entry["regression"] else ""
+            print(f"{entry['case']}: {entry['baseline ms']:.2f} -> {entry['current ms']:.2f} ms ({entry['ratio']:.2f}x) {flag}")
+        regressions = [entry for entry in report["comparison"] if entry["regression"]]
+
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(report, json_file, indent=4)
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
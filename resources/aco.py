@@ -0,0 +1,431 @@
+import abc
+import numpy as np
+
+
+class EdgePheromone:
+    """
+    Pheromone on the edges of a graph, the graph counterpart of the pheromone grid of the simulation.
+    Ants leave pheromone on the edges of their tours and the pheromone evaporates by the same
+    multiplicative reducing factor after every iteration.
+    ----------
+
+    Args:
+    n_nodes (int):
+        The number of nodes of the graph.
+    initial_value (float):
+        The pheromone strength every edge starts with. Defaults to 1.
+    reducing_factor (float):
+        The share of the pheromone that is kept after every iteration. Defaults to 0.9.
+    symmetric (bool):
+        Whether a deposit on the edge (i, j) also lands on (j, i). Defaults to True.
+    ----------
+
+    Attributes:
+    pheromone_array (numpy array):
+        Array of shape (n_nodes, n_nodes) with the pheromone strength of every edge.
+    min_value, max_value (float):
+        Optional limits of the pheromone strength, used by the MAX-MIN Ant System. None disables a limit.
+    ----------
+
+    Methods:
+    leave_pheromone():
+        Adds pheromone along paths.
+    reduce_pheromones():
+        Evaporates the pheromone of all edges.
+    """
+    def __init__(self, n_nodes, initial_value=1.0, reducing_factor=0.9, symmetric=True):
+        self.pheromone_array = np.full((n_nodes, n_nodes), float(initial_value))
+        self.reducing_factor = reducing_factor
+        self.symmetric = symmetric
+        self.min_value = None
+        self.max_value = None
+
+    def leave_pheromone(self, starts, ends, amounts):
+        """
+        Adds pheromone on edges. Edges that occur several times get the sum of their deposits.
+        ----------
+
+        Args:
+        starts, ends (numpy array):
+            The start and end node of every edge.
+        amounts (float or numpy array):
+            The pheromone left on every edge.
+        """
+        amounts = np.broadcast_to(np.asarray(amounts, dtype=float), np.shape(starts))
+        np.add.at(self.pheromone_array, (starts, ends), amounts)
+        if self.symmetric:
+            np.add.at(self.pheromone_array, (ends, starts), amounts)
+        self.clip()
+
+    def reduce_pheromones(self):
+        """
+        Evaporates the pheromone of all edges by the reducing factor.
+        """
+        self.pheromone_array *= self.reducing_factor
+        self.clip()
+
+    def clip(self):
+        """
+        Keeps the pheromone strength within min_value and max_value.
+        """
+        if self.min_value is not None or self.max_value is not None:
+            np.clip(self.pheromone_array, self.min_value, self.max_value, out=self.pheromone_array)
+
+
+class AntColonyOptimizer(abc.ABC):
+    """
+    Base class of the graph solvers. It holds the pheromone and the heuristic information of the edges
+    and applies the Ant System or MAX-MIN Ant System update after every iteration.
+    ----------
+
+    Args:
+    distances (numpy array):
+        Array of shape (n_nodes, n_nodes) with the edge lengths, inf for missing edges.
+    n_ants (int):
+        The number of ants per iteration. Defaults to the number of nodes.
+    alpha (float):
+        Weight of the pheromone when an ant chooses the next node. Defaults to 1.
+    beta (float):
+        Weight of the inverse edge length when an ant chooses the next node. Defaults to 2.
+    reducing_factor (float):
+        The share of the pheromone that is kept after every iteration. Defaults to 0.9.
+    variant (str):
+        "as" lets every ant deposit Q / length on its path, "mmas" only the best path of the iteration
+        and keeps the pheromone within limits derived from the best length found. Defaults to "as".
+    seed (int):
+        Seed of the random generator. Defaults to None.
+    ----------
+
+    Attributes:
+    pheromone (EdgePheromone):
+        The pheromone on the edges.
+    best_path (numpy array):
+        The shortest path found so far.
+    best_length (float):
+        The length of best_path.
+    history (list):
+        The best length after every iteration.
+    ----------
+
+    Methods:
+    solve():
+        Runs a number of iterations and returns the best path.
+    path_lengths():
+        Computes the lengths of paths.
+    update_pheromones():
+        Evaporates the pheromone and lets the ants deposit on their paths.
+    """
+    symmetric = True
+
+    def __init__(self, distances, n_ants=None, alpha=1.0, beta=2.0, reducing_factor=0.9, variant="as", seed=None):
+        if variant not in ("as", "mmas"):
+            raise ValueError(f"Unknown variant {variant!r}, expected 'as' or 'mmas'.")
+        self.distances = np.asarray(distances, dtype=float)
+        self.n_nodes = len(self.distances)
+        self.n_ants = self.n_nodes if n_ants is None else n_ants
+        self.alpha = alpha
+        self.beta = beta
+        self.variant = variant
+        self.rng = np.random.default_rng(seed)
+
+        with np.errstate(divide="ignore"):
+            heuristic = 1.0 / self.distances
+        heuristic[~np.isfinite(heuristic)] = 0.0
+        np.fill_diagonal(heuristic, 0.0)
+        self.heuristic_weights = heuristic ** beta
+
+        self.pheromone = EdgePheromone(self.n_nodes, reducing_factor=reducing_factor, symmetric=self.symmetric)
+        self.best_path = None
+        self.best_length = np.inf
+        self.history = []
+
+    def get_edge_weights(self):
+        """
+        Returns the attractiveness tau^alpha * eta^beta of every edge.
+        """
+        return self.pheromone.pheromone_array ** self.alpha * self.heuristic_weights
+
+    def choose_next_nodes(self, weights):
+        """
+        Draws the next node of every ant with probabilities proportional to the weights, by roulette wheel selection
+        on the cumulative weights of all ants at once.
+        ----------
+
+        Args:
+        weights (numpy array):
+            Array of shape (number of ants, n_nodes). Rows without positive weight choose node -1.
+        ----------
+
+        Returns:
+        numpy array:
+            The chosen node of every ant.
+        """
+        cumulative = np.cumsum(weights, axis=1)
+        totals = cumulative[:, -1]
+        thresholds = self.rng.random(len(weights)) * totals
+        nodes = np.minimum((cumulative <= thresholds[:, None]).sum(axis=1), self.n_nodes - 1)
+        nodes[totals <= 0] = -1
+        return nodes
+
+    def path_lengths(self, paths, valid=None):
+        """
+        Computes the lengths of paths stored as rows of node indices.
+        ----------
+
+        Args:
+        paths (numpy array):
+            Array of shape (number of paths, number of nodes per path), padded with -1.
+        valid (numpy array):
+            Boolean mask of the edges that belong to the paths, of shape (number of paths, number of nodes per path - 1).
+            Defaults to all edges between non-negative nodes.
+        ----------
+
+        Returns:
+        numpy array:
+            The length of every path.
+        """
+        starts, ends = paths[:, :-1], paths[:, 1:]
+        if valid is None:
+            valid = (starts >= 0) & (ends >= 0)
+        return np.where(valid, self.distances[starts, ends], 0.0).sum(axis=1)
+
+    def get_edges(self, paths):
+        """
+        Returns the start nodes, end nodes and the mask of the edges of paths.
+        """
+        starts, ends = paths[:, :-1], paths[:, 1:]
+        return starts, ends, (starts >= 0) & (ends >= 0)
+
+    def update_pheromones(self, paths, lengths):
+        """
+        Evaporates the pheromone and lets the ants deposit on their paths.
+        With "as" every ant with a finite path deposits 1 / length on each of its edges, with "mmas" only the
+        best ant of the iteration, and the pheromone is kept between the MAX-MIN limits.
+        ----------
+
+        Args:
+        paths (numpy array):
+            The paths of the iteration, padded with -1.
+        lengths (numpy array):
+            The length of every path, inf for ants that did not reach their goal.
+        """
+        pheromone = self.pheromone
+        pheromone.reduce_pheromones()
+
+        found = np.isfinite(lengths)
+        if not found.any():
+            return
+        if self.variant == "mmas":
+            best = np.argmin(lengths)
+            paths, lengths = paths[best:best + 1], lengths[best:best + 1]
+            evaporation = 1.0 - pheromone.reducing_factor
+            pheromone.max_value = 1.0 / (evaporation * self.best_length)
+            pheromone.min_value = pheromone.max_value / (2 * self.n_nodes)
+        else:
+            paths, lengths = paths[found], lengths[found]
+
+        starts, ends, valid = self.get_edges(paths)
+        amounts = np.broadcast_to((1.0 / lengths)[:, None], starts.shape)
+        pheromone.leave_pheromone(starts[valid], ends[valid], amounts[valid])
+
+    @abc.abstractmethod
+    def construct_paths(self):
+        """
+        Lets all ants of an iteration build their paths. Implemented by the solvers.
+        """
+
+    def solve(self, iterations=100):
+        """
+        Runs a number of iterations.
+        ----------
+
+        Args:
+        iterations (int):
+            The number of iterations. Defaults to 100.
+        ----------
+
+        Returns:
+        tuple:
+            The best path and its length.
+        """
+        for _ in range(iterations):
+            paths, lengths = self.construct_paths()
+            best = np.argmin(lengths)
+            if lengths[best] < self.best_length:
+                self.best_length = float(lengths[best])
+                self.best_path = paths[best][paths[best] >= 0]
+            self.update_pheromones(paths, lengths)
+            self.history.append(self.best_length)
+        return self.best_path, self.best_length
+
+
+class TSPSolver(AntColonyOptimizer):
+    """
+    Solves the travelling salesman problem: the shortest closed tour that visits every node once.
+    All ants build their tours at the same time, one node per step for all ants.
+    See AntColonyOptimizer for the arguments.
+    ----------
+
+    Methods:
+    construct_paths():
+        Lets all ants build a tour.
+    """
+    def __init__(self, distances, **kwargs):
+        super().__init__(distances, **kwargs)
+        # the usual start value tau_0 = m / C_nn of the Ant System, for MMAS the upper limit 1 / (rho * C_nn)
+        nearest_neighbour = nearest_neighbour_length(self.distances)
+        if self.variant == "mmas":
+            initial_value = 1.0 / ((1.0 - self.pheromone.reducing_factor) * nearest_neighbour)
+        else:
+            initial_value = self.n_ants / nearest_neighbour
+        self.pheromone.pheromone_array[:] = initial_value
+
+    def construct_paths(self):
+        """
+        Lets all ants build a tour from a random start node. The tours are returned closed,
+        so the last column repeats the start node.
+        ----------
+
+        Returns:
+        tuple:
+            The tours of shape (n_ants, n_nodes + 1) and their lengths.
+        """
+        n_ants, n_nodes = self.n_ants, self.n_nodes
+        ant_index = np.arange(n_ants)
+        weights = self.get_edge_weights()
+
+        tours = np.empty((n_ants, n_nodes + 1), dtype=int)
+        tours[:, 0] = self.rng.integers(n_nodes, size=n_ants)
+        unvisited = np.ones((n_ants, n_nodes), dtype=bool)
+        unvisited[ant_index, tours[:, 0]] = False
+
+        for step in range(1, n_nodes):
+            candidates = weights[tours[:, step - 1]] * unvisited
+            nodes = self.choose_next_nodes(candidates)
+            # if all weights underflow, the ant picks the first unvisited node
+            stuck = nodes < 0
+            if stuck.any():
+                nodes[stuck] = np.argmax(unvisited[stuck], axis=1)
+            tours[:, step] = nodes
+            unvisited[ant_index, nodes] = False
+        tours[:, -1] = tours[:, 0]
+        return tours, self.path_lengths(tours)
+
+
+class ShortestPathSolver(AntColonyOptimizer):
+    """
+    Finds the shortest path between two nodes of a graph whose missing edges have the length inf.
+    Ants that run into a dead end are dropped for the iteration. See AntColonyOptimizer for the other arguments.
+    ----------
+
+    Args:
+    source, target (int):
+        The start and end node of the path.
+    symmetric (bool):
+        Whether the edges can be used in both directions. Defaults to True.
+    ----------
+
+    Methods:
+    construct_paths():
+        Lets all ants walk from the source towards the target.
+    """
+    def __init__(self, distances, source, target, symmetric=True, **kwargs):
+        self.symmetric = symmetric
+        super().__init__(distances, **kwargs)
+        self.source = source
+        self.target = target
+        if self.variant == "mmas":
+            self.pheromone.pheromone_array[:] = 1.0 / (1.0 - self.pheromone.reducing_factor)
+
+    def construct_paths(self):
+        """
+        Lets all ants walk from the source until they reach the target or a dead end, without visiting a node twice.
+        ----------
+
+        Returns:
+        tuple:
+            The paths of shape (n_ants, n_nodes) padded with -1 and their lengths, inf for ants that did not arrive.
+        """
+        n_ants, n_nodes = self.n_ants, self.n_nodes
+        ant_index = np.arange(n_ants)
+        weights = self.get_edge_weights()
+
+        paths = np.full((n_ants, n_nodes), -1, dtype=int)
+        paths[:, 0] = self.source
+        unvisited = np.ones((n_ants, n_nodes), dtype=bool)
+        unvisited[:, self.source] = False
+        walking = np.full(n_ants, self.source != self.target)
+
+        for step in range(1, n_nodes):
+            if not walking.any():
+                break
+            ants = ant_index[walking]
+            nodes = self.choose_next_nodes(weights[paths[ants, step - 1]] * unvisited[ants])
+            moved = nodes >= 0
+            paths[ants[moved], step] = nodes[moved]
+            unvisited[ants[moved], nodes[moved]] = False
+            walking[ants[~moved]] = False
+            walking[ants[moved]] = nodes[moved] != self.target
+
+        lengths = self.path_lengths(paths)
+        arrived = (paths == self.target).any(axis=1)
+        lengths[~arrived] = np.inf
+        return paths, lengths
+
+
+def euclidean_distances(points):
+    """
+    Computes the matrix of the euclidean distances between points.
+    ----------
+
+    Args:
+    points (numpy array):
+        Array of shape (number of points, 2).
+    ----------
+
+    Returns:
+    numpy array:
+        Array of shape (number of points, number of points).
+    """
+    points = np.asarray(points, dtype=float)
+    return np.linalg.norm(points[:, None, :] - points[None, :, :], axis=-1)
+
+
+def random_instance(n_nodes, size=1000, seed=None):
+    """
+    Creates a random euclidean TSP instance with the nodes spread uniformly in a square.
+    ----------
+
+    Args:
+    n_nodes (int):
+        The number of nodes.
+    size (float):
+        The edge length of the square. Defaults to 1000.
+    seed (int):
+        Seed of the random generator. Defaults to None.
+    ----------
+
+    Returns:
+    tuple:
+        The points and their distance matrix.
+    """
+    points = np.random.default_rng(seed).uniform(0, size, (n_nodes, 2))
+    return points, euclidean_distances(points)
+
+
+def nearest_neighbour_length(distances, start=0):
+    """
+    Returns the length of the tour that always goes to the closest unvisited node, the usual reference for tau_0.
+    """
+    distances = np.asarray(distances, dtype=float)
+    n_nodes = len(distances)
+    unvisited = np.ones(n_nodes, dtype=bool)
+    unvisited[start] = False
+    node, length = start, 0.0
+    for _ in range(n_nodes - 1):
+        candidates = np.where(unvisited, distances[node], np.inf)
+        next_node = int(np.argmin(candidates))
+        length += candidates[next_node]
+        unvisited[next_node] = False
+        node = next_node
+    return length + distances[node, start]
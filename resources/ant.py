@@ -2,6 +2,9 @@ import numpy as np
 
 
 class Ant:
+    __slots__ = ("pheromone_status", "coordinates", "amount_to_carry", "step_size", "direction", "epoch",
+                 "ant_carries", "search_radius", "pheromone_influence")
+
     def __init__(self, coordinates, amount_to_carry, step_size=1, search_radius=1, pheromone_influence=0.01):
         """
         This class represents an ant in the Ant search algorithm.
@@ -45,6 +48,8 @@ class Ant:
             Determine if the ant can drop food at its colony.
         drop_food():
             Have the ant drop food at its colony and update its status.
+        reset():
+            Brings the ant back to its initial state, so that a slot of a dead ant can be reused for a new one.
         """
         
         self.pheromone_status = -1
@@ -57,6 +62,21 @@ class Ant:
         self.search_radius = search_radius
         self.pheromone_influence = pheromone_influence
 
+    def reset(self, coordinates):
+        """
+        Brings the ant back to its initial state at new coordinates, so that a slot of a dead ant can be reused for a new one.
+        ----------
+
+        Args:
+        coordinates (tuple):
+            The (x, y) coordinates of the new ant.
+        """
+        self.pheromone_status = -1
+        self.coordinates = coordinates
+        self.direction = self.first_direction()
+        self.epoch = 0
+        self.ant_carries = 0
+
     def first_direction(self):
         """
         Generates a random direction on the 2D plane using spherical coordinates.
@@ -0,0 +1,206 @@
+"""
+Checkpoints store the complete state of a running simulation in one compressed numpy archive: the settings of all
+objects as JSON and the bulk data of the ants and pheromone grids as arrays in the types of the precision policy
+of the simulation, so a compact simulation also has compact checkpoints.
+
+Scheduled events other than the food relocations can not be stored, because they hold arbitrary functions.
+"""
+import json
+import random
+import numpy as np
+from resources.ant import Ant
+from resources.colony import Colony
+from resources.food import Food
+from resources.interaction import AntInteraction
+from resources.pheromone import Pheromone
+from resources.scenario import create_obstacle
+from resources.simulation import Simulation
+
+
+def save_checkpoint(simulation, path):
+    """
+    Saves the state of a simulation.
+    ----------
+
+    Args:
+    simulation (Simulation):
+        The simulation to save.
+    path (str):
+        The path of the archive, numpy appends ".npz" if it is missing.
+    """
+    precision = simulation.precision
+    arrays = {}
+    colonies = []
+    for index, colony in enumerate(simulation.colonies):
+        ants = colony.ants
+        pheromone = colony.pheromone
+        arrays[f"colony_{index}_positions"] = colony.get_ant_positions(dtype=precision.position_dtype)
+        arrays[f"colony_{index}_directions"] = np.array([ant.direction for ant in ants], dtype=precision.position_dtype).reshape(-1, 2)
+        arrays[f"colony_{index}_statuses"] = np.array([ant.pheromone_status for ant in ants], dtype=precision.status_dtype)
+        arrays[f"colony_{index}_carries"] = np.array([ant.ant_carries for ant in ants], dtype=precision.position_dtype)
+        arrays[f"colony_{index}_epochs"] = np.array([ant.epoch for ant in ants], dtype=np.int64)
+        arrays[f"colony_{index}_ages"] = colony.pool.age[[colony.pool.get_slot(ant) for ant in ants]]
+        arrays[f"colony_{index}_pheromone"] = pheromone.storage
+        colonies.append({"size": list(colony.size),
+                         "coordinates": [float(value) for value in colony.coordinates],
+                         "color": list(colony.color),
+                         "show pheromone": colony.show_pheromone,
+                         "food counter": float(colony.food_counter),
+                         "birth cost": colony.birth_cost,
+                         "lifespan": colony.lifespan,
+                         "max population": colony.max_population,
+                         "ant settings": colony.ant_settings,
+                         "pheromone reduction": pheromone.reducing_factor,
+                         "pheromone dtype": pheromone.dtype.str,
+                         "pheromone scale": pheromone.scale,
+                         "multi resolution": pheromone.multi_resolution,
+                         "near field radius": pheromone.near_field_radius})
+
+    food = [{"size": list(food.size),
+             "coordinates": [float(value) for value in food.coordinates],
+             "amount of food": float(food.amount_of_food),
+             "start amount": float(food.start_amount),
+             "show life bar": food.show_life_bar,
+             "move randomly": food.move_randomly,
+             "move after": food.move_after_number_of_epochs,
+             "epoch": food.epoch,
+             "next move epoch": food.next_move_epoch} for food in simulation.food]
+    obstacles = [{"vertices": obstacle.get_vertices().tolist()} if obstacle.is_polygon()
+                 else {"coordinates": list(obstacle.coordinates), "size": list(obstacle.size)}
+                 for obstacle in simulation.obstacles]
+
+    interaction = simulation.interaction
+    if interaction is not None:
+        interaction = {"radius": interaction.radius,
+                       "repulsion": interaction.repulsion,
+                       "communication": interaction.communication}
+
+    pheromone_field = simulation.get_pheromone_field()
+    if pheromone_field is not None:
+        arrays["pheromone_channels"] = pheromone_field.values[:, 2:]
+
+    _, random_keys, random_position, has_gauss, cached_gaussian = np.random.get_state()
+    arrays["random_keys"] = random_keys
+    python_random_version, python_random_keys, python_gauss = random.getstate()
+    arrays["python_random_keys"] = np.array(python_random_keys, dtype=np.int64)
+    state = {"epoch": simulation.epoch,
+             "bounds": list(simulation.bounds),
+             "precision": precision.name,
+             "sensing model": simulation.sensing_model,
+             "use flow field": simulation.use_flow_field,
+             "flow field cell size": simulation.flow_field_cell_size,
+             "interaction": interaction,
+             "shared pheromone": simulation.shared_pheromone,
+             "foreign trail avoidance": simulation.foreign_trail_avoidance,
+             "extra pheromone channels": list(simulation.extra_pheromone_channels),
+             "random": [int(random_position), int(has_gauss), float(cached_gaussian)],
+             "python random": [python_random_version, python_gauss],
+             "colonies": colonies,
+             "food": food,
+             "obstacles": obstacles}
+    with simulation.profiler.phase("io"):
+        np.savez_compressed(path, state=np.array(json.dumps(state)), **arrays)
+
+
+def load_checkpoint(path, simulation=None):
+    """
+    Restores a simulation from a checkpoint, including the state of the numpy and Python random generators,
+    so the restored simulation continues exactly like the saved one.
+    ----------
+
+    Args:
+    path (str):
+        The path of the archive.
+    simulation (Simulation, optional):
+        The simulation to fill. Defaults to a new one.
+    ----------
+
+    Returns:
+    Simulation:
+        The restored simulation.
+    """
+    with np.load(path) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+    state = json.loads(str(arrays["state"]))
+
+    simulation = Simulation() if simulation is None else simulation
+    simulation.clear()
+    simulation.bounds = tuple(state["bounds"])
+    simulation.epoch = state["epoch"]
+    simulation.set_precision(state["precision"])
+    simulation.sensing_model = state["sensing model"]
+    simulation.use_flow_field = state["use flow field"]
+    simulation.flow_field_cell_size = state["flow field cell size"]
+    simulation.interaction = None if state["interaction"] is None else AntInteraction(**state["interaction"])
+
+    for obstacle_data in state["obstacles"]:
+        simulation.add_obstacle(create_obstacle(obstacle_data))
+
+    for index, colony_data in enumerate(state["colonies"]):
+        positions = arrays[f"colony_{index}_positions"]
+        colony = Colony(grid_pheromone_shape=arrays[f"colony_{index}_pheromone"].shape[1:],
+                        amount=0,
+                        size=tuple(colony_data["size"]),
+                        coordinates=tuple(colony_data["coordinates"]),
+                        color=tuple(colony_data["color"]),
+                        show_pheromone=colony_data["show pheromone"])
+        colony.ant_settings = colony_data["ant settings"]
+        for name in ("food counter", "birth cost", "lifespan", "max population"):
+            setattr(colony, name.replace(" ", "_"), colony_data[name])
+
+        ants = []
+        for position, direction, status, carries, epoch in zip(positions,
+                                                               arrays[f"colony_{index}_directions"],
+                                                               arrays[f"colony_{index}_statuses"],
+                                                               arrays[f"colony_{index}_carries"],
+                                                               arrays[f"colony_{index}_epochs"]):
+            ant = Ant(coordinates=tuple(position.tolist()), **colony.ant_settings)
+            ant.direction = np.array(direction, dtype=float)
+            ant.pheromone_status = int(status)
+            ant.ant_carries = float(carries)
+            ant.epoch = int(epoch)
+            ants.append(ant)
+        colony.ants = ants
+        colony.amount = len(ants)
+        colony.pool.age[:len(ants)] = arrays[f"colony_{index}_ages"]
+
+        pheromone = Pheromone(grid_shape=colony.pheromone.storage.shape[1:],
+                              reducing_factor=colony_data["pheromone reduction"],
+                              multi_resolution=colony_data["multi resolution"],
+                              near_field_radius=colony_data["near field radius"],
+                              dtype=np.dtype(colony_data["pheromone dtype"]),
+                              scale=colony_data["pheromone scale"])
+        pheromone.storage = arrays[f"colony_{index}_pheromone"].copy()
+        if pheromone.multi_resolution:
+            pheromone.build_pyramid()
+        colony.pheromone = pheromone
+        simulation.add_colony(colony)
+
+    simulation.shared_pheromone = state["shared pheromone"]
+    simulation.foreign_trail_avoidance = state["foreign trail avoidance"]
+    simulation.extra_pheromone_channels = tuple(state["extra pheromone channels"])
+    pheromone_field = simulation.get_pheromone_field()
+    if pheromone_field is not None:
+        pheromone_field.values[:, 2:] = arrays["pheromone_channels"]
+
+    for food_data in state["food"]:
+        food = Food(size=tuple(food_data["size"]),
+                    coordinates=tuple(food_data["coordinates"]),
+                    amount_of_food=food_data["start amount"],
+                    move_after_number_of_epochs=food_data["move after"],
+                    show_life_bar=food_data["show life bar"],
+                    move_randomly=food_data["move randomly"])
+        food.amount_of_food = food_data["amount of food"]
+        food.epoch = food_data["epoch"]
+        simulation.food.append(food)
+        simulation.update_food(food)
+        next_move_epoch = food_data["next move epoch"]
+        if next_move_epoch is not None:
+            food.next_move_epoch = next_move_epoch
+            simulation.scheduler.schedule(next_move_epoch, simulation.relocate_food, food, next_move_epoch)
+
+    random_position, has_gauss, cached_gaussian = state["random"]
+    np.random.set_state(("MT19937", arrays["random_keys"], random_position, has_gauss, cached_gaussian))
+    python_random_version, python_gauss = state["python random"]
+    random.setstate((python_random_version, tuple(arrays["python_random_keys"].tolist()), python_gauss))
+    return simulation
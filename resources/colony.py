@@ -1,8 +1,13 @@
+import numpy as np
 from resources.ant import Ant
 from resources.pheromone import Pheromone
+from resources.population import AntPool
 
 
 class Colony:
+    __slots__ = ("pheromone", "amount", "size", "coordinates", "color", "show_pheromone", "pool", "ant_settings",
+                 "birth_cost", "lifespan", "max_population", "food_counter")
+
     def __init__(self, grid_pheromone_shape, amount, size, coordinates, color, show_pheromone=False):
         """
         This class represents the Ant-colony.
@@ -26,15 +31,33 @@ class Colony:
         Attributes:
         pheromone (Pheromone):
             The pheromone object and its grid shape associated with the colony.
-        ants (list):
-            List of ants belonging to the colony.
+        pool (AntPool):
+            Preallocated slots of the ants, births and deaths reuse them.
+        ants (tuple):
+            The living ants of the colony. Ants are added and removed with spawn_ant() and kill_ant(), or by assigning a new list.
         food_counter (int):
-            Counter to track the amount of food collected by the colony.
+            Counter to track the amount of food collected by the colony. Births are paid from it.
+        birth_cost (float):
+            Amount of food one new ant costs. 0 disables births.
+        lifespan (int):
+            Number of epochs after which an ant dies. None disables deaths.
+        max_population (int):
+            Upper limit of ants reached by births. None means no limit.
         -----------
 
         Methods:
         add_ants():
             Add ants to the colony.
+        spawn_ant():
+            Adds one ant at the nest, reusing the slot of a dead ant if possible.
+        kill_ant():
+            Removes one ant.
+        update_population():
+            Ages the ants, removes the old ones and pays new ants from the collected food.
+        reconfigure():
+            Changes the settings of the running colony without resetting it.
+        get_ant_positions():
+            Returns the coordinates of all ants as one array.
         """
 
         self.pheromone = Pheromone(grid_shape=grid_pheromone_shape)
@@ -43,10 +66,24 @@ class Colony:
         self.coordinates = coordinates
         self.color = color
         self.show_pheromone = show_pheromone
-        self.ants = []
+        self.pool = AntPool(capacity=amount)
+        self.ant_settings = {}
+        self.birth_cost = 0
+        self.lifespan = None
+        self.max_population = None
         self.add_ants()
         self.food_counter = 0
 
+    @property
+    def ants(self):
+        return self.pool.get_ants()
+
+    @ants.setter
+    def ants(self, ants):
+        self.pool.clear()
+        for ant in ants:
+            self.pool.assign(self.pool.acquire(), ant)
+
     def add_ants(self, amount_to_carry=1, step_size=3, search_radius=1, pheromone_influence=0.01):
         """
         Add ants to the colony.
@@ -63,9 +100,141 @@ class Colony:
             None.
         """
 
+        self.ant_settings = {"amount_to_carry": amount_to_carry,
+                             "step_size": step_size,
+                             "search_radius": search_radius,
+                             "pheromone_influence": pheromone_influence}
         for _ in range(self.amount):
-            self.ants.append(Ant(coordinates=(self.coordinates[0]+50, self.coordinates[1]+50),
-                                 amount_to_carry=amount_to_carry,
-                                 step_size=step_size, 
-                                 search_radius=search_radius,
-                                 pheromone_influence=pheromone_influence))
+            self.spawn_ant()
+
+    def spawn_ant(self):
+        """
+        Adds one ant at the nest with the settings of the last add_ants call.
+        The ant of a free slot is reset and reused, a new Ant object is only created for slots that were never used.
+        --------
+
+        Returns:
+            Ant: The new ant.
+        """
+        slot = self.pool.acquire()
+        ant = self.pool.slots[slot]
+        coordinates = (self.coordinates[0]+50, self.coordinates[1]+50)
+        if ant is None:
+            ant = Ant(coordinates=coordinates, **self.ant_settings)
+        else:
+            for name, value in self.ant_settings.items():
+                setattr(ant, name, value)
+            ant.reset(coordinates)
+        self.pool.assign(slot, ant)
+        self.amount = len(self.pool)
+        return ant
+
+    def kill_ant(self, ant):
+        """
+        Removes one ant from the colony. Its slot is reused by the next birth.
+        --------
+
+        Args:
+            ant (Ant): The ant to remove.
+        """
+        slot = self.pool.get_slot(ant)
+        if slot is not None:
+            self.pool.release(slot)
+            self.amount = len(self.pool)
+
+    def update_population(self):
+        """
+        Ages all ants by one epoch, removes the ants that reached the lifespan and adds as many new ants as the
+        collected food pays for, up to max_population. The paid food is subtracted from food_counter.
+        --------
+
+        Returns:
+            tuple: The number of births and deaths.
+        """
+        pool = self.pool
+        pool.age_ants()
+
+        deaths = 0
+        if self.lifespan is not None:
+            dead = np.flatnonzero(pool.alive & (pool.age >= self.lifespan))
+            for slot in dead:
+                pool.release(slot)
+            deaths = len(dead)
+
+        births = 0
+        if self.birth_cost > 0 and self.food_counter >= self.birth_cost:
+            births = int(self.food_counter // self.birth_cost)
+            if self.max_population is not None:
+                births = max(0, min(births, self.max_population - len(pool)))
+            self.food_counter -= births * self.birth_cost
+            for _ in range(births):
+                self.spawn_ant()
+
+        self.amount = len(pool)
+        return births, deaths
+
+    def reconfigure(self, amount=None, color=None, show_pheromone=None, reducing_factor=None, grid_pheromone_shape=None, **ant_settings):
+        """
+        Changes the settings of the running colony. Only the given settings change: the ants keep their position
+        and state, a new number of ants only adds or removes the difference, and a new grid shape resamples the
+        pheromone instead of discarding it.
+        --------
+
+        Args:
+            amount (int, optional): The new number of ants. Missing ants start at the nest, surplus ants are removed, the youngest first.
+            color (tuple, optional): The new color.
+            show_pheromone (bool, optional): Whether to display the pheromone trails.
+            reducing_factor (float, optional): The new pheromone reduction factor.
+            grid_pheromone_shape (tuple, optional): The new number of rows and columns of the pheromone grid.
+            **ant_settings: New values for the settings of add_ants(), applied to all living ants and to new ones.
+        --------
+
+        Raises:
+            TypeError: For unknown ant settings.
+            ValueError: For a new grid shape while the grid is part of a shared pheromone field.
+        """
+        unknown = set(ant_settings) - {"amount_to_carry", "step_size", "search_radius", "pheromone_influence"}
+        if unknown:
+            raise TypeError(f"Unknown ant settings: {', '.join(sorted(unknown))}")
+        ant_settings = {name: value for name, value in ant_settings.items() if value is not None}
+        if ant_settings:
+            self.ant_settings.update(ant_settings)
+            for ant in self.ants:
+                for name, value in ant_settings.items():
+                    setattr(ant, name, value)
+
+        if amount is not None and amount != len(self.pool):
+            if amount > len(self.pool):
+                for _ in range(amount - len(self.pool)):
+                    self.spawn_ant()
+            else:
+                living = np.flatnonzero(self.pool.alive)
+                youngest = living[np.argsort(self.pool.age[living], kind="stable")]
+                for slot in youngest[:len(self.pool) - amount]:
+                    self.pool.release(slot)
+            self.amount = len(self.pool)
+
+        if color is not None:
+            self.color = color
+        if show_pheromone is not None:
+            self.show_pheromone = show_pheromone
+        if reducing_factor is not None:
+            self.pheromone.reducing_factor = reducing_factor
+        if grid_pheromone_shape is not None and tuple(grid_pheromone_shape) != self.pheromone.storage.shape[1:]:
+            if self.pheromone.storage.base is not None:
+                raise ValueError("The pheromone grid is part of a shared pheromone field, use Simulation.reconfigure_colony() to change its shape.")
+            self.pheromone.resample(grid_pheromone_shape)
+
+    def get_ant_positions(self, dtype=float):
+        """
+        Returns the coordinates of all ants as one array.
+        --------
+
+        Args:
+            dtype (numpy dtype): The type of the array. Defaults to float.
+        --------
+
+        Returns:
+            numpy array: An array of shape (number of ants, 2) with the (x, y) coordinates of the ants.
+        """
+        return np.array([ant.coordinates for ant in self.ants], dtype=dtype).reshape(-1, 2)
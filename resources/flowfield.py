@@ -0,0 +1,124 @@
+import heapq
+import numpy as np
+
+
+class FlowField:
+    """
+    Precomputed directions that lead around obstacles to a target, e.g. the nest of a colony.
+    The distance of every free cell of an occupancy grid to the target is computed once with Dijkstra's algorithm
+    on the 8-connected grid. Every cell then points to its neighbour that is closest to the target, so an ant
+    only has to look up the direction of its cell.
+    ----------
+
+    Args:
+    occupancy (OccupancyGrid):
+        The rasterized obstacles.
+    target (tuple):
+        The (x, y) coordinates of the target.
+    target_radius (float):
+        All free cells whose centers lie within this radius around the target are goal cells. Defaults to 20.
+    ----------
+
+    Attributes:
+    distance (numpy array):
+        Distance of every cell to the target in simulation coordinates, inf for blocked or unreachable cells.
+    directions (numpy array):
+        Array of shape (rows, columns, 2) with the unit direction (x, y) of every cell, zero in goal cells
+        and in cells without a way to the target.
+    ----------
+
+    Methods:
+    direction_at():
+        Looks up the directions for positions.
+    """
+    # (row offset, column offset) of the 8 neighbours of a cell
+    neighbours = ((0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (1, 1))
+
+    def __init__(self, occupancy, target, target_radius=20):
+        self.occupancy = occupancy
+        self.target = tuple(target)
+        self.target_radius = target_radius
+        self.distance = self.compute_distance()
+        self.directions = self.compute_directions()
+
+    def get_goal_cells(self):
+        """
+        Returns the free cells within the target radius, or the cell of the target itself if none of them is free.
+        """
+        grid = self.occupancy
+        rows, cols = np.nonzero(~grid.blocked)
+        x, y = grid.cell_to_world(rows, cols)
+        inside = (x - self.target[0]) ** 2 + (y - self.target[1]) ** 2 <= self.target_radius ** 2
+        if inside.any():
+            return list(zip(rows[inside].tolist(), cols[inside].tolist()))
+        row, col = grid.world_to_cell(*self.target)
+        return [(int(row), int(col))]
+
+    def compute_distance(self):
+        """
+        Runs Dijkstra's algorithm from all goal cells over the free cells of the occupancy grid.
+        Diagonal steps are only allowed if they do not cut the corner of a blocked cell.
+        """
+        blocked = self.occupancy.blocked
+        n_row, n_col = blocked.shape
+        cell_size = self.occupancy.cell_size
+        distance = np.full((n_row, n_col), np.inf)
+
+        queue = []
+        for row, col in self.get_goal_cells():
+            distance[row, col] = 0.0
+            queue.append((0.0, row, col))
+        heapq.heapify(queue)
+
+        steps = [(d_row, d_col, cell_size * np.hypot(d_row, d_col)) for d_row, d_col in self.neighbours]
+        while queue:
+            dist, row, col = heapq.heappop(queue)
+            if dist > distance[row, col]:
+                continue
+            for d_row, d_col, length in steps:
+                new_row, new_col = row + d_row, col + d_col
+                if not (0 <= new_row < n_row and 0 <= new_col < n_col) or blocked[new_row, new_col]:
+                    continue
+                if d_row and d_col and (blocked[row + d_row, col] or blocked[row, col + d_col]):
+                    continue
+                new_dist = dist + length
+                if new_dist < distance[new_row, new_col]:
+                    distance[new_row, new_col] = new_dist
+                    heapq.heappush(queue, (new_dist, new_row, new_col))
+        return distance
+
+    def compute_directions(self):
+        """
+        Lets every cell point to the neighbour with the smallest distance to the target.
+        """
+        n_row, n_col = self.distance.shape
+        padded = np.full((n_row + 2, n_col + 2), np.inf)
+        padded[1:-1, 1:-1] = self.distance
+
+        neighbour_distance = np.stack([padded[1 + d_row:1 + d_row + n_row, 1 + d_col:1 + d_col + n_col]
+                                       for d_row, d_col in self.neighbours])
+        best = np.argmin(neighbour_distance, axis=0)
+        improves = np.take_along_axis(neighbour_distance, best[None], axis=0)[0] < self.distance
+
+        units = np.array([(d_col, -d_row) for d_row, d_col in self.neighbours], dtype=float)
+        units /= np.linalg.norm(units, axis=1)[:, None]
+        directions = units[best]
+        directions[~improves] = 0
+        return directions
+
+    def direction_at(self, x, y):
+        """
+        Looks up the directions towards the target for positions.
+        ----------
+
+        Args:
+        x, y (float or numpy array):
+            The simulation coordinates.
+        ----------
+
+        Returns:
+        numpy array:
+            The unit directions (x, y), zero if the position is at the target or has no way to it.
+        """
+        rows, cols = self.occupancy.world_to_cell(x, y)
+        return self.directions[rows, cols]
@@ -2,6 +2,9 @@ import random
 
 
 class Food:
+    __slots__ = ("coordinates", "size", "amount_of_food", "start_amount", "show_life_bar", "move_randomly",
+                 "move_after_number_of_epochs", "epoch", "next_move_epoch")
+
     def __init__(self, size, coordinates, amount_of_food, move_after_number_of_epochs = 500, show_life_bar=True, move_randomly = False):
         """
         This class represents a food source in the Ant Search Algorithm.
@@ -22,9 +25,16 @@ class Food:
             Flag to indicate whether the food source moves randomly.
         ----------
 
+        Attributes:
+        next_move_epoch (int):
+            The epoch at which the simulation moves the food source next, None if no move is scheduled.
+        ----------
+
         Methods:
         move_randomly_after_while():
             Moves the food source randomly within the given bounds at specified epochs.
+        relocate():
+            Moves the food source to a random position within the given bounds and refills it.
             
         """
         self.coordinates = coordinates
@@ -35,6 +45,7 @@ class Food:
         self.move_randomly = move_randomly 
         self.move_after_number_of_epochs = move_after_number_of_epochs
         self.epoch = 0
+        self.next_move_epoch = None
     
     def move_randomly_after_while(self, bounds):
         """
@@ -57,12 +68,23 @@ class Food:
         
         self.epoch += 1
         if self.epoch % self.move_after_number_of_epochs == 0:
+            self.relocate(bounds)
+
+    def relocate(self, bounds):
+        """
+        Moves the food source to a random position within the given bounds and resets the food amount to its initial value.
+        The simulation calls this through its event scheduler every move_after_number_of_epochs epochs.
+        ---------
+
+        Args:
+        bounds (tuple):
+            ant world bounds for the movement (min_x, max_x, min_y, max_y).
+        """
+        min_x, max_x, min_y, max_y = bounds
         
-            min_x, max_x, min_y, max_y = bounds
-            
-            x_coord = random.uniform((min_x + self.size[0]), (max_x - self.size[0]))
-            y_coord = random.uniform((min_y + self.size[1]), (max_y - self.size[1]))
-            
-            self.coordinates = (x_coord, y_coord)
-            
-            self.amount_of_food = self.start_amount
+        x_coord = random.uniform((min_x + self.size[0]), (max_x - self.size[0]))
+        y_coord = random.uniform((min_y + self.size[1]), (max_y - self.size[1]))
+        
+        self.coordinates = (x_coord, y_coord)
+        
+        self.amount_of_food = self.start_amount
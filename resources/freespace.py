@@ -0,0 +1,133 @@
+import numpy as np
+
+
+class FreeSpaceMap:
+    """
+    Placement index over an occupancy grid. It answers whether a rectangle is free of obstacles with one lookup in a
+    summed-area table, and finds the closest position where an object fits with one query over a clearance map.
+    ----------
+
+    Args:
+    occupancy (OccupancyGrid):
+        The rasterized obstacles.
+    ----------
+
+    Attributes:
+    blocked_sums (numpy array):
+        Summed-area table of the blocked cells, of shape (rows + 1, columns + 1).
+    clearance (numpy array):
+        Distance transform of the free space: the edge length in cells of the largest free square whose top left
+        cell is the given cell. 0 for blocked cells.
+    ----------
+
+    Methods:
+    is_free():
+        Checks if a rectangle lies in free space.
+    find_nearest_position():
+        Returns the closest position at which an object of a given size fits.
+    """
+    def __init__(self, occupancy):
+        self.occupancy = occupancy
+        self.version = occupancy.version
+        blocked = occupancy.blocked.astype(np.int64)
+        self.blocked_sums = np.zeros((occupancy.n_row + 1, occupancy.n_col + 1), dtype=np.int64)
+        self.blocked_sums[1:, 1:] = blocked.cumsum(axis=0).cumsum(axis=1)
+        self.clearance = self.compute_clearance()
+        self.candidates = {}
+
+    def count_blocked(self, row_start, row_end, col_start, col_end):
+        """
+        Counts the blocked cells in the rows row_start to row_end - 1 and columns col_start to col_end - 1.
+        Works element-wise on arrays of indices.
+        """
+        sums = self.blocked_sums
+        return sums[row_end, col_end] - sums[row_start, col_end] - sums[row_end, col_start] + sums[row_start, col_start]
+
+    def compute_clearance(self):
+        """
+        Computes the clearance of every cell by a binary search over the square size, checking all cells
+        at once with the summed-area table in every step.
+        """
+        n_row, n_col = self.occupancy.n_row, self.occupancy.n_col
+        rows, cols = np.mgrid[0:n_row, 0:n_col]
+        low = np.zeros((n_row, n_col), dtype=np.int64)
+        high = np.minimum(n_row - rows, n_col - cols)
+        while True:
+            searching = low < high
+            if not searching.any():
+                return low
+            middle = (low + high + 1) // 2
+            free = self.count_blocked(rows, rows + middle, cols, cols + middle) == 0
+            low = np.where(searching & free, middle, low)
+            high = np.where(searching & ~free, middle - 1, high)
+
+    def get_cell_range(self, coordinates, size):
+        """
+        Returns the rows and columns (start and end, exclusive) of the cells a rectangle overlaps, clipped to the grid.
+        """
+        grid = self.occupancy
+        min_x, _, _, max_y = grid.bounds
+        x, y = coordinates
+        width, height = size
+        col_start = int(np.clip(np.floor((x - min_x) / grid.cell_size), 0, grid.n_col))
+        col_end = int(np.clip(np.ceil((x + width - min_x) / grid.cell_size), 0, grid.n_col))
+        row_start = int(np.clip(np.floor((max_y - (y + height)) / grid.cell_size), 0, grid.n_row))
+        row_end = int(np.clip(np.ceil((max_y - y) / grid.cell_size), 0, grid.n_row))
+        return row_start, row_end, col_start, col_end
+
+    def is_free(self, coordinates, size):
+        """
+        Checks if a rectangle does not overlap any blocked cell.
+        ----------
+
+        Args:
+        coordinates (tuple):
+            The (x, y) lower left corner of the rectangle.
+        size (tuple):
+            The (width, height) of the rectangle.
+        ----------
+
+        Returns:
+        bool:
+            True if the rectangle lies in free space.
+        """
+        return self.count_blocked(*self.get_cell_range(coordinates, size)) == 0
+
+    def find_nearest_position(self, coordinates, size):
+        """
+        Returns the closest position at which an object of a given size lies completely in free space and within
+        the grid. The object is placed on the cell borders, on the top left cell of the closest free square that is
+        large enough for its longer side.
+        ----------
+
+        Args:
+        coordinates (tuple):
+            The (x, y) lower left corner the object should be placed at.
+        size (tuple):
+            The (width, height) of the object.
+        ----------
+
+        Returns:
+        tuple:
+            The (x, y) lower left corner of the closest valid position, or None if the object fits nowhere.
+        """
+        grid = self.occupancy
+        width, height = size
+        cells = max(1, int(np.ceil(max(width, height) / grid.cell_size)))
+        candidates = self.candidates.get(cells)
+        if candidates is None:
+            candidates = np.nonzero(self.clearance >= cells)
+            self.candidates[cells] = candidates
+        rows, cols = candidates
+        if len(rows) == 0:
+            return None
+
+        min_x, _, _, max_y = grid.bounds
+        x, y = coordinates
+        target_row = (max_y - (y + height)) / grid.cell_size
+        target_col = (x - min_x) / grid.cell_size
+        closest = np.argmin((rows - target_row) ** 2 + (cols - target_col) ** 2)
+
+        new_x = min_x + cols[closest] * grid.cell_size
+        new_y = max_y - rows[closest] * grid.cell_size - height
+        return (float(new_x), float(new_y))
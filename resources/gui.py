@@ -1,13 +1,14 @@
 import ast
+import os
 import json
-import webbrowser
+import time
+from collections import deque
 import numpy as np
 from resources import config
 from kivymd.app import MDApp
 from kivy.uix.widget import Widget
 from kivy.uix.boxlayout import BoxLayout
 from kivymd.uix.screen import MDScreen
-from kivy.uix.image import Image
 from kivy.uix.scatter import Scatter
 from kivymd.uix.button import MDIconButton
 from kivymd.uix.button import MDFloatingActionButton
@@ -15,14 +16,18 @@ from kivymd.uix.button import MDFloatingActionButtonSpeedDial
 from kivymd.uix.button import MDFillRoundFlatButton
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.button import MDFlatButton
-from kivymd.uix.dialog import MDDialog
 from kivymd.uix.label import MDLabel
-from kivymd.uix.textfield import MDTextField
 from kivymd.uix.selectioncontrol import MDSwitch
 from kivy.animation import Animation
 from kivy.graphics import Rectangle, Color, Ellipse
+from kivy.graphics import Canvas
 from kivy.graphics.transformation import Matrix
 from kivy.graphics import Line
+from kivy.graphics import Mesh
+from kivy.graphics.tesselator import Tesselator, WINDING_ODD, TYPE_POLYGONS
+from kivy.core.image import Image as CoreImage
+from kivy.graphics.texture import Texture
+from kivy.atlas import Atlas
 from kivy.core.window import Window
 from kivy.core.audio import SoundLoader
 from kivy.clock import Clock
@@ -31,11 +36,80 @@ from resources.simulation import Simulation
 from resources.food import Food
 from resources.colony import Colony
 from resources.obstacle import Obstacle
-from resources.pheromone import Pheromone
+from resources.scenario import create_colony, create_food, create_obstacle
+from resources.renderer import interpolate_positions
 
 
 sim = Simulation()
 
+
+class TextureCache:
+    """
+    Loads every image asset of the simulation once and hands out the decoded textures,
+    so that drawing a frame never has to decode an image or construct an image widget.
+
+    Attributes:
+    sources : dict
+        Maps the name of an asset to the path of its image file.
+    atlas : str
+        Optional path to a .atlas file that packs the assets. The keys of the atlas have to match
+        the names in `sources`. If it is None or does not exist, the single image files are loaded.
+    textures : dict
+        The loaded textures by name.
+    --------
+
+    Methods:
+    load():
+        load all assets
+    get():
+        return the texture of an asset
+    """
+    sources = {
+        "background": "../images/background.png",
+        "apple": "../images/apple.png",
+        "colony": "../images/colony.png",
+        "obstacle": "../images/obstacle.png",
+    }
+
+    def __init__(self, atlas=None):
+        self.atlas = atlas
+        self.textures = {}
+
+    def load(self):
+        """
+        Load all assets, either from the atlas or from the single image files.
+        """
+        atlas_textures = {}
+        if self.atlas is not None and os.path.exists(self.atlas):
+            atlas_textures = Atlas(self.atlas).textures
+
+        for name, source in self.sources.items():
+            if name in atlas_textures:
+                self.textures[name] = atlas_textures[name]
+            else:
+                self.textures[name] = CoreImage(source).texture
+
+    def get(self, name):
+        """
+        Return the texture of an asset. The assets are loaded on the first call if load() was not called before.
+
+        Args:
+        name : str
+            The name of the asset, e.g. "apple".
+        --------
+
+        Returns:
+        Texture
+            The cached texture.
+        """
+        if not self.textures:
+            self.load()
+        return self.textures[name]
+
+
+textures = TextureCache()
+
+
 class GUI(MDApp):
     """
     This class is used to create a graphical user interface (GUI) for the simulation.
@@ -67,6 +141,7 @@ class GUI(MDApp):
         """
         Window.bind(mouse_pos=self.on_mouse_pos)
         Window.bind(size=self.on_window_resize)
+        textures.load()
 
         root = MDScreen()
 
@@ -85,16 +160,21 @@ class GUI(MDApp):
         background.sound = True
         background.study = False
 
-        simulation_widget = SimulationWidget()
-        button_widget = ButtonWidget(simulation_widget)
+        self.hud = HUD()
+        self.simulation_widget = SimulationWidget()
+        self.simulation_widget.hud = self.hud
+        self.button_widget = ButtonWidget(self.simulation_widget)
         
-        background.add_widget(simulation_widget)
+        background.add_widget(self.simulation_widget)
         background.add_widget(InfoButton())
         background.add_widget(SettingsButton())
         root.add_widget(background)
-        root.add_widget(button_widget)
+        root.add_widget(self.button_widget)
+        root.add_widget(self.hud)
 
-        Clock.schedule_interval(lambda dt: simulation_widget.update_world(dt), 0.1)
+        Clock.schedule_interval(lambda dt: self.simulation_widget.update_world(dt), self.simulation_widget.epoch_interval)
+        Clock.schedule_interval(lambda dt: self.simulation_widget.render_frame(dt), 0)
+        Clock.schedule_interval(self.hud.refresh, 0.5)
 
         return root
 
@@ -109,7 +189,7 @@ class GUI(MDApp):
         Notice if the cursor is over the buttons.
         """
         pos = args[1]
-        buttons = self.root.children[0].children
+        buttons = self.button_widget.children
         for button in buttons:
             if button.collide_point(*pos):
                 Clock.schedule_once(self.mouse_enter_css, 0)
@@ -132,7 +212,7 @@ class GUI(MDApp):
         """
         Adjust the view when the size of the window is changed.
         """
-        Clock.schedule_interval(lambda instance: self.root.children[1].children[2].adjust_view(instance), 0.2)
+        Clock.schedule_interval(lambda instance: self.simulation_widget.adjust_view(instance), 0.2)
 
 
 class SettingsButton(MDIconButton):
@@ -150,6 +230,8 @@ class SettingsButton(MDIconButton):
     Methods:
     on_press():
         Handle the press event of the settings button.
+    build_dialog():
+        Build the settings dialog on first use.
     apply_changes():
         Apply changes based on the selected settings.
     load_settings():
@@ -167,11 +249,25 @@ class SettingsButton(MDIconButton):
         self.theme_text_color = "Custom"
         self.text_color = (0, 0, 0, 1)
         self.icon_size = 60
+        self.dialog = None
     
     def on_press(self, *args):
         """
         Handle the press event of the settings button.
         """
+        if self.dialog is None:
+            self.build_dialog()
+        self.sound_switch.active = self.parent.sound
+        self.study_switch.active = self.parent.study
+        self.load_switch.active = False
+        self.dialog.open()
+
+    def build_dialog(self):
+        """
+        Build the settings dialog. It is built on the first press, so the dialog widgets are only imported when they are needed.
+        """
+        from kivymd.uix.dialog import MDDialog
+
         settings_content = MDBoxLayout(orientation="vertical", spacing="12dp", size_hint_y=None, height="160dp")
         sound_layout = MDBoxLayout(orientation="horizontal", size_hint=(0.7, .5))
         sound_layout.add_widget(MDLabel(text="Sound"))
@@ -208,7 +304,9 @@ class SettingsButton(MDIconButton):
                 ),
             ],
         )
-        self.dialog.open()
+        self.sound_switch = sound_switch
+        self.study_switch = study_switch
+        self.load_switch = load_switch
 
     def apply_changes(self, new_sound_status, new_study_status, new_load_status):
         """
@@ -238,38 +336,18 @@ class SettingsButton(MDIconButton):
 
             sim.bounds = data["simulation"][0]["boundaries"]
 
-            sim.colonies = []
+            sim.clear()
             for colony_data in data["colonies"]:
-                colony = Colony(
-                                grid_pheromone_shape=colony_data['pheromone grid'],
-                                amount=colony_data["amount"],
-                                coordinates=colony_data["coordinates"],
-                                color=colony_data["color"],
-                                size=(100, 100)
-                                )
-                colony.ants = []
-                colony.add_ants(colony_data["amount to carry"], colony_data["step size"], colony_data["search radius"], colony_data["pheromone influence"])
-                colony.pheromone.reducing_factor = colony_data["pheromone reduction"]
-                sim.colonies.append(colony)
-
-            sim.food = []
+                sim.add_colony(create_colony(colony_data))
+
             for food_data in data["food"]:
-                food = Food(
-                            amount_of_food=food_data["start amount"],
-                            coordinates=food_data["coordinates"],
-                            size=(100, 100)
-                            )
-                sim.food.append(food)
+                sim.add_food(create_food(food_data))
             
-            sim.obstacles = []
-            for obstacle_data in data["obstacles"]:
-                obstacle = Obstacle(coordinates=obstacle_data["coordinates"], 
-                                    size=obstacle_data["size"]
-                                    )
-                sim.add_obstacle(obstacle)
+            sim.add_obstacles([create_obstacle(obstacle_data) for obstacle_data in data["obstacles"]])
             
-            self.parent.children[2].update_canvas()
-            self.parent.children[2].adjust_view()
+            simulation_widget = MDApp.get_running_app().simulation_widget
+            simulation_widget.update_canvas()
+            simulation_widget.adjust_view()
         except Exception as e:
             self.show_error_dialog(f"Error: {str(e)}" + "\n\n" + "Could not load settings. Try to restart the program.")
     
@@ -281,6 +359,8 @@ class SettingsButton(MDIconButton):
         error_message : str
             The error message to be displayed.
         """
+        from kivymd.uix.dialog import MDDialog
+
         sound = SoundLoader.load("../sounds/error.mp3")
         if sound:
             sound.play()
@@ -337,9 +417,111 @@ class InfoButton(MDIconButton):
         """
         Handle the press event of the information button.
         """
+        import webbrowser
+
         webbrowser.open("https://github.com/heyitsalina/ant_search_algorithm/blob/main/images/basic_features.gif")
 
 
+class HUD(MDLabel):
+    """
+    Persistent overlay that shows the state of the simulation and live performance counters.
+    The label is created once and its text is updated in place.
+
+    Attributes:
+    window : float
+        Length of the time window in seconds over which the rates and timings are averaged.
+    epoch_samples : deque
+        (timestamp, seconds spent in next_epoch) of the recent epochs.
+    frame_samples : deque
+        (timestamp, seconds spent rendering) of the recent frames.
+    --------
+
+    Methods:
+    record_epoch():
+        store the duration of one epoch
+    record_frame():
+        store the duration of one rendered frame
+    refresh():
+        update the text of the overlay
+    """
+    window = 2.0
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the overlay.
+        """
+        super().__init__(*args, **kwargs)
+        self.theme_text_color = "Custom"
+        self.text_color = (0, 0, 0, 1)
+        self.font_style = "Body2"
+        self.size_hint = (None, None)
+        self.size = (dp(260), dp(200))
+        self.pos_hint = {"right": 0.99, "top": 0.9}
+        self.valign = "top"
+        self.epoch_samples = deque()
+        self.frame_samples = deque()
+
+    def record_epoch(self, seconds):
+        """
+        Store the duration of one epoch.
+
+        Args:
+        seconds : float
+            Time spent in next_epoch.
+        """
+        self.epoch_samples.append((time.perf_counter(), seconds))
+
+    def record_frame(self, seconds):
+        """
+        Store the duration of one rendered frame.
+
+        Args:
+        seconds : float
+            Time spent drawing the frame.
+        """
+        self.frame_samples.append((time.perf_counter(), seconds))
+
+    def get_rate_and_mean(self, samples):
+        """
+        Drop samples that are older than the time window and summarize the rest.
+
+        Args:
+        samples : deque
+            The samples to summarize.
+        --------
+
+        Returns:
+        tuple
+            The number of samples per second and the mean duration in milliseconds.
+        """
+        now = time.perf_counter()
+        while samples and now - samples[0][0] > self.window:
+            samples.popleft()
+        if not samples:
+            return 0.0, 0.0
+        mean_ms = 1000 * sum(duration for _, duration in samples) / len(samples)
+        return len(samples) / self.window, mean_ms
+
+    def refresh(self, *args):
+        """
+        Update the text of the overlay.
+        """
+        epochs_per_second, epoch_ms = self.get_rate_and_mean(self.epoch_samples)
+        frames_per_second, frame_ms = self.get_rate_and_mean(self.frame_samples)
+        ant_count = sum(len(colony.ants) for colony in sim.colonies)
+        pheromone_cells = sum(colony.pheromone.count_active_cells() for colony in sim.colonies)
+
+        lines = [f"Epoch: {sim.epoch}"]
+        for idx, colony in enumerate(sim.colonies):
+            lines.append(f"Colony {idx + 1}: {colony.food_counter} food")
+        lines += [
+            f"Epochs/s: {epochs_per_second:.1f}   Frames/s: {frames_per_second:.1f}",
+            f"next_epoch: {epoch_ms:.1f} ms   Rendering: {frame_ms:.1f} ms",
+            f"Ants: {ant_count}   Pheromone cells: {pheromone_cells}",
+        ]
+        self.text = "\n".join(lines)
+
+
 class ResizableDraggablePicture(Scatter):
     """
     Class is responsible for being able to zoom into the canvas. 
@@ -383,25 +565,69 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
         position of the canvas
     dialog : MDDialog()
         a dialog window that shows settings about an object when it's double clicked
+    static_layer : Canvas
+        cached layer with the background, bounds, obstacles and colony nests, only redrawn if they change
+    epoch_layer : Canvas
+        layer with the pheromone grid, the food and the life bars, redrawn once per epoch
+    ant_layer : Canvas
+        layer with the ants, redrawn once per epoch and moved to the interpolated positions every frame
+    ant_instructions : dict
+        the ant and carrier marks of every colony, moved by move_ants
+    lod_max_ants : int
+        above this number of ants the ants are drawn as a density heatmap unless the view is zoomed in
+    lod_min_scale : float
+        below this zoom level the ants are always drawn as a density heatmap
+    lod_zoom_in_scale : float
+        from this zoom level on the ants are drawn individually again, no matter how many there are
+    heatmap_cell_size : int
+        edge length of one heatmap cell in simulation coordinates
+    hud : HUD
+        the overlay that receives the timings of the epochs and frames
+    epoch_interval : float
+        seconds between two epochs of the running simulation
+    previous_positions, current_positions : dict
+        ant positions of every colony before and after the last epoch, used to interpolate between the epochs
     -------
 
     Methods:
     update_world():
-        calculate the next epoch and update canvas
+        calculate the next epoch
+    render_frame():
+        move the ants of the current frame to their interpolated positions
+    get_display_positions():
+        return the positions at which the ants of a colony are drawn
     update_canvas():
-        update the canvas
+        redraw all layers of the canvas
+    update_epoch_layer():
+        redraw the pheromone grid, the food and the life bars
+    get_static_layer_key():
+        describe everything that is drawn on the static layer
+    update_static_layer():
+        redraw the static layer if the world changed
     draw_pheromone():
         draw the pheromone grid
     draw_food():
         draw the Food objects
+    draw_colonies():
+        draw the nests of the Colony objects
     draw_ants():
-        draw the Colony objects and their ants
+        draw the ants of the Colony objects
+    move_ants():
+        move the drawn ants to their current display positions
+    use_ant_heatmap():
+        decide whether the ants are drawn as a density heatmap
+    draw_ant_heatmap():
+        draw the ant density of a colony as a texture
+    on_scale_change():
+        redraw the canvas if the zoom level switches between heatmap and single ants
     draw_food_life_bar():
         draw a life bar of the Food object above them
     toggle_simulation():
         change whether the simulation is running or not
     draw_bounds():
         draw the bounds of the simulation area on the canvas
+    draw_obstacles():
+        draw the obstacles
     clear_canvas():
         clear the canvas
     on_touch_down():
@@ -423,6 +649,11 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
     delete_object():
         delete the passed object
     """
+    lod_max_ants = 5000
+    lod_min_scale = 0.5
+    lod_zoom_in_scale = 2
+    heatmap_cell_size = 8
+    epoch_interval = 0.1
 
     def __init__(self, **kwargs):
         """
@@ -430,16 +661,31 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
         """
         super(SimulationWidget, self).__init__(**kwargs)
         self.is_running = False
+        self.static_layer = Canvas()
+        self.epoch_layer = Canvas()
+        self.ant_layer = Canvas()
+        self.canvas.add(self.static_layer)
+        self.canvas.add(self.epoch_layer)
+        self.canvas.add(self.ant_layer)
+        self.ant_instructions = {}
+        self.static_layer_key = None
+        self.heatmap_textures = {}
+        self.heatmap_active = False
+        self.hud = None
+        self.previous_positions = {}
+        self.current_positions = {}
+        self.last_epoch_time = time.perf_counter()
         self.update_canvas()
+        self.bind(scale=self.on_scale_change)
         Clock.schedule_interval(lambda instance: self.adjust_view(instance), 0.1)
 
     def draw_bounds(self):
         """
-        Draw the bounds of the simulation area on the canvas.
+        Draw the bounds of the simulation area on the static layer.
         """
         min_x, max_x, min_y, max_y = sim.bounds
 
-        with self.canvas:
+        with self.static_layer:
             Color(0, 0, 0, 1)
             Line(rectangle=(
                 min_x,
@@ -447,37 +693,120 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
                 max_x - min_x + 5,
                 max_y - min_y + 5
             ), width=1)
-            Image(source="../images/background.png", pos=(min_x, min_y), size=(max_x-min_x+5, max_y-min_y+5), allow_stretch=True, keep_ratio=False)
+            Color(1, 1, 1, 1)
+            Rectangle(texture=textures.get("background"), pos=(min_x, min_y), size=(max_x-min_x+5, max_y-min_y+5))
 
-    def update_canvas(self):
+    def get_static_layer_key(self):
         """
-        Update the canvas.
+        Describe everything that is drawn on the static layer.
+
+        Returns:
+        tuple
+            A key that changes whenever the bounds, the obstacles or the colonies change.
         """
-        self.canvas.clear()
+        return (
+            tuple(sim.bounds),
+            sim.get_obstacle_key(),
+            tuple(tuple(colony.coordinates) for colony in sim.colonies),
+        )
+
+    def update_static_layer(self):
+        """
+        Redraw the background, the bounds, the obstacles and the colony nests, but only if the world changed.
+        """
+        key = self.get_static_layer_key()
+        if key == self.static_layer_key:
+            return
+        self.static_layer_key = key
+        self.static_layer.clear()
         self.draw_bounds()
         self.draw_obstacles()
+        self.draw_colonies()
+
+    def update_canvas(self):
+        """
+        Redraw all layers of the canvas.
+        """
+        start = time.perf_counter()
+        with sim.profiler.phase("rendering"):
+            self.update_static_layer()
+            self.update_epoch_layer()
+            self.draw_ants()
+        if self.hud is not None:
+            self.hud.record_frame(time.perf_counter() - start)
+
+    def update_epoch_layer(self):
+        """
+        Redraw the pheromone grid, the food and the life bars. They only change with an epoch,
+        so this is not done for the frames in between.
+        """
+        self.epoch_layer.clear()
         self.draw_pheromone()
         self.draw_food()
-        self.draw_ants()
-        self.draw_food_life_bar()      
+        self.draw_food_life_bar()
 
     def update_world(self, dt):
         """
-        Calculate the next epoch and update canvas.
+        Calculate the next epoch, store the ant positions before and after it and redraw what changed with it.
+        Between the epochs render_frame only moves the ants at the refresh rate of the display.
 
         Args:
         dt : float
             Time interval.
         """
         if self.is_running:
+            previous_positions = {id(colony): colony.get_ant_positions() for colony in sim.colonies}
+            start = time.perf_counter()
             sim.next_epoch()
+            self.last_epoch_time = time.perf_counter()
+            if self.hud is not None:
+                self.hud.record_epoch(self.last_epoch_time - start)
+            self.previous_positions = previous_positions
+            self.current_positions = {id(colony): colony.get_ant_positions() for colony in sim.colonies}
             self.update_canvas()
-    
+
+    def render_frame(self, dt):
+        """
+        Draw the current frame while the simulation is running. The drawn ants are moved between their
+        positions of the last two epochs, so they move smoothly without computing more epochs or redrawing
+        anything else.
+
+        Args:
+        dt : float
+            Time interval.
+        """
+        if self.is_running:
+            start = time.perf_counter()
+            with sim.profiler.phase("rendering"):
+                self.move_ants()
+            if self.hud is not None:
+                self.hud.record_frame(time.perf_counter() - start)
+
+    def get_display_positions(self, colony):
+        """
+        Return the positions at which the ants of a colony are drawn.
+
+        Args:
+        colony : Colony
+            The colony whose ants are drawn.
+        --------
+
+        Returns:
+        numpy array
+            The ant positions interpolated between the last two epochs, or the actual positions
+            if the simulation is not running or the ants changed since the last epoch.
+        """
+        current = self.current_positions.get(id(colony))
+        if not self.is_running or current is None or len(current) != len(colony.ants):
+            return colony.get_ant_positions()
+        alpha = (time.perf_counter() - self.last_epoch_time) / self.epoch_interval
+        return interpolate_positions(self.previous_positions.get(id(colony)), current, alpha)
+
     def draw_pheromone(self):
         """
         Draw the pheromone grid.
         """
-        with self.canvas:
+        with self.epoch_layer:
             for colony in sim.colonies:
                 if colony.show_pheromone:
                         pheromone_shape = colony.pheromone.pheromone_array[0].shape
@@ -495,31 +824,118 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
         """
         Draw the food objects.
         """
-        with self.canvas:
+        with self.epoch_layer:
+            Color(1, 1, 1, 1)
             for food in sim.food:
                 if food.amount_of_food > 0:
-                    Image(source="../images/apple.png", pos=food.coordinates, size=(100, 100))
+                    Rectangle(texture=textures.get("apple"), pos=food.coordinates, size=(100, 100))
+
+    def draw_colonies(self):
+        """
+        Draw the nests of the Colony objects on the static layer.
+        """
+        with self.static_layer:
+            Color(1, 1, 1, 1)
+            for colony in sim.colonies:
+                Rectangle(texture=textures.get("colony"), pos=colony.coordinates, size=(100, 100))
 
     def draw_ants(self):
         """
-        Draw the Colony objects and their ants.
+        Draw the ants of the Colony objects and keep their instructions, so move_ants can move them.
         """
-        with self.canvas:
+        self.heatmap_active = self.use_ant_heatmap()
+        self.ant_layer.clear()
+        self.ant_instructions = {}
+        with self.ant_layer:
             for colony in sim.colonies:
-                Image(source="../images/colony.png", pos=colony.coordinates, size=(100, 100))
-                MDLabel(text=str(colony.food_counter), pos=(colony.coordinates[0]+35, colony.coordinates[1]+40), size=(50, 20))
-                for ant in colony.ants:
-                    Color(*colony.color)
-                    Ellipse(pos=ant.coordinates, size=(5, 5))
-                    if ant.pheromone_status == 1:
-                        Color(1, 0, 0, 1)
-                        Ellipse(pos=(ant.coordinates[0]+1.5, ant.coordinates[1]+1.5), size=(2, 2))
+                positions = self.get_display_positions(colony)
+                if self.heatmap_active:
+                    self.draw_ant_heatmap(colony, positions)
+                    continue
+                Color(*colony.color)
+                ants = [Ellipse(pos=(x, y), size=(5, 5)) for x, y in positions]
+                Color(1, 0, 0, 1)
+                carriers = [(index, Ellipse(pos=(x+1.5, y+1.5), size=(2, 2)))
+                            for index, ((x, y), ant) in enumerate(zip(positions, colony.ants)) if ant.pheromone_status == 1]
+                self.ant_instructions[id(colony)] = (ants, carriers)
+
+    def move_ants(self):
+        """
+        Move the drawn ants to their current display positions. The heatmap and ants that were added or
+        removed since the last drawing are drawn again.
+        """
+        if self.heatmap_active or len(self.ant_instructions) != len(sim.colonies):
+            self.draw_ants()
+            return
+        for colony in sim.colonies:
+            ants, carriers = self.ant_instructions.get(id(colony), ((), ()))
+            positions = self.get_display_positions(colony)
+            if len(ants) != len(positions):
+                self.draw_ants()
+                return
+            for ellipse, (x, y) in zip(ants, positions):
+                ellipse.pos = (x, y)
+            for index, ellipse in carriers:
+                x, y = positions[index]
+                ellipse.pos = (x+1.5, y+1.5)
+
+    def use_ant_heatmap(self):
+        """
+        Decide whether the ants are drawn as a density heatmap instead of single points.
+
+        Returns:
+        bool
+            True if the view is zoomed out too far or if there are too many ants and the view is not zoomed in.
+        """
+        if self.scale < self.lod_min_scale:
+            return True
+        ant_count = sum(len(colony.ants) for colony in sim.colonies)
+        return ant_count > self.lod_max_ants and self.scale < self.lod_zoom_in_scale
+
+    def draw_ant_heatmap(self, colony, positions):
+        """
+        Draw the ant density of a colony as one texture that covers the simulation area.
+        The density is counted with a 2D histogram, so the cost does not depend on the number of drawn ants.
+
+        Args:
+        colony : Colony
+            The colony whose ants are drawn.
+        positions : numpy array
+            The positions of the ants.
+        """
+        min_x, max_x, min_y, max_y = sim.bounds
+        n_x = max(1, int((max_x - min_x) // self.heatmap_cell_size))
+        n_y = max(1, int((max_y - min_y) // self.heatmap_cell_size))
+
+        counts, _, _ = np.histogram2d(positions[:, 0], positions[:, 1], bins=(n_x, n_y), range=((min_x, max_x), (min_y, max_y)))
+        density = np.sqrt(counts.T / max(counts.max(), 1))
+
+        pixels = np.empty((n_y, n_x, 4), dtype=np.uint8)
+        pixels[..., :3] = (np.clip(colony.color[:3], 0, 1) * 255).astype(np.uint8)
+        pixels[..., 3] = (density * 255).astype(np.uint8)
+
+        texture = self.heatmap_textures.get(id(colony))
+        if texture is None or tuple(texture.size) != (n_x, n_y):
+            texture = Texture.create(size=(n_x, n_y), colorfmt="rgba")
+            texture.mag_filter = "nearest"
+            self.heatmap_textures[id(colony)] = texture
+        texture.blit_buffer(pixels.tobytes(), colorfmt="rgba", bufferfmt="ubyte")
+
+        Color(1, 1, 1, 1)
+        Rectangle(texture=texture, pos=(min_x, min_y), size=(max_x - min_x, max_y - min_y))
+
+    def on_scale_change(self, *args):
+        """
+        Redraw the canvas if the zoom level switches between the heatmap and single ants.
+        """
+        if self.use_ant_heatmap() != self.heatmap_active:
+            self.update_canvas()
     
     def draw_food_life_bar(self):
         """
         Draw a life bar of the Food object above them.
         """
-        with self.canvas:
+        with self.epoch_layer:
             for food in sim.food:
                 if food.show_life_bar:
                     if food.amount_of_food > 0:
@@ -530,11 +946,20 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
 
     def draw_obstacles(self):
         """
-        Draw the obstacles.
+        Draw the obstacles on the static layer.
         """
-        with self.canvas:
+        with self.static_layer:
             for obstacle in sim.obstacles:
-                Image(source="../images/obstacle.png", pos=obstacle.coordinates, size=obstacle.size)
+                if obstacle.is_polygon():
+                    Color(0.45, 0.35, 0.25, 1)
+                    tesselator = Tesselator()
+                    tesselator.add_contour(obstacle.get_vertices().ravel().tolist())
+                    if tesselator.tesselate(WINDING_ODD, TYPE_POLYGONS):
+                        for vertices, indices in tesselator.meshes:
+                            Mesh(vertices=vertices, indices=indices, mode="triangle_fan")
+                else:
+                    Color(1, 1, 1, 1)
+                    Rectangle(texture=textures.get("obstacle"), pos=obstacle.coordinates, size=obstacle.size)
 
     def toggle_simulation(self, instance):
         """
@@ -556,9 +981,7 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
         """
         Clear the canvas.
         """
-        sim.food = []
-        sim.colonies = []
-        sim.obstacles = []
+        sim.clear()
         self.update_canvas()
 
     def on_touch_down(self, touch):
@@ -591,9 +1014,7 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
                     return True
             
             for obstacle in sim.obstacles:
-                obstacle_x, obstacle_y = obstacle.coordinates
-                if obstacle_x  < transformed_touch[0] < obstacle_x + 50 and \
-                    obstacle_y < transformed_touch[1] < obstacle_y + 50:
+                if obstacle.contains(*transformed_touch[:2]):
                     self.show_obstacle_dialog(obstacle)
                     return True
                 
@@ -607,6 +1028,9 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
             colony : Colony
                 The colony object to be edited.
             """
+            from kivymd.uix.dialog import MDDialog
+            from kivymd.uix.textfield import MDTextField
+
             ants_label = MDTextField(hint_text="Number of ants", text=str(len(colony.ants)))
             ant_settings_label = MDTextField(hint_text="Step size", text=str(colony.ants[0].step_size))
             carry_label = MDTextField(hint_text="Amount to carry", text=str(colony.ants[0].amount_to_carry))
@@ -665,6 +1089,9 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
         food : Food
             The food object to be edited.
         """
+        from kivymd.uix.dialog import MDDialog
+        from kivymd.uix.textfield import MDTextField
+
         food_label = MDBoxLayout(orientation="vertical", spacing="12dp")
 
         food_amount_label = MDBoxLayout(orientation="horizontal", size_hint=(1, .9), spacing="30dp")
@@ -729,6 +1156,8 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
         obstacle : Obstacle
             The obstacle object for which settings are being managed.
         """
+        from kivymd.uix.dialog import MDDialog
+
         self.dialog = MDDialog(
             title='Obstacle Settings',
             type="custom",
@@ -799,12 +1228,17 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
                 self.show_error_dialog("Pheromone reduction factor has to be non-negative.")
                 return
 
-            colony.amount = new_ant_count
-            colony.ants = []
-            colony.add_ants(step_size=new_step_size, amount_to_carry=new_amount_to_carry, search_radius=new_search_radius, pheromone_influence=new_pheromone_influence)
-            colony.color = new_color
-            colony.pheromone = Pheromone(grid_shape=new_pheromone_grid, reducing_factor=new_reducing_factor)
-            colony.show_pheromone = new_pheromone_state
+            # only the changed settings are applied, the running colony keeps its ants and pheromone
+            sim.reconfigure_colony(colony,
+                                   amount=new_ant_count,
+                                   color=new_color,
+                                   show_pheromone=new_pheromone_state,
+                                   reducing_factor=new_reducing_factor,
+                                   grid_pheromone_shape=new_pheromone_grid,
+                                   step_size=new_step_size,
+                                   amount_to_carry=new_amount_to_carry,
+                                   search_radius=new_search_radius,
+                                   pheromone_influence=new_pheromone_influence)
             self.dialog.dismiss()
 
         except ValueError:
@@ -840,6 +1274,8 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
             food.show_life_bar = new_life_bar_state
             food.move_after_number_of_epochs = new_move_random_epoch
             food.move_randomly = new_move_randomly_state
+            sim.update_food(food)
+            sim.schedule_food_relocation(food)
             self.dialog.dismiss()
 
         except ValueError:
@@ -853,6 +1289,8 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
         error_message : str
             The error message to be displayed in the dialog window.
         """
+        from kivymd.uix.dialog import MDDialog
+
         sound = SoundLoader.load("../sounds/error.mp3")
         if sound:
             sound.play()
@@ -890,11 +1328,11 @@ class SimulationWidget(ResizableDraggablePicture, Widget):
             The object to be deleted from the simulation.
         """
         if isinstance(object, Food):
-            sim.food.remove(object)
+            sim.remove_food(object)
         elif isinstance(object, Colony):
-            sim.colonies.remove(object)
+            sim.remove_colony(object)
         elif isinstance(object, Obstacle):
-            sim.obstacles.remove(object)
+            sim.remove_obstacle(object)
         self.dialog.dismiss()
         self.update_canvas()
 
@@ -1294,7 +1732,6 @@ class ButtonWidget(BoxLayout):
         )
 
         self.simulation_widget.clear_canvas()
-        self.simulation_widget.draw_bounds()
         self.simulation_widget.adjust_view()
 
     def on_food_button_press(self, instance):
@@ -1352,10 +1789,9 @@ class ButtonWidget(BoxLayout):
         
         if sim.bounds[0] < transformed_touch[0]-50 < sim.bounds[1]-90 and sim.bounds[2]-25 < transformed_touch[1]-50 < sim.bounds[3]-90:
             self.play_place_sound()
-            with self.simulation_widget.canvas:
-                Image(source="../images/apple.png", pos=(transformed_touch[0] - 50, transformed_touch[1] - 50), size=(100, 100))
             self.simulation_widget.unbind(on_touch_down=self.place_food)
             sim.add_food(Food(size=(100, 100), coordinates=(transformed_touch[0] - 50, transformed_touch[1] - 50), amount_of_food=100))
+            self.simulation_widget.update_canvas()
 
     def place_colony(self, instance, touch):
         """
@@ -1369,12 +1805,11 @@ class ButtonWidget(BoxLayout):
 
         if sim.bounds[0] < transformed_touch[0]-50 < sim.bounds[1]-90 and sim.bounds[2]-25 < transformed_touch[1]-50 < sim.bounds[3]-90:
             self.play_place_sound()
-            with self.simulation_widget.canvas:
-                Image(source="../images/colony.png", pos=(transformed_touch[0] - 50, transformed_touch[1] - 50), size=(100, 100))
             self.simulation_widget.unbind(on_touch_down=self.place_colony)
             n_row, n_col = int(sim.bounds[3]-sim.bounds[2])//40, int(sim.bounds[1]-sim.bounds[0])//40
             sim.add_colony(Colony(grid_pheromone_shape=(n_row, n_col), amount=100, size=(100, 100),
                                   coordinates=(transformed_touch[0] - 50, transformed_touch[1] - 50), color=(0, 0, 0, 1)))
+            self.simulation_widget.update_canvas()
 
     def place_obstacle(self, instance, touch):
         """
@@ -1390,16 +1825,15 @@ class ButtonWidget(BoxLayout):
 
         if sim.bounds[0] < transformed_touch[0]-50 < sim.bounds[1]-90 and sim.bounds[2]-25 < transformed_touch[1]-50 < sim.bounds[3]-90:
             self.play_place_sound()
-            with self.simulation_widget.canvas:
-                Image(source="../images/obstacle.png", pos=(transformed_touch[0] - 25, transformed_touch[1] - 25), size=(50, 50))
             self.simulation_widget.unbind(on_touch_down=self.place_obstacle)
             sim.add_obstacle(Obstacle(coordinates=(transformed_touch[0] - 25, transformed_touch[1] - 25), size=(50, 50)))
+            self.simulation_widget.update_canvas()
 
     def play_button_sound(self, *args):
         """
         Play a sound when a button is clicked.
         """
-        if self.parent.children[1].sound:
+        if self.simulation_widget.parent.sound:
             sound = SoundLoader.load("../sounds/click.mp3")
             if sound:
                 sound.play()
@@ -1408,7 +1842,7 @@ class ButtonWidget(BoxLayout):
         """
         Play a sound when an object is placed on the canvas.
         """
-        if self.parent.children[1].sound:
+        if self.simulation_widget.parent.sound:
             sound = SoundLoader.load("../sounds/place.mp3")
             if sound:
                 sound.play()
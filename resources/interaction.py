@@ -0,0 +1,125 @@
+import numpy as np
+from resources.spatial import CellList
+
+
+class AntInteraction:
+    """
+    Optional model of the interaction between ants that are close to each other.
+    The neighbours are found with a cell list that is rebuilt every epoch, so the cost grows linearly
+    with the number of ants. Ants at exactly the same position, like ants that were just born at the nest, are
+    handled as one group: the cell list only holds the distinct positions and every pair of positions stands for
+    all pairs of their ants, so coincident ants never make the search quadratic.
+    ----------
+
+    Args:
+    radius (float):
+        Ants closer than this distance interact. Defaults to 5, the size of an ant.
+    repulsion (float):
+        Fraction of the overlap by which two crowding ants are pushed apart (0 disables crowding). Defaults to 0.5.
+    communication (float):
+        How strongly a searching ant that meets a food carrying ant of its colony turns towards the direction the
+        carrier came from (0 disables communication). Defaults to 0.
+    ----------
+
+    Methods:
+    apply():
+        Applies crowding and communication to all ants of a simulation.
+    """
+    def __init__(self, radius=5, repulsion=0.5, communication=0.0):
+        self.radius = radius
+        self.repulsion = repulsion
+        self.communication = communication
+        self.cell_list = CellList(cell_size=radius)
+
+    def apply(self, simulation):
+        """
+        Applies crowding and communication to all ants of a simulation.
+        Crowding ants of all colonies push each other apart, the pushed positions are kept within the bounds
+        and outside of obstacles. Communication only happens between ants of the same colony.
+        ----------
+
+        Args:
+        simulation (Simulation):
+            The simulation whose ants interact.
+        ----------
+
+        Returns:
+        int:
+            The number of interacting pairs of ants.
+        """
+        ants = [ant for colony in simulation.colonies for ant in colony.ants]
+        if len(ants) < 2:
+            return 0
+        colony_ids = np.repeat(np.arange(len(simulation.colonies)), [len(colony.ants) for colony in simulation.colonies])
+        positions = np.array([ant.coordinates for ant in ants], dtype=float)
+
+        # distinct positions, group[k] is the position of ant k
+        points, group, counts = np.unique(positions, axis=0, return_inverse=True, return_counts=True)
+        group = group.reshape(-1)
+        self.cell_list.cell_size = self.radius
+        self.cell_list.build(points)
+        idx_i, idx_j = self.cell_list.find_pairs(self.radius)
+        pairs = int((counts * (counts - 1) // 2).sum() + (counts[idx_i] * counts[idx_j]).sum())
+        if pairs == 0:
+            return 0
+
+        if self.repulsion > 0:
+            self.push_apart(simulation, ants, positions, points, group, counts, idx_i, idx_j)
+        if self.communication > 0:
+            self.share_direction(ants, colony_ids, group, len(points), idx_i, idx_j)
+        return pairs
+
+    def push_apart(self, simulation, ants, positions, points, group, counts, idx_i, idx_j):
+        """
+        Pushes every pair of crowding ants apart along the line between them. Every ant of a position is pushed
+        by all ants of the neighbouring positions. Ants at the same position are spread at random over a disc
+        whose area grows with their number, so they end up about one radius apart.
+        """
+        offsets = points[idx_i] - points[idx_j]
+        distance = np.linalg.norm(offsets, axis=1)
+        push = (self.repulsion * (self.radius - np.minimum(distance, self.radius)) / 2 / distance)[:, None] * offsets
+        displacement = np.zeros_like(points)
+        np.add.at(displacement, idx_i, counts[idx_j, None] * push)
+        np.add.at(displacement, idx_j, -counts[idx_i, None] * push)
+        displacement = displacement[group]
+
+        crowded = np.flatnonzero(counts[group] > 1)
+        if len(crowded):
+            spread = self.repulsion * self.radius * np.sqrt(counts[group[crowded]]) / 2
+            angles = np.random.uniform(0, 2 * np.pi, len(crowded))
+            lengths = spread * np.sqrt(np.random.uniform(0, 1, len(crowded)))
+            displacement[crowded] += lengths[:, None] * np.column_stack((np.cos(angles), np.sin(angles)))
+
+        for idx in np.flatnonzero(displacement.any(axis=1)):
+            ants[idx].coordinates = simulation.check_future_position(positions[idx] + displacement[idx])
+
+    def share_direction(self, ants, colony_ids, group, n_points, idx_i, idx_j):
+        """
+        Turns searching ants that meet food carrying ants of their colony towards the direction the carriers came from.
+        The directions of the carriers are summed up per position and colony, so a searcher meets all carriers of its
+        own and the neighbouring positions.
+        """
+        statuses = np.array([ant.pheromone_status for ant in ants], dtype=np.int8)
+        searchers = np.flatnonzero(statuses == -1)
+        carriers = np.flatnonzero(statuses == 1)
+        if len(searchers) == 0 or len(carriers) == 0:
+            return
+
+        directions = np.array([ant.direction for ant in ants], dtype=float)
+        lengths = np.linalg.norm(directions, axis=1)
+        units = np.divide(directions, lengths[:, None], out=np.zeros_like(directions), where=lengths[:, None] > 0)
+
+        carried = np.zeros((n_points, colony_ids.max() + 1, 2))
+        np.add.at(carried, (group[carriers], colony_ids[carriers]), units[carriers])
+        met = carried.copy()
+        np.add.at(met, idx_i, carried[idx_j])
+        np.add.at(met, idx_j, carried[idx_i])
+        hints = -met[group[searchers], colony_ids[searchers]]
+
+        for idx, hint in zip(searchers, hints):
+            if not hint.any():
+                continue
+            direction = units[idx] + self.communication * hint
+            length = np.linalg.norm(direction)
+            if length > 0:
+                ants[idx].direction = direction * ants[idx].step_size / length
@@ -0,0 +1,202 @@
+"""
+Memory accounting of simulations. get_memory_report() measures a running simulation, estimate_memory() predicts
+the footprint of a scenario before it is built and fit_to_memory_budget() coarsens the pheromone grids of a
+scenario until it fits into a budget.
+"""
+import copy
+import sys
+import numpy as np
+from resources.precision import get_precision_policy
+
+# measured with tracemalloc for a colony of 5000 ants after two epochs (about 480 bytes), rounded up:
+# the ant object with its slots, its coordinates and direction arrays and its entry in the ant pool
+BYTES_PER_ANT = 512
+BYTES_PER_FOOD = 400
+BYTES_PER_OBSTACLE = 400
+# collision grid (bool), cached border normals (2 x float64), summed-area table and clearance of the free space map (int64)
+BYTES_PER_OCCUPANCY_CELL = 1 + 16 + 8 + 8
+
+
+def get_array_bytes(obj):
+    """
+    Sums the data of the numpy arrays an object holds in its attributes, in lists, tuples and dictionaries of them.
+    Views count with the part of their base they use.
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sum(get_array_bytes(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(get_array_bytes(value) for value in obj)
+    if hasattr(obj, "__dict__"):
+        return sum(get_array_bytes(value) for value in vars(obj).values() if isinstance(value, (np.ndarray, dict, list, tuple)))
+    return 0
+
+
+def get_object_bytes(obj):
+    """
+    Returns the size of an object with slots and of the values of its slots, without following references
+    to other entities. Numpy arrays count with their data.
+    """
+    size = sys.getsizeof(obj)
+    for name in getattr(type(obj), "__slots__", ()):
+        value = getattr(obj, name, None)
+        if isinstance(value, np.ndarray):
+            size += sys.getsizeof(value) + (0 if value.base is None else value.nbytes)
+        elif isinstance(value, (tuple, list)):
+            size += sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+        elif isinstance(value, (float, int)) and not -5 <= value <= 256:
+            size += sys.getsizeof(value)
+    return size
+
+
+def get_pheromone_bytes(pheromone):
+    """
+    Returns the bytes of a pheromone grid: its storage, unless it is a view into a shared pheromone field,
+    the decoded copy of quantized storage and the pyramid.
+    """
+    size = pheromone.storage.nbytes if pheromone.storage.base is None else 0
+    if pheromone.decoded is not None:
+        size += pheromone.decoded.nbytes
+    if pheromone.pyramid is not None:
+        size += get_array_bytes(pheromone.pyramid)
+    return size
+
+
+def get_memory_report(simulation, recorders=()):
+    """
+    Measures the memory a simulation uses, broken down by entity and cache.
+    ----------
+
+    Args:
+    simulation (Simulation):
+        The simulation to measure.
+    recorders (list, optional):
+        Frame writers or other recorders whose buffers should be counted. Defaults to ().
+    ----------
+
+    Returns:
+    dict:
+        Bytes per colony (ants, ant pool, pheromone), of all food and obstacles, of the recorders, of every
+        cache and the total.
+    """
+    colonies = []
+    for colony in simulation.colonies:
+        pool = colony.pool
+        ants = sum(get_object_bytes(ant) for ant in colony.ants)
+        pool_bytes = (sys.getsizeof(pool.slots) + pool.alive.nbytes + pool.age.nbytes
+                      + sys.getsizeof(pool.free) + sys.getsizeof(pool.slot_of))
+        pheromone = get_pheromone_bytes(colony.pheromone)
+        colonies.append({"ants": ants, "ant count": len(colony.ants), "pool": pool_bytes, "pheromone": pheromone,
+                         "total": get_object_bytes(colony) + ants + pool_bytes + pheromone})
+
+    food = sum(get_object_bytes(food) for food in simulation.food)
+    obstacles = sum(get_object_bytes(obstacle) + get_array_bytes(obstacle.shape) for obstacle in simulation.obstacles)
+
+    recorder_bytes = 0
+    for recorder in recorders:
+        recorder_bytes += get_array_bytes(recorder)
+        renderer = getattr(recorder, "renderer", None)
+        if renderer is not None:
+            # every capture renders one RGB frame
+            recorder_bytes += renderer.width * renderer.height * 3 + get_array_bytes(renderer)
+
+    caches = {
+        "occupancy": get_array_bytes(simulation.occupancy) if simulation.occupancy is not None else 0,
+        "free space": get_array_bytes(simulation.free_space) if simulation.free_space is not None else 0,
+        "flow fields": sum(get_array_bytes(field) for _, field in simulation.flow_fields.values()),
+        "pheromone field": simulation.pheromone_field.values.nbytes if simulation.pheromone_field is not None else 0,
+        "food index": sys.getsizeof(simulation.food_index.buckets) + sys.getsizeof(simulation.food_index.cells),
+        "scheduler": sys.getsizeof(simulation.scheduler.queue) + sum(sys.getsizeof(entry) for entry in simulation.scheduler.queue),
+        "profiler": sum(len(samples) * 36 for samples in simulation.profiler.samples.values()),
+    }
+
+    total = sum(colony["total"] for colony in colonies) + food + obstacles + recorder_bytes + sum(caches.values())
+    return {"colonies": colonies, "food": food, "obstacles": obstacles, "recorders": recorder_bytes,
+            "caches": caches, "total": total}
+
+
+def estimate_memory(data, precision="double", occupancy_cell_size=5):
+    """
+    Estimates the memory a scenario needs before it is built.
+    ----------
+
+    Args:
+    data (dict):
+        The scenario, in the format of statistics.json (see scenario.py).
+    precision (str or PrecisionPolicy):
+        The precision the scenario runs with. Defaults to "double".
+    occupancy_cell_size (float):
+        The cell size of the collision grid. Defaults to 5.
+    ----------
+
+    Returns:
+    dict:
+        The estimated bytes of the ants and pheromone grids of every colony, of food, obstacles and the collision
+        grid, and the total.
+    """
+    policy = get_precision_policy(precision)
+    # quantized grids keep a decoded float32 copy
+    bytes_per_cell = 2 * policy.pheromone_dtype.itemsize + (2 * 4 if policy.pheromone_dtype.kind in "ui" else 0)
+
+    colonies = []
+    for colony_data in data.get("colonies", []):
+        rows, cols = colony_data.get("pheromone grid", (100, 100))
+        ants = colony_data.get("amount", 100) * BYTES_PER_ANT
+        pheromone = rows * cols * bytes_per_cell
+        colonies.append({"ants": ants, "pheromone": pheromone, "total": ants + pheromone})
+
+    food = len(data.get("food", [])) * BYTES_PER_FOOD
+    obstacles = len(data.get("obstacles", [])) * BYTES_PER_OBSTACLE
+    occupancy = 0
+    if data.get("obstacles"):
+        min_x, max_x, min_y, max_y = data["simulation"][0]["boundaries"]
+        cells = np.ceil((max_x - min_x) / occupancy_cell_size) * np.ceil((max_y - min_y) / occupancy_cell_size)
+        occupancy = int(cells) * BYTES_PER_OCCUPANCY_CELL
+
+    total = sum(colony["total"] for colony in colonies) + food + obstacles + occupancy
+    return {"colonies": colonies, "food": food, "obstacles": obstacles, "occupancy": occupancy, "total": total}
+
+
+def fit_to_memory_budget(data, budget, precision="double", downsample=True):
+    """
+    Checks a scenario against a memory budget before it is built. If it does not fit, the pheromone grids of all
+    colonies are halved in both directions until it fits.
+    ----------
+
+    Args:
+    data (dict):
+        The scenario.
+    budget (int):
+        The memory budget in bytes.
+    precision (str or PrecisionPolicy):
+        The precision the scenario runs with. Defaults to "double".
+    downsample (bool):
+        Whether the pheromone grids may be coarsened. If False, a scenario over the budget is rejected. Defaults to True.
+    ----------
+
+    Returns:
+    dict:
+        The scenario, a coarsened copy if it had to be downsampled.
+
+    Raises:
+    ValueError:
+        If the scenario does not fit, even with the coarsest pheromone grids.
+    """
+    estimate = estimate_memory(data, precision)
+    if estimate["total"] <= budget:
+        return data
+    if not downsample:
+        raise ValueError(f"The scenario needs about {estimate['total']} bytes, more than the budget of {budget} bytes.")
+
+    data = copy.deepcopy(data)
+    colonies = data.get("colonies", [])
+    while estimate["total"] > budget:
+        shapes = [tuple(colony_data.get("pheromone grid", (100, 100))) for colony_data in colonies]
+        if all(shape == (1, 1) for shape in shapes):
+            raise ValueError(f"The scenario needs about {estimate['total']} bytes even with the coarsest pheromone grids, "
+                             f"more than the budget of {budget} bytes.")
+        for colony_data, (rows, cols) in zip(colonies, shapes):
+            colony_data["pheromone grid"] = [max(1, -(-rows // 2)), max(1, -(-cols // 2))]
+        estimate = estimate_memory(data, precision)
+    return data
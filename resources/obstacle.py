@@ -1,6 +1,11 @@
+import numpy as np
+
+
 class Obstacle:
     """
     Initializes an obstacle object within the search space.
+    An obstacle is an axis-aligned box by default. With vertices or a rotation it becomes a polygon,
+    coordinates and size then describe its bounding box.
     -------
 
     Args:
@@ -8,8 +13,113 @@ class Obstacle:
         The (x, y) coordinates of the obstacle in the search space.
     size (tuple):
         The size of the obstacle in the search space. Defaults to (50, 50).
+    vertices (list, optional):
+        The (x, y) corners of a polygon in the search space, in order along the outline. Defaults to None.
+    rotation (float, optional):
+        Rotation of the box around its center in degrees, counterclockwise. Ignored if vertices are given. Defaults to 0.
+    -------
+
+    Attributes:
+    shape (numpy array):
+        The corners of the polygon relative to coordinates, None for a plain box.
+    -------
+
+    Methods:
+    is_polygon():
+        Checks if the obstacle is not a plain axis-aligned box.
+    get_vertices():
+        Returns the corners of the obstacle in the search space.
+    contains():
+        Checks if points lie inside the obstacle.
     """
-    def __init__(self, coordinates, size=(50, 50)):
+    __slots__ = ("coordinates", "size", "shape")
+
+    def __init__(self, coordinates, size=(50, 50), vertices=None, rotation=0):
         self.coordinates = coordinates
         self.size = size
-        
\ No newline at end of file
+        self.shape = None
+
+        if vertices is None and rotation % 360 != 0:
+            x, y = coordinates
+            width, height = size
+            corners = np.array([(0, 0), (width, 0), (width, height), (0, height)], dtype=float) - (width / 2, height / 2)
+            angle = np.radians(rotation)
+            rotation_matrix = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+            vertices = corners @ rotation_matrix.T + (x + width / 2, y + height / 2)
+
+        if vertices is not None:
+            vertices = np.asarray(vertices, dtype=float).reshape(-1, 2)
+            if len(vertices) < 3:
+                raise ValueError("A polygon obstacle needs at least 3 vertices.")
+            lower_left = vertices.min(axis=0)
+            self.coordinates = tuple(lower_left.tolist())
+            self.size = tuple((vertices.max(axis=0) - lower_left).tolist())
+            self.shape = vertices - lower_left
+
+    def is_polygon(self):
+        """
+        Checks if the obstacle is not a plain axis-aligned box.
+        """
+        return self.shape is not None
+
+    def get_vertices(self):
+        """
+        Returns the corners of the obstacle in the search space. They follow the coordinates if the obstacle is moved.
+        -------
+
+        Returns:
+        numpy array:
+            Array of shape (number of corners, 2).
+        """
+        if self.shape is None:
+            width, height = self.size
+            shape = np.array([(0, 0), (width, 0), (width, height), (0, height)], dtype=float)
+        else:
+            shape = self.shape
+        return shape + np.asarray(self.coordinates, dtype=float)
+
+    def contains(self, x, y):
+        """
+        Checks if points lie inside the obstacle.
+        -------
+
+        Args:
+        x, y (float or numpy array):
+            The coordinates of the points.
+        -------
+
+        Returns:
+        bool or numpy array:
+            True for every point inside the obstacle.
+        """
+        return points_in_polygon(x, y, self.get_vertices())
+
+
+def points_in_polygon(x, y, vertices):
+    """
+    Even-odd test of many points against one polygon: a point is inside if a ray to the right crosses the outline
+    an odd number of times. Works for convex and concave polygons.
+    -------
+
+    Args:
+    x, y (float or numpy array):
+        The coordinates of the points.
+    vertices (numpy array):
+        The corners of the polygon, of shape (number of corners, 2).
+    -------
+
+    Returns:
+    bool or numpy array:
+        True for every point inside the polygon.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    inside = np.zeros(np.broadcast(x, y).shape, dtype=bool)
+    start_x, start_y = vertices[:, 0], vertices[:, 1]
+    end_x, end_y = np.roll(start_x, -1), np.roll(start_y, -1)
+    for x1, y1, x2, y2 in zip(start_x, start_y, end_x, end_y):
+        if y1 == y2:
+            continue
+        crosses = (y1 > y) != (y2 > y)
+        intersection_x = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+        inside ^= crosses & (x < intersection_x)
+    return inside
@@ -0,0 +1,323 @@
+import numpy as np
+
+
+class OccupancyGrid:
+    """
+    Rasterized map of the obstacles in the simulation area.
+    Every cell of the grid is either free or blocked by an obstacle, so collision queries become table lookups.
+    ----------
+
+    Args:
+    bounds (tuple):
+        The bounds (min_x, max_x, min_y, max_y) of the simulation area.
+    cell_size (float):
+        The edge length of one cell in simulation coordinates. Defaults to 5, the size of an ant.
+    ----------
+
+    Attributes:
+    blocked (numpy array):
+        Boolean array of shape (rows, columns). Row 0 is the top of the simulation area (max_y).
+    normals (numpy array):
+        Array of shape (rows, columns, 2) with the outward unit normal (x, y) of every blocked cell at the border
+        of an obstacle, zero elsewhere. Computed on first use by get_normals().
+    version (int):
+        Increased whenever obstacles are added, so that maps derived from the grid notice changes.
+    ----------
+
+    Methods:
+    from_obstacles():
+        Creates a grid and rasterizes the given obstacles.
+    add_obstacle():
+        Marks all cells that overlap an obstacle as blocked.
+    get_normals():
+        Returns the outward normals of the border cells.
+    world_to_cell():
+        Maps simulation coordinates to cell indices.
+    cell_to_world():
+        Maps cell indices to the simulation coordinates of the cell centers.
+    is_blocked():
+        Checks if positions lie in blocked cells.
+    normal_at():
+        Looks up the outward normal at a position.
+    find_nearest_free():
+        Returns the center of the closest free cell.
+    trace_segments():
+        Finds the first blocked cell along many line segments at once.
+    """
+    # (row offset, column offset) of the 8 neighbours of a cell
+    neighbours = ((0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (1, 1))
+
+    def __init__(self, bounds, cell_size=5):
+        self.bounds = tuple(bounds)
+        self.cell_size = cell_size
+
+        min_x, max_x, min_y, max_y = self.bounds
+        self.n_col = max(1, int(np.ceil((max_x - min_x) / cell_size)))
+        self.n_row = max(1, int(np.ceil((max_y - min_y) / cell_size)))
+        self.blocked = np.zeros((self.n_row, self.n_col), dtype=bool)
+        self.normals = None
+        self.version = 0
+
+    @classmethod
+    def from_obstacles(cls, bounds, obstacles, cell_size=5):
+        """
+        Creates a grid and rasterizes the given obstacles.
+        ----------
+
+        Args:
+        bounds (tuple):
+            The bounds of the simulation area.
+        obstacles (list):
+            The Obstacle objects.
+        cell_size (float):
+            The edge length of one cell.
+        ----------
+
+        Returns:
+        OccupancyGrid:
+            The grid with all obstacles marked as blocked.
+        """
+        grid = cls(bounds, cell_size)
+        for obstacle in obstacles:
+            grid.add_obstacle(obstacle)
+        return grid
+
+    def add_obstacle(self, obstacle):
+        """
+        Marks all cells that overlap an obstacle as blocked.
+        Boxes block every cell they touch. Polygons block the cells whose centers lie inside and the cells
+        their outline passes through, so thin parts are not lost between cell centers.
+        ----------
+
+        Args:
+        obstacle (Obstacle):
+            The obstacle with its lower left coordinates and size.
+        """
+        min_x, _, _, max_y = self.bounds
+        x, y = obstacle.coordinates
+        width, height = obstacle.size
+
+        col_start = max(int(np.floor((x - min_x) / self.cell_size)), 0)
+        col_end = max(int(np.ceil((x + width - min_x) / self.cell_size)), 0)
+        row_start = max(int(np.floor((max_y - (y + height)) / self.cell_size)), 0)
+        row_end = max(int(np.ceil((max_y - y) / self.cell_size)), 0)
+        self.normals = None
+        self.version += 1
+
+        if not obstacle.is_polygon():
+            self.blocked[row_start:row_end, col_start:col_end] = True
+            return
+
+        rows, cols = np.mgrid[row_start:min(row_end, self.n_row), col_start:min(col_end, self.n_col)]
+        center_x, center_y = self.cell_to_world(rows, cols)
+        self.blocked[rows, cols] |= obstacle.contains(center_x, center_y)
+
+        vertices = obstacle.get_vertices()
+        for start, end in zip(vertices, np.roll(vertices, -1, axis=0)):
+            samples = max(2, int(np.ceil(2 * np.linalg.norm(end - start) / self.cell_size)) + 1)
+            points = np.linspace(start, end, samples)
+            edge_rows, edge_cols = self.world_to_cell(points[:, 0], points[:, 1])
+            self.blocked[edge_rows, edge_cols] = True
+
+    def get_normals(self):
+        """
+        Returns the outward unit normals of the blocked cells at the border of obstacles.
+        The normal of a cell is the sum of the directions to its free neighbours, so at straight walls it is
+        perpendicular to the wall and at corners it points diagonally outwards. Cells outside the grid count as free.
+        ----------
+
+        Returns:
+        numpy array:
+            Array of shape (rows, columns, 2), zero for free cells and cells inside obstacles.
+        """
+        if self.normals is not None:
+            return self.normals
+
+        free = np.pad(~self.blocked, 1, constant_values=True)
+        normals = np.zeros((self.n_row, self.n_col, 2))
+        for d_row, d_col in self.neighbours:
+            neighbour_free = free[1 + d_row:1 + d_row + self.n_row, 1 + d_col:1 + d_col + self.n_col]
+            direction = np.array((d_col, -d_row), dtype=float) / np.hypot(d_row, d_col)
+            normals += neighbour_free[..., None] * direction
+
+        length = np.linalg.norm(normals, axis=2)
+        valid = self.blocked & (length > 0)
+        normals[valid] /= length[valid][:, None]
+        normals[~valid] = 0
+        self.normals = normals
+        return normals
+
+    def normal_at(self, x, y):
+        """
+        Looks up the outward normal at positions.
+        ----------
+
+        Args:
+        x, y (float or numpy array):
+            The simulation coordinates.
+        ----------
+
+        Returns:
+        numpy array:
+            The unit normals (x, y), zero outside of border cells.
+        """
+        rows, cols = self.world_to_cell(x, y)
+        return self.get_normals()[rows, cols]
+
+    def find_nearest_free(self, x, y):
+        """
+        Returns the center of the free cell closest to a position, searching rings of growing radius.
+        ----------
+
+        Args:
+        x, y (float):
+            The simulation coordinates.
+        ----------
+
+        Returns:
+        tuple:
+            The (x, y) center of the closest free cell, or the position itself if the grid has no free cell.
+        """
+        row, col = (int(index) for index in self.world_to_cell(x, y))
+        for radius in range(max(self.n_row, self.n_col)):
+            row_start, row_end = max(row - radius, 0), min(row + radius + 1, self.n_row)
+            col_start, col_end = max(col - radius, 0), min(col + radius + 1, self.n_col)
+            free_rows, free_cols = np.nonzero(~self.blocked[row_start:row_end, col_start:col_end])
+            if len(free_rows):
+                center_x, center_y = self.cell_to_world(free_rows + row_start, free_cols + col_start)
+                closest = np.argmin((center_x - x) ** 2 + (center_y - y) ** 2)
+                return (float(center_x[closest]), float(center_y[closest]))
+        return (x, y)
+
+    def world_to_cell(self, x, y):
+        """
+        Maps simulation coordinates to cell indices. Positions outside the area are clipped to the border cells.
+        ----------
+
+        Args:
+        x, y (float or numpy array):
+            The simulation coordinates.
+        ----------
+
+        Returns:
+        tuple:
+            The row and column indices.
+        """
+        min_x, _, _, max_y = self.bounds
+        cols = np.clip(np.floor((np.asarray(x) - min_x) / self.cell_size).astype(int), 0, self.n_col - 1)
+        rows = np.clip(np.floor((max_y - np.asarray(y)) / self.cell_size).astype(int), 0, self.n_row - 1)
+        return rows, cols
+
+    def cell_to_world(self, rows, cols):
+        """
+        Maps cell indices to the simulation coordinates of the cell centers.
+        ----------
+
+        Args:
+        rows, cols (int or numpy array):
+            The cell indices.
+        ----------
+
+        Returns:
+        tuple:
+            The x and y coordinates of the cell centers.
+        """
+        min_x, _, _, max_y = self.bounds
+        x = min_x + (np.asarray(cols) + 0.5) * self.cell_size
+        y = max_y - (np.asarray(rows) + 0.5) * self.cell_size
+        return x, y
+
+    def is_blocked(self, x, y):
+        """
+        Checks if positions lie in blocked cells.
+        ----------
+
+        Args:
+        x, y (float or numpy array):
+            The simulation coordinates.
+        ----------
+
+        Returns:
+        bool or numpy array:
+            True for every position inside a blocked cell.
+        """
+        rows, cols = self.world_to_cell(x, y)
+        return self.blocked[rows, cols]
+
+    def trace_segments(self, starts, ends):
+        """
+        Finds the first blocked cell along line segments, e.g. the moves of all ants in an epoch.
+        All segments walk through the cells they cross at the same time (grid traversal after Amanatides and Woo),
+        so a segment cannot jump over a thin obstacle, and the number of iterations is the number of cells crossed
+        by the longest segment.
+        ----------
+
+        Args:
+        starts, ends (numpy array):
+            Arrays of shape (number of segments, 2) with the (x, y) start and end points.
+        ----------
+
+        Returns:
+        tuple:
+            A boolean array that is True for every segment that hits a blocked cell, the fraction of the segment
+            (0 to 1) at which it enters that cell, the row and column of the cell and the unit normal (x, y) of the
+            cell face the segment entered through (zero if the segment starts inside the cell).
+        """
+        starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+        n_segments = len(starts)
+        min_x, _, _, max_y = self.bounds
+
+        # grid coordinates: u along the columns, v along the rows
+        start_u, start_v = (starts[:, 0] - min_x) / self.cell_size, (max_y - starts[:, 1]) / self.cell_size
+        end_u, end_v = (ends[:, 0] - min_x) / self.cell_size, (max_y - ends[:, 1]) / self.cell_size
+        delta_u, delta_v = end_u - start_u, end_v - start_v
+
+        cols, rows = self.clip_cells(np.floor(start_u), np.floor(start_v))
+        end_cols, end_rows = self.clip_cells(np.floor(end_u), np.floor(end_v))
+        step_col, step_row = np.sign(delta_u).astype(int), np.sign(delta_v).astype(int)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_delta_u = np.where(delta_u != 0, np.abs(1 / delta_u), np.inf)
+            t_delta_v = np.where(delta_v != 0, np.abs(1 / delta_v), np.inf)
+            t_max_u = np.where(delta_u != 0, (cols + (step_col > 0) - start_u) / delta_u, np.inf)
+            t_max_v = np.where(delta_v != 0, (rows + (step_row > 0) - start_v) / delta_v, np.inf)
+
+        hit = np.zeros(n_segments, dtype=bool)
+        t_hit = np.ones(n_segments)
+        t_enter = np.zeros(n_segments)
+        faces = np.zeros((n_segments, 2))
+        face_hit = np.zeros((n_segments, 2))
+        active = np.ones(n_segments, dtype=bool)
+
+        for _ in range(int(np.max(np.abs(end_cols - cols) + np.abs(end_rows - rows), initial=0)) + 1):
+            blocked = active & self.blocked[rows, cols]
+            hit |= blocked
+            t_hit[blocked] = t_enter[blocked]
+            face_hit[blocked] = faces[blocked]
+            active &= ~blocked & ((rows != end_rows) | (cols != end_cols))
+            if not active.any():
+                break
+
+            along_u = active & (t_max_u < t_max_v)
+            along_v = active & ~along_u
+            t_enter[along_u], t_enter[along_v] = t_max_u[along_u], t_max_v[along_v]
+            faces[along_u] = np.column_stack((-step_col[along_u], np.zeros(along_u.sum())))
+            faces[along_v] = np.column_stack((np.zeros(along_v.sum()), step_row[along_v]))
+            cols[along_u] += step_col[along_u]
+            rows[along_v] += step_row[along_v]
+            t_max_u[along_u] += t_delta_u[along_u]
+            t_max_v[along_v] += t_delta_v[along_v]
+
+            # a segment that would leave the grid or overshoot its end has reached the last cell it can cross
+            leaves = active & ((cols < 0) | (cols >= self.n_col) | (rows < 0) | (rows >= self.n_row) | (t_enter > 1))
+            active &= ~leaves
+            cols, rows = self.clip_cells(cols, rows)
+
+        return hit, np.minimum(t_hit, 1.0), rows, cols, face_hit
+
+    def clip_cells(self, cols, rows):
+        """
+        Clips column and row indices to the grid.
+        """
+        return (np.clip(cols, 0, self.n_col - 1).astype(int), np.clip(rows, 0, self.n_row - 1).astype(int))
@@ -2,7 +2,7 @@ import numpy as np
 
 
 class Pheromone:
-    def __init__(self, grid_shape, reducing_factor=0.09):
+    def __init__(self, grid_shape, reducing_factor=0.09, multi_resolution=False, near_field_radius=4, dtype=np.float64, scale=1/256):
         """
         Manages pheromone information in a tensor within a simulated environment.
         The tensor represents the pheromone strength at different positions within the simulation area.
@@ -10,11 +10,21 @@ class Pheromone:
 
         Args:
             grid_shape (Tuple[int, int]): A tuple representing the height and width of the simulated environment.
+            multi_resolution (bool): Whether a max-pooled pyramid of the pheromone strength is kept for long-range sensing.
+            near_field_radius (int): Search radii up to this value are searched on the full resolution grid,
+                                     larger radii on the coarsest pyramid level that keeps the window within this radius.
+            dtype (numpy dtype): The storage type of the pheromone strength. Float types store the strength directly,
+                                 unsigned integer types store the quantized absolute strength in steps of scale.
+            scale (float): The strength of one quantization step for integer storage. Defaults to 1/256.
         ----------
 
         Attributes:
             pheromones (numpy.ndarray): A 3D numpy array of dimensions (Depth, Height, Width), storing the pheromone strength at each visited position(int).
                                         The depth represents different pheromone matrices ('coming from colony' = -1 | 'coming from food' = 1).
+                                        With integer storage this is a float32 copy that is decoded on first access and kept up to date by deposits and reductions.
+            storage (numpy.ndarray): The pheromone strength in the storage type.
+            pyramid (list): For each depth a list of the coarser levels. Every cell of level k holds the maximum absolute
+                            pheromone strength of the 2x2 cells below it, level 0 being the pheromone array itself.
         ----------
 
         Methods:
@@ -23,9 +33,108 @@ class Pheromone:
 
         reduce_pheromone(reducing_factor: float, zero_threshold: float):
                 Reduces the pheromone strength in the tensor after each epoch.
+
+        count_active_cells():
+                Counts the cells that currently hold pheromone.
+
+        build_pyramid():
+                Builds the max-pooled pyramid of both depths from scratch.
+
+        find_strongest_cell(depth: int, row: int, col: int, search_radius: int):
+                Finds the cell with the strongest pheromone around a position, using the pyramid for large radii.
+
+        summed_area_tables():
+                Builds one summed-area table of the pheromone strength per depth.
+
+        set_dtype(dtype: numpy dtype, scale: float):
+                Converts the storage to another type.
+
+        resample(grid_shape: Tuple[int, int]):
+                Changes the grid shape, keeping the pheromone.
         """
-        self.pheromone_array = np.zeros((2, grid_shape[0], grid_shape[1]))
+        self.dtype = np.dtype(dtype)
+        self.scale = scale
+        self.storage = np.zeros((2, grid_shape[0], grid_shape[1]), dtype=self.dtype)
+        self.decoded = None
         self.reducing_factor = reducing_factor
+        self.multi_resolution = multi_resolution
+        self.near_field_radius = near_field_radius
+        self.pyramid = None
+        self.pyramid_source = None
+        if multi_resolution:
+            self.build_pyramid()
+
+    @property
+    def quantized(self):
+        return self.dtype.kind in "ui"
+
+    @property
+    def pheromone_array(self):
+        if not self.quantized:
+            return self.storage
+        if self.decoded is None:
+            self.decoded = self.decode(self.storage)
+        return self.decoded
+
+    @pheromone_array.setter
+    def pheromone_array(self, pheromone_array):
+        if self.quantized:
+            self.storage = self.encode(pheromone_array)
+            self.decoded = None
+        else:
+            self.storage = np.asarray(pheromone_array, dtype=self.dtype)
+
+    def encode(self, pheromone_array):
+        """
+        Quantizes signed pheromone strengths to the integer storage type. Values beyond the range are saturated.
+        """
+        steps = np.rint(np.abs(pheromone_array) / self.scale)
+        return np.clip(steps, 0, np.iinfo(self.dtype).max).astype(self.dtype)
+
+    def decode(self, storage):
+        """
+        Converts quantized storage back to signed float32 strengths, negative for the depth of the colony trails.
+        """
+        decoded = storage.astype(np.float32) * np.float32(self.scale)
+        decoded[0] *= -1
+        return decoded
+
+    def set_dtype(self, dtype, scale=None):
+        """
+        Converts the storage to another type, keeping the pheromone strength up to the precision of the new type.
+        ------------
+
+        Args:
+            dtype (numpy dtype): The new storage type.
+            scale (float): The strength of one quantization step for integer storage. Defaults to the current scale.
+        """
+        pheromone_array = np.array(self.pheromone_array, dtype=np.float64)
+        self.dtype = np.dtype(dtype)
+        if scale is not None:
+            self.scale = scale
+        self.decoded = None
+        self.pheromone_array = pheromone_array
+        if self.multi_resolution:
+            self.build_pyramid()
+
+    def resample(self, grid_shape):
+        """
+        Changes the shape of the grid and keeps the pheromone. Every new cell gets the area-weighted mean of the
+        old cells it overlaps, so trails keep their strength and position when the resolution changes.
+        ------------
+
+        Args:
+            grid_shape (Tuple[int, int]): The new number of rows and columns.
+        """
+        n_row, n_col = self.storage.shape[1:]
+        row_weights = overlap_weights(n_row, grid_shape[0])
+        col_weights = overlap_weights(n_col, grid_shape[1])
+        pheromone_array = np.array(self.pheromone_array, dtype=np.float64)
+        resampled = np.einsum("ij,djk,lk->dil", row_weights, pheromone_array, col_weights)
+        self.decoded = None
+        self.pheromone_array = resampled
+        if self.multi_resolution:
+            self.build_pyramid()
 
     def leave_pheromone(self, pos, pheromone_status):
         """
@@ -48,8 +157,24 @@ class Pheromone:
         
         #Add pheromones status in the corresponding position
 
+        if self.quantized:
+            # saturating add of one step of strength per deposit
+            step = int(round(abs(pheromone_status) / self.scale))
+            value = min(int(self.storage[depth, pos[0], pos[1]]) + step, np.iinfo(self.dtype).max)
+            self.storage[depth, pos[0], pos[1]] = value
+            if self.decoded is not None:
+                # keep the decoded copy, so the pyramid built from it stays valid
+                strength = np.float32(value) * np.float32(self.scale)
+                self.decoded[depth, pos[0], pos[1]] = -strength if depth == 0 else strength
+            if self.multi_resolution:
+                self.update_pyramid(depth, pos[0], pos[1])
+            return
+
         self.pheromone_array[depth, pos[0], pos[1]] += pheromone_status
 
+        if self.multi_resolution:
+            self.update_pyramid(depth, pos[0], pos[1])
+
 
     def reduce_pheromones(self, zero_threshold = 0.01):
         """
@@ -68,6 +193,318 @@ class Pheromone:
         """
 
 
+        if self.quantized:
+            reduced = self.storage * np.float32(self.reducing_factor)
+            reduced[reduced * self.scale < zero_threshold] = 0
+            self.storage[:] = np.rint(reduced)
+            if self.decoded is not None:
+                self.decoded[:] = self.decode(self.storage)
+            self.reduce_pyramid(zero_threshold)
+            return
+
         self.pheromone_array *= self.reducing_factor
         self.pheromone_array[0][self.pheromone_array[0] > - zero_threshold] = 0
         self.pheromone_array[1][self.pheromone_array[1] < zero_threshold] = 0
+
+        self.reduce_pyramid(zero_threshold)
+
+    def reduce_pyramid(self, zero_threshold=0.01):
+        """
+        Reduces the coarse levels of the pyramid after the pheromone array was reduced.
+        Scaling, thresholding and rounding to quantization steps commute with the maximum, so the coarse levels
+        are reduced the same way.
+        """
+        if self.multi_resolution and self.pyramid_source is self.pheromone_array:
+            for levels in self.pyramid:
+                for level in levels:
+                    if self.quantized:
+                        reduced = np.rint(level / np.float32(self.scale)) * np.float32(self.reducing_factor)
+                        reduced[reduced * self.scale < zero_threshold] = 0
+                        level[:] = np.rint(reduced) * np.float32(self.scale)
+                    else:
+                        level *= self.reducing_factor
+                        level[level < zero_threshold] = 0
+
+    def count_active_cells(self):
+        """
+        Counts the cells of both depths that currently hold pheromone.
+        ------------
+
+        Returns:
+            int: The number of non-zero entries in the pheromone tensor.
+        """
+        return int(np.count_nonzero(self.storage))
+
+    def build_pyramid(self):
+        """
+        Builds the max-pooled pyramid of both depths from scratch and enables multi-resolution sensing.
+        Afterwards the pyramid is updated incrementally by leave_pheromone() and reduce_pheromones().
+        """
+        self.multi_resolution = True
+        self.pyramid = []
+        for depth in range(self.pheromone_array.shape[0]):
+            levels = []
+            level = np.abs(self.pheromone_array[depth])
+            while level.shape[0] > 1 or level.shape[1] > 1:
+                level = max_pool(level)
+                levels.append(level)
+            self.pyramid.append(levels)
+        self.pyramid_source = self.pheromone_array
+
+    def update_pyramid(self, depth, row, col):
+        """
+        Propagates the new strength of a single cell up through the pyramid.
+        Leaving pheromone only increases the strength, so the walk stops at the first level that is already stronger.
+        ------------
+
+        Args:
+            depth (int): The depth of the changed cell.
+            row (int), col (int): The index of the changed cell.
+        """
+        if self.pyramid_source is not self.pheromone_array:
+            self.build_pyramid()
+            return
+
+        n_row, n_col = self.pheromone_array.shape[1:]
+        row, col = row % n_row, col % n_col
+        value = abs(self.pheromone_array[depth, row, col])
+        for level in self.pyramid[depth]:
+            row, col = row // 2, col // 2
+            if level[row, col] >= value:
+                break
+            level[row, col] = value
+
+    def find_strongest_cell(self, depth, row, col, search_radius):
+        """
+        Finds the cell with the strongest pheromone of a depth within the search radius around a position.
+        Small radii are searched on the full grid. For larger radii the window is searched on a coarse pyramid
+        level and the strongest coarse cell is refined level by level, so the cost grows with the logarithm of
+        the radius instead of its square. On coarse levels the window is rounded to whole coarse cells.
+        ------------
+
+        Args:
+            depth (int): The depth to search.
+            row (int), col (int): The center of the search on the full grid.
+            search_radius (int): The radius of the search on the full grid.
+        ------------
+
+        Returns:
+            tuple: The row and column of the strongest cell, or None if there is no pheromone within the radius.
+        """
+        if not self.multi_resolution or self.pyramid_source is not self.pheromone_array:
+            self.build_pyramid()
+
+        # the absolute value is only taken of the searched cells, not of the whole grid
+        levels = [self.pheromone_array[depth]] + self.pyramid[depth]
+        level_idx = 0
+        radius = search_radius
+        while radius > self.near_field_radius and level_idx + 1 < len(levels):
+            level_idx += 1
+            radius = -(-search_radius // 2 ** level_idx)
+
+        level = levels[level_idx]
+        center_row, center_col = row // 2 ** level_idx, col // 2 ** level_idx
+        start_row, start_col = max(0, center_row - radius), max(0, center_col - radius)
+        window = np.abs(level[start_row:center_row + radius + 1, start_col:center_col + radius + 1])
+        if window.size == 0:
+            return None
+
+        best_row, best_col = np.unravel_index(np.argmax(window), window.shape)
+        if window[best_row, best_col] == 0:
+            return None
+        best_row, best_col = start_row + best_row, start_col + best_col
+
+        for level in reversed(levels[:level_idx]):
+            children = np.abs(level[2 * best_row:2 * best_row + 2, 2 * best_col:2 * best_col + 2])
+            child_row, child_col = np.unravel_index(np.argmax(children), children.shape)
+            best_row, best_col = 2 * best_row + child_row, 2 * best_col + child_col
+
+        return int(best_row), int(best_col)
+
+    def summed_area_tables(self, pheromone_array=None):
+        """
+        Builds one summed-area table (integral image) of the absolute pheromone strength per depth.
+        The sum of any rectangle of cells can then be read with four lookups.
+        ------------
+
+        Args:
+            pheromone_array (numpy.ndarray): The array to sum instead of the own pheromone array, e.g. the
+                                             sensing array of a shared pheromone field. Defaults to None.
+        ------------
+
+        Returns:
+            numpy.ndarray: An array of shape (Depth, Height + 1, Width + 1). Entry [d, r, c] holds the
+                           strength of depth d summed over all cells above row r and left of column c.
+        """
+        if pheromone_array is None:
+            pheromone_array = self.pheromone_array
+        depth, n_row, n_col = pheromone_array.shape
+        tables = np.zeros((depth, n_row + 1, n_col + 1))
+        np.cumsum(np.cumsum(np.abs(pheromone_array), axis=1), axis=2, out=tables[:, 1:, 1:])
+        return tables
+
+
+class PheromoneField:
+    def __init__(self, colonies, extra_channels=(), previous=None):
+        """
+        One pheromone tensor of shape (Colonies, Channels, Height, Width) shared by all colonies of a simulation.
+        Channels 0 and 1 are the two depths of the colony pheromone grids, which become views into the tensor, so
+        deposits and sensing of the colonies keep working unchanged. All colonies evaporate in one operation and
+        can sense each other's trails. Extra channels evaporate with their own reduction factor.
+        ----------
+
+        Args:
+            colonies (list): The colonies. All pheromone grids need the same shape and a float storage type.
+            extra_channels (tuple): The reduction factor of every channel beyond the two depths. Defaults to ().
+            previous (PheromoneField): A field whose extra channels are taken over, and resampled to a new grid shape,
+                                       for the colonies that are still present, so the field can be rebuilt when
+                                       colonies or the grid shape change. Defaults to None.
+        ----------
+
+        Attributes:
+            values (numpy.ndarray): The tensor of all colonies and channels.
+            colonies (list): The colonies in the order of the first axis.
+            views (list): The pheromone array of every colony, to notice replaced pheromone grids.
+        ----------
+
+        Methods:
+        is_attached(colonies: list):
+                Checks if the field still holds the pheromone grids of the given colonies.
+
+        leave_pheromone(colony_index: int, channel: int, rows, cols, amounts):
+                Adds pheromone to an extra channel.
+
+        reduce_pheromones(zero_threshold: float):
+                Reduces all colonies and channels at once.
+
+        get_sensing_arrays(foreign_trail_avoidance: float):
+                Returns the pheromone arrays the colonies sense, weakened by the trails of the other colonies.
+        """
+        shapes = {colony.pheromone.storage.shape for colony in colonies}
+        if len(shapes) > 1:
+            raise ValueError("A shared pheromone field needs the same pheromone grid shape for all colonies.")
+        if any(colony.pheromone.quantized for colony in colonies):
+            raise ValueError("A shared pheromone field needs float pheromone storage.")
+
+        depths, n_row, n_col = shapes.pop() if shapes else (2, 0, 0)
+        dtype = np.result_type(*[colony.pheromone.dtype for colony in colonies]) if colonies else np.float64
+        self.extra_channels = tuple(extra_channels)
+        self.colonies = list(colonies)
+        self.values = np.zeros((len(colonies), depths + len(self.extra_channels), n_row, n_col), dtype=dtype)
+        self.views = []
+        for index, colony in enumerate(colonies):
+            pheromone = colony.pheromone
+            self.values[index, :depths] = pheromone.storage
+            if previous is not None and colony in previous.colonies and previous.values.shape[1] == self.values.shape[1]:
+                extra = previous.values[previous.colonies.index(colony), depths:]
+                if extra.shape[1:] != (n_row, n_col):
+                    # the grids were resampled, the extra channels are resampled the same way
+                    extra = np.einsum("ij,cjk,lk->cil", overlap_weights(extra.shape[1], n_row), extra,
+                                      overlap_weights(extra.shape[2], n_col))
+                self.values[index, depths:] = extra
+            pheromone.dtype = self.values.dtype
+            pheromone.storage = self.values[index, :depths]
+            if pheromone.multi_resolution:
+                pheromone.build_pyramid()
+            self.views.append(pheromone.storage)
+
+    def is_attached(self, colonies):
+        """
+        Checks if the field holds the pheromone grids of exactly the given colonies, in the same order.
+        """
+        return (len(colonies) == len(self.colonies)
+                and all(colony is own and colony.pheromone.storage is view
+                        for colony, own, view in zip(colonies, self.colonies, self.views)))
+
+    def leave_pheromone(self, colony_index, channel, rows, cols, amounts):
+        """
+        Adds pheromone to a channel of a colony at many cells at once. Repeated cells add up.
+        ----------
+
+        Args:
+            colony_index (int): The index of the colony.
+            channel (int): The channel, 0 and 1 are the depths of the colony grid.
+            rows, cols (numpy.ndarray): The cells.
+            amounts (float or numpy.ndarray): The amount per cell.
+        """
+        np.add.at(self.values[colony_index, channel], (rows, cols), amounts)
+
+    def reduce_pheromones(self, zero_threshold=0.01):
+        """
+        Reduces the pheromone of all colonies and channels in one operation, each depth with the reduction factor
+        of its colony and each extra channel with its own factor. Cells below the threshold are set to 0.
+        ----------
+
+        Args:
+            zero_threshold (float): The value at which the pheromone value is so low that it should be considered 0.
+        """
+        factors = np.empty(self.values.shape[:2])
+        depths = self.values.shape[1] - len(self.extra_channels)
+        factors[:, :depths] = [[colony.pheromone.reducing_factor] for colony in self.colonies]
+        factors[:, depths:] = self.extra_channels
+        self.values *= factors[:, :, None, None].astype(self.values.dtype)
+        self.values[np.abs(self.values) < zero_threshold] = 0
+        for colony in self.colonies:
+            colony.pheromone.reduce_pyramid(zero_threshold)
+
+    def get_sensing_arrays(self, foreign_trail_avoidance):
+        """
+        Returns the pheromone arrays the colonies sense. The absolute pheromone strength of all other colonies,
+        multiplied by foreign_trail_avoidance, is subtracted from the strength of the own trails, so trails that are
+        shared with other colonies attract less and trails of other colonies alone do not attract at all.
+        ----------
+
+        Args:
+            foreign_trail_avoidance (float): The weight of the foreign trails.
+        ----------
+
+        Returns:
+            numpy.ndarray: Array of shape (Colonies, 2, Height, Width) with the signs of the pheromone arrays.
+        """
+        strength = np.abs(self.values[:, :2]).sum(axis=1)
+        foreign = (strength.sum(axis=0) - strength) * foreign_trail_avoidance
+        sensing = np.empty((len(self.colonies), 2) + self.values.shape[2:], dtype=self.values.dtype)
+        np.minimum(self.values[:, 0] + foreign, 0, out=sensing[:, 0])
+        np.maximum(self.values[:, 1] - foreign, 0, out=sensing[:, 1])
+        return sensing
+
+
+def overlap_weights(old_size, new_size):
+    """
+    Returns the weights of an area-weighted resampling along one axis: entry [i, j] is the fraction of the new
+    cell i that is covered by the old cell j. Both grids cover the same extent.
+    ------------
+
+    Args:
+        old_size (int): The number of old cells.
+        new_size (int): The number of new cells.
+    ------------
+
+    Returns:
+        numpy.ndarray: Array of shape (new_size, old_size), every row sums to 1.
+    """
+    # cell borders in units of one old cell
+    old_edges = np.arange(old_size + 1, dtype=float)
+    new_edges = np.linspace(0, old_size, new_size + 1)
+    overlap = (np.minimum(new_edges[1:, None], old_edges[None, 1:])
+               - np.maximum(new_edges[:-1, None], old_edges[None, :-1]))
+    return np.clip(overlap, 0, None) / (old_size / new_size)
+
+
+def max_pool(level):
+    """
+    Halves the resolution of a 2D array by taking the maximum of every 2x2 block.
+    Odd sizes are padded with zeros.
+    ------------
+
+    Args:
+        level (numpy.ndarray): The array to pool.
+    ------------
+
+    Returns:
+        numpy.ndarray: The pooled array of shape (ceil(rows / 2), ceil(cols / 2)).
+    """
+    n_row, n_col = level.shape
+    padded = np.zeros((n_row + n_row % 2, n_col + n_col % 2), dtype=level.dtype)
+    padded[:n_row, :n_col] = level
+    return padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2).max(axis=(1, 3))
@@ -0,0 +1,152 @@
+import numpy as np
+
+
+class AntPool:
+    """
+    Preallocated slots for the ants of a colony.
+    Dead ants keep their slot object, so a birth reuses a free slot and its ant instead of creating new objects.
+    The per-ant arrays only grow, geometrically, when all slots are in use.
+    ----------
+
+    Args:
+    capacity (int):
+        The number of slots to preallocate. Defaults to 0.
+    ----------
+
+    Attributes:
+    slots (list):
+        The ant stored in every slot, None if the slot has never been used.
+    alive (numpy array):
+        Boolean mask of the slots that hold a living ant.
+    age (numpy array):
+        The number of epochs every ant has lived.
+    free (list):
+        Stack of the free slots. Released slots are reused first.
+    ----------
+
+    Methods:
+    acquire():
+        Takes a free slot and marks it alive.
+    release():
+        Marks a slot as free.
+    grow():
+        Enlarges the pool.
+    get_ants():
+        Returns the living ants.
+    age_ants():
+        Increases the age of all living ants.
+    clear():
+        Frees all slots.
+    """
+    min_growth = 8
+
+    def __init__(self, capacity=0):
+        self.slots = [None] * capacity
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.age = np.zeros(capacity, dtype=np.int64)
+        self.free = list(range(capacity - 1, -1, -1))
+        self.slot_of = {}
+        self.ants = None
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    @property
+    def capacity(self):
+        return len(self.slots)
+
+    def grow(self, min_capacity):
+        """
+        Enlarges the pool to at least min_capacity slots, at least doubling its size.
+        ----------
+
+        Args:
+        min_capacity (int):
+            The number of slots that are needed.
+        """
+        old_capacity = self.capacity
+        if min_capacity <= old_capacity:
+            return
+        new_capacity = max(min_capacity, 2 * old_capacity, self.min_growth)
+
+        self.slots.extend([None] * (new_capacity - old_capacity))
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:old_capacity] = self.alive
+        age = np.zeros(new_capacity, dtype=np.int64)
+        age[:old_capacity] = self.age
+        self.alive, self.age = alive, age
+        self.free = list(range(new_capacity - 1, old_capacity - 1, -1)) + self.free
+
+    def acquire(self):
+        """
+        Takes a free slot and marks it alive, the pool grows if there is none.
+        ----------
+
+        Returns:
+        int:
+            The slot. pool.slots[slot] is the ant that lived there before or None.
+        """
+        if not self.free:
+            self.grow(self.capacity + 1)
+        slot = self.free.pop()
+        self.alive[slot] = True
+        self.age[slot] = 0
+        self.ants = None
+        return slot
+
+    def assign(self, slot, ant):
+        """
+        Stores an ant in an acquired slot.
+        """
+        previous = self.slots[slot]
+        if previous is not None:
+            self.slot_of.pop(id(previous), None)
+        self.slots[slot] = ant
+        self.slot_of[id(ant)] = slot
+        self.ants = None
+
+    def release(self, slot):
+        """
+        Marks a slot as free. The ant stays in the slot to be reused by the next birth.
+        ----------
+
+        Args:
+        slot (int):
+            The slot of the dead ant.
+        """
+        if not self.alive[slot]:
+            return
+        self.alive[slot] = False
+        self.slot_of.pop(id(self.slots[slot]), None)
+        self.free.append(slot)
+        self.ants = None
+
+    def get_slot(self, ant):
+        """
+        Returns the slot of a living ant, or None.
+        """
+        return self.slot_of.get(id(ant))
+
+    def get_ants(self):
+        """
+        Returns the living ants in slot order. The tuple is cached until the next birth or death, ants are added and
+        removed through acquire(), assign() and release().
+        """
+        if self.ants is None:
+            self.ants = tuple(self.slots[slot] for slot in np.flatnonzero(self.alive))
+        return self.ants
+
+    def age_ants(self):
+        """
+        Increases the age of all living ants by one epoch.
+        """
+        self.age[self.alive] += 1
+
+    def clear(self):
+        """
+        Frees all slots. The ants stay in their slots to be reused.
+        """
+        self.alive[:] = False
+        self.free = list(range(self.capacity - 1, -1, -1))
+        self.slot_of.clear()
+        self.ants = None
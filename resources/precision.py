@@ -0,0 +1,127 @@
+import numpy as np
+
+
+class PrecisionPolicy:
+    """
+    The numeric types a simulation uses for its bulk data.
+    ----------
+
+    Args:
+    name (str):
+        The name of the policy.
+    position_dtype (numpy dtype):
+        Type of the ant positions and directions in the batched arrays of an epoch and in checkpoints.
+    pheromone_dtype (numpy dtype):
+        Storage type of the pheromone grids. Integer types store the quantized strength.
+    pheromone_scale (float):
+        The strength of one quantization step for integer pheromone storage.
+    status_dtype (numpy dtype):
+        Type of the pheromone status flags in batched arrays and checkpoints.
+    ----------
+
+    Methods:
+    apply_to_colony():
+        Converts the pheromone grid of a colony to the policy.
+    """
+    def __init__(self, name, position_dtype=np.float64, pheromone_dtype=np.float64, pheromone_scale=1/256, status_dtype=np.int8):
+        self.name = name
+        self.position_dtype = np.dtype(position_dtype)
+        self.pheromone_dtype = np.dtype(pheromone_dtype)
+        self.pheromone_scale = pheromone_scale
+        self.status_dtype = np.dtype(status_dtype)
+
+    def apply_to_colony(self, colony):
+        """
+        Converts the pheromone grid of a colony to the storage type of the policy, if it differs.
+        ----------
+
+        Args:
+        colony (Colony):
+            The colony to convert.
+        """
+        pheromone = colony.pheromone
+        if pheromone.dtype != self.pheromone_dtype or (pheromone.quantized and pheromone.scale != self.pheromone_scale):
+            pheromone.set_dtype(self.pheromone_dtype, self.pheromone_scale)
+
+
+# "double" is the reference, "single" halves and "compact" quarters the size of the pheromone grids
+PRECISION_POLICIES = {
+    "double": PrecisionPolicy("double"),
+    "single": PrecisionPolicy("single", np.float32, np.float32),
+    "compact": PrecisionPolicy("compact", np.float32, np.uint16),
+}
+
+
+def get_precision_policy(policy):
+    """
+    Returns a precision policy by its name.
+    ----------
+
+    Args:
+    policy (str or PrecisionPolicy):
+        "double", "single", "compact" or a policy, which is returned as it is.
+    ----------
+
+    Returns:
+    PrecisionPolicy:
+        The policy.
+    """
+    if isinstance(policy, PrecisionPolicy):
+        return policy
+    if policy not in PRECISION_POLICIES:
+        raise ValueError(f"Unknown precision {policy!r}, expected one of {', '.join(PRECISION_POLICIES)}.")
+    return PRECISION_POLICIES[policy]
+
+
+def measure_drift(build_simulation, precision, epochs=100, seed=0):
+    """
+    Validation mode: runs the same scenario with the float64 reference and with another precision and measures
+    how far the reduced precision drifts from the reference. Both runs use the same random seed, so they only
+    differ by rounding until a rounding difference changes a decision of an ant.
+    ----------
+
+    Args:
+    build_simulation (callable):
+        Function without arguments that returns a new, filled simulation.
+    precision (str or PrecisionPolicy):
+        The precision to compare with the reference.
+    epochs (int):
+        The number of epochs to run. Defaults to 100.
+    seed (int):
+        The random seed of both runs. Defaults to 0.
+    ----------
+
+    Returns:
+    list:
+        One dictionary per epoch with the maximum and mean distance of the ant positions, the maximum absolute
+        and the relative L1 error of the pheromone grids and the difference of the collected food.
+    """
+    def run(policy):
+        np.random.seed(seed)
+        simulation = build_simulation()
+        simulation.set_precision(policy)
+        states = []
+        for _ in range(epochs):
+            simulation.next_epoch()
+            states.append((
+                [colony.get_ant_positions() for colony in simulation.colonies],
+                [np.array(colony.pheromone.pheromone_array, dtype=np.float64) for colony in simulation.colonies],
+                sum(colony.food_counter for colony in simulation.colonies),
+            ))
+        return states
+
+    reference, candidate = run("double"), run(precision)
+    drift = []
+    for epoch, ((ref_positions, ref_pheromones, ref_food), (positions, pheromones, food)) in enumerate(zip(reference, candidate), 1):
+        distances = np.concatenate([np.linalg.norm(a - b, axis=1) for a, b in zip(ref_positions, positions) if len(a) == len(b)] or [np.zeros(0)])
+        errors = np.concatenate([np.abs(a - b).ravel() for a, b in zip(ref_pheromones, pheromones)] or [np.zeros(0)])
+        total = sum(np.abs(a).sum() for a in ref_pheromones)
+        drift.append({
+            "epoch": epoch,
+            "max position error": float(distances.max(initial=0)),
+            "mean position error": float(distances.mean()) if len(distances) else 0.0,
+            "max pheromone error": float(errors.max(initial=0)),
+            "relative pheromone error": float(errors.sum() / total) if total > 0 else 0.0,
+            "food difference": float(food - ref_food),
+        })
+    return drift
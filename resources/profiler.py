@@ -0,0 +1,172 @@
+import json
+import time
+from collections import deque
+import numpy as np
+
+
+class NullPhase:
+    """
+    Context manager that does nothing, returned by a disabled profiler so the timed code only pays for one call.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_PHASE = NullPhase()
+
+
+class Phase:
+    """
+    Context manager that times one run of a phase with perf_counter_ns.
+    """
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        stack = self.profiler.stack
+        self.name = f"{stack[-1]}/{self.name}" if stack else self.name
+        stack.append(self.name)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter_ns() - self.start
+        profiler = self.profiler
+        profiler.stack.pop()
+        profiler.current[self.name] = profiler.current.get(self.name, 0) + elapsed
+        return False
+
+
+class PhaseProfiler:
+    """
+    Measures how long the phases of every epoch take. Phases are timed with perf_counter_ns and can be nested,
+    a phase started inside another one is named "outer/inner". The time of a phase is summed up over an epoch,
+    so phases that run once per colony count once per epoch, and end_epoch() adds the sums to the histograms.
+    Phases outside of an epoch, like rendering, are counted towards the next epoch.
+    When the profiler is disabled, phase() returns a shared context manager that does nothing.
+    ----------
+
+    Args:
+    enabled (bool):
+        Whether phases are measured. Defaults to False.
+    max_samples (int):
+        Number of recent epochs kept per phase for the percentiles. Defaults to 10000.
+    ----------
+
+    Attributes:
+    samples (dict):
+        The recent durations per epoch in nanoseconds of every phase.
+    maxima (dict):
+        The longest duration of every phase since the last reset.
+    ----------
+
+    Methods:
+    phase():
+        Returns a context manager that times a phase.
+    end_epoch():
+        Adds the durations of the current epoch to the histograms.
+    get_summary():
+        Returns count, mean, p50, p95 and max of every phase.
+    to_json():
+        Returns the summary as JSON and optionally writes it to a file.
+    reset():
+        Removes all measurements.
+    """
+    def __init__(self, enabled=False, max_samples=10000):
+        self.enabled = enabled
+        self.max_samples = max_samples
+        self.stack = []
+        self.current = {}
+        self.samples = {}
+        self.maxima = {}
+
+    def phase(self, name):
+        """
+        Returns a context manager that times a phase.
+        ----------
+
+        Args:
+        name (str):
+            The name of the phase, e.g. "sensing".
+        ----------
+
+        Returns:
+        Phase:
+            The context manager, or a shared one that does nothing if the profiler is disabled.
+        """
+        if not self.enabled:
+            return NULL_PHASE
+        return Phase(self, name)
+
+    def end_epoch(self):
+        """
+        Adds the summed durations of the phases of the current epoch to the histograms.
+        """
+        if not self.current:
+            return
+        for name, elapsed in self.current.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.max_samples)
+            samples.append(elapsed)
+            if elapsed > self.maxima.get(name, 0):
+                self.maxima[name] = elapsed
+        self.current = {}
+
+    def get_summary(self):
+        """
+        Returns the statistics of every phase in milliseconds per epoch.
+        ----------
+
+        Returns:
+        dict:
+            For every phase the number of measured epochs and the mean, median (p50), 95th percentile (p95)
+            and maximum duration in milliseconds.
+        """
+        summary = {}
+        for name, samples in self.samples.items():
+            values = np.fromiter(samples, dtype=np.int64, count=len(samples)) / 1e6
+            p50, p95 = np.percentile(values, (50, 95))
+            summary[name] = {
+                "count": len(values),
+                "mean_ms": float(values.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "max_ms": self.maxima[name] / 1e6,
+            }
+        return summary
+
+    def to_json(self, path=None):
+        """
+        Returns the summary as JSON.
+        ----------
+
+        Args:
+        path (str, optional):
+            If given, the JSON is also written to this file. Defaults to None.
+        ----------
+
+        Returns:
+        str:
+            The summary as JSON.
+        """
+        text = json.dumps(self.get_summary(), indent=4)
+        if path is not None:
+            with open(path, "w") as json_file:
+                json_file.write(text)
+        return text
+
+    def reset(self):
+        """
+        Removes all measurements.
+        """
+        self.stack = []
+        self.current = {}
+        self.samples = {}
+        self.maxima = {}
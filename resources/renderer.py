@@ -0,0 +1,348 @@
+import json
+import os
+import struct
+import zlib
+import numpy as np
+
+
+class FrameRenderer:
+    """
+    Renders the state of a simulation into RGB frames using only NumPy.
+    This makes it possible to get visual output from machines without a display.
+    The frames show the same elements as the GUI: bounds, obstacles, pheromones, food with life bars, colonies and ants.
+    ----------
+
+    Args:
+    bounds (tuple):
+        The bounds (min_x, max_x, min_y, max_y) of the simulation area.
+    scale (float):
+        Number of pixels per unit of the simulation coordinates. Defaults to 1.
+    show_pheromone (bool):
+        Whether the pheromones of colonies with show_pheromone set are drawn. Defaults to True.
+    ----------
+
+    Attributes:
+    width (int), height (int):
+        The size of the rendered frames in pixels.
+    ----------
+
+    Methods:
+    render():
+        Renders the current state of a simulation into an RGB frame.
+    world_to_pixel():
+        Maps simulation coordinates to pixel rows and columns.
+    """
+    background_color = (163, 110, 64)
+    bounds_color = (0, 0, 0)
+    obstacle_color = (90, 90, 90)
+    food_color = (200, 30, 30)
+    colony_color = (80, 50, 20)
+    life_bar_colors = ((128, 128, 128), (0, 255, 51))
+    pheromone_colors = ((0, 0, 179), (179, 0, 0))
+    carrying_color = (255, 0, 0)
+
+    def __init__(self, bounds, scale=1, show_pheromone=True):
+        self.bounds = tuple(bounds)
+        self.scale = scale
+        self.show_pheromone = show_pheromone
+
+        min_x, max_x, min_y, max_y = self.bounds
+        self.width = max(1, int(round((max_x - min_x) * scale)))
+        self.height = max(1, int(round((max_y - min_y) * scale)))
+
+    def world_to_pixel(self, x, y):
+        """
+        Maps simulation coordinates to pixel rows and columns. The first row of a frame is the top of the area.
+        ----------
+
+        Args:
+        x, y (float or numpy array):
+            The simulation coordinates.
+        ----------
+
+        Returns:
+        tuple:
+            The row and column indices (not clipped to the frame).
+        """
+        min_x, _, _, max_y = self.bounds
+        col = np.floor((np.asarray(x) - min_x) * self.scale).astype(int)
+        row = np.floor((max_y - np.asarray(y)) * self.scale).astype(int)
+        return row, col
+
+    def render(self, simulation):
+        """
+        Renders the current state of a simulation into an RGB frame.
+        ----------
+
+        Args:
+        simulation (Simulation):
+            The simulation to render.
+        ----------
+
+        Returns:
+        numpy array:
+            An array of shape (height, width, 3) and dtype uint8.
+        """
+        frame = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        frame[:] = self.background_color
+
+        for obstacle in simulation.obstacles:
+            if obstacle.is_polygon():
+                self.fill_polygon(frame, obstacle, self.obstacle_color)
+            else:
+                self.fill_rectangle(frame, obstacle.coordinates, obstacle.size, self.obstacle_color)
+
+        if self.show_pheromone:
+            for colony in simulation.colonies:
+                if colony.show_pheromone:
+                    self.draw_pheromone(frame, colony.pheromone.pheromone_array)
+
+        for food in simulation.food:
+            if food.amount_of_food > 0:
+                self.fill_disc(frame, food.coordinates, (100, 100), self.food_color)
+
+        for colony in simulation.colonies:
+            self.fill_disc(frame, colony.coordinates, (100, 100), self.colony_color)
+
+        for colony in simulation.colonies:
+            self.draw_ants(frame, colony)
+
+        for food in simulation.food:
+            if food.show_life_bar and food.amount_of_food > 0:
+                x, y = food.coordinates
+                self.fill_rectangle(frame, (x + 13, y + 78), (74, 14), self.life_bar_colors[0])
+                self.fill_rectangle(frame, (x + 15, y + 80), (70 * food.amount_of_food / food.start_amount, 10),
+                                    self.life_bar_colors[1])
+
+        frame[[0, -1], :] = self.bounds_color
+        frame[:, [0, -1]] = self.bounds_color
+        return frame
+
+    def fill_rectangle(self, frame, coordinates, size, color):
+        """
+        Fills an axis-aligned rectangle given by its lower left corner and size.
+        """
+        x, y = coordinates
+        top, left = self.world_to_pixel(x, y + size[1])
+        bottom, right = self.world_to_pixel(x + size[0], y)
+        frame[max(top, 0):max(bottom, 0), max(left, 0):max(right, 0)] = color
+
+    def fill_polygon(self, frame, obstacle, color):
+        """
+        Fills a polygon obstacle by testing the centers of the pixels within its bounding box.
+        """
+        x, y = obstacle.coordinates
+        top, left = self.world_to_pixel(x, y + obstacle.size[1])
+        bottom, right = self.world_to_pixel(x + obstacle.size[0], y)
+        top, left = max(top, 0), max(left, 0)
+        bottom, right = min(bottom + 1, self.height), min(right + 1, self.width)
+        if top >= bottom or left >= right:
+            return
+
+        min_x, _, _, max_y = self.bounds
+        rows, cols = np.mgrid[top:bottom, left:right]
+        mask = obstacle.contains(min_x + (cols + 0.5) / self.scale, max_y - (rows + 0.5) / self.scale)
+        frame[top:bottom, left:right][mask] = color
+
+    def fill_disc(self, frame, coordinates, size, color, radius_factor=0.35):
+        """
+        Fills a disc in the center of the square given by its lower left corner and size.
+        """
+        center_row, center_col = self.world_to_pixel(coordinates[0] + size[0] / 2, coordinates[1] + size[1] / 2)
+        radius = radius_factor * min(size) * self.scale
+
+        top, bottom = max(int(center_row - radius), 0), min(int(center_row + radius) + 1, self.height)
+        left, right = max(int(center_col - radius), 0), min(int(center_col + radius) + 1, self.width)
+        if top >= bottom or left >= right:
+            return
+
+        rows, cols = np.ogrid[top:bottom, left:right]
+        mask = (rows - center_row) ** 2 + (cols - center_col) ** 2 <= radius ** 2
+        frame[top:bottom, left:right][mask] = color
+
+    def draw_pheromone(self, frame, pheromone_array):
+        """
+        Blends both depths of a pheromone tensor over the frame, blue for the trails from the colony and
+        red for the trails from the food.
+        """
+        n_row, n_col = pheromone_array[0].shape
+        min_x, max_x, min_y, max_y = self.bounds
+
+        rows, cols = np.arange(self.height), np.arange(self.width)
+        cell_rows = np.clip((rows / self.scale * n_row / (max_y - min_y)).astype(int), 0, n_row - 1)
+        cell_cols = np.clip((cols / self.scale * n_col / (max_x - min_x)).astype(int), 0, n_col - 1)
+
+        for depth, color in enumerate(self.pheromone_colors):
+            strength = np.abs(pheromone_array[depth])
+            alpha = strength / (strength.max() * 1.7 + 1)
+            alpha = alpha[cell_rows[:, None], cell_cols[None, :], None]
+            frame[:] = (frame * (1 - alpha) + np.array(color) * alpha).astype(np.uint8)
+
+    def draw_ants(self, frame, colony, ant_size=5):
+        """
+        Draws all ants of a colony as small squares, ants that carry food get a red center.
+        """
+        if not colony.ants:
+            return
+        positions = colony.get_ant_positions()
+        carrying = np.array([ant.pheromone_status == 1 for ant in colony.ants])
+        rows, cols = self.world_to_pixel(positions[:, 0], positions[:, 1] + ant_size)
+
+        size = max(1, int(round(ant_size * self.scale)))
+        self.stamp(frame, rows, cols, size, get_rgb(colony.color))
+        inner = max(1, size // 3)
+        self.stamp(frame, rows[carrying] + inner, cols[carrying] + inner, inner, self.carrying_color)
+
+    def stamp(self, frame, rows, cols, size, color):
+        """
+        Fills a square of size x size pixels at every (row, col), looping over the pixels of the square instead of the ants.
+        """
+        for d_row in range(size):
+            for d_col in range(size):
+                r, c = rows + d_row, cols + d_col
+                inside = (r >= 0) & (r < self.height) & (c >= 0) & (c < self.width)
+                frame[r[inside], c[inside]] = color
+
+
+def get_rgb(color):
+    """
+    Converts a kivy color (r, g, b[, a]) with values between 0 and 1 into an RGB tuple with values up to 255.
+    Colors that cannot be interpreted are drawn black.
+    """
+    try:
+        return tuple(int(round(255 * min(max(float(value), 0), 1))) for value in color[:3])
+    except (TypeError, ValueError):
+        return (0, 0, 0)
+
+
+def interpolate_positions(previous, current, alpha):
+    """
+    Interpolates linearly between two snapshots of ant positions, so ants can be drawn smoothly between two epochs.
+    ----------
+
+    Args:
+    previous (numpy array or None):
+        The positions at the second to last epoch, shape (number of ants, 2).
+    current (numpy array):
+        The positions at the last epoch, shape (number of ants, 2).
+    alpha (float):
+        The fraction of the epoch interval that has passed since the last epoch, clipped to [0, 1].
+    ----------
+
+    Returns:
+    numpy array:
+        The interpolated positions. If there is no matching previous snapshot, e.g. because ants
+        were added or removed in between, the current positions are returned.
+    """
+    if previous is None or previous.shape != current.shape:
+        return current
+    alpha = min(max(alpha, 0.0), 1.0)
+    return previous + (current - previous) * alpha
+
+
+def write_png(path, frame):
+    """
+    Writes an RGB frame as PNG file without any image library.
+    ----------
+
+    Args:
+    path (str):
+        The path of the PNG file.
+    frame (numpy array):
+        An array of shape (height, width, 3) and dtype uint8.
+    """
+    height, width, _ = frame.shape
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = frame.reshape(height, width * 3)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    with open(path, "wb") as png_file:
+        png_file.write(b"\x89PNG\r\n\x1a\n")
+        png_file.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        png_file.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+        png_file.write(chunk(b"IEND", b""))
+
+
+class FrameWriter:
+    """
+    Renders a simulation every N epochs and writes the frames either as a PNG sequence or as one raw RGB stream.
+    The raw stream can be converted into a video, e.g. with
+    `ffmpeg -f rawvideo -pix_fmt rgb24 -s <width>x<height> -i frames.rgb video.mp4`.
+    ----------
+
+    Args:
+    directory (str):
+        The directory the frames are written to. It is created if it does not exist.
+    renderer (FrameRenderer):
+        The renderer used for the frames.
+    every (int):
+        A frame is written at every epoch that is a multiple of this number. Defaults to 1.
+    format (str):
+        "png" for single PNG files or "raw" for one stream of raw RGB frames. Defaults to "png".
+    ----------
+
+    Methods:
+    capture():
+        Writes a frame if the current epoch of the simulation is due.
+    close():
+        Closes the raw stream and writes its metadata.
+    """
+    def __init__(self, directory, renderer, every=1, format="png"):
+        if format not in ("png", "raw"):
+            raise ValueError(f"Unknown frame format: {format}")
+        self.directory = directory
+        self.renderer = renderer
+        self.every = every
+        self.format = format
+        self.frame_count = 0
+        self.stream = None
+        os.makedirs(directory, exist_ok=True)
+
+    def capture(self, simulation):
+        """
+        Writes a frame if the current epoch of the simulation is a multiple of `every`.
+        ----------
+
+        Args:
+        simulation (Simulation):
+            The simulation to render.
+        ----------
+
+        Returns:
+        bool:
+            True if a frame was written.
+        """
+        if simulation.epoch % self.every != 0:
+            return False
+
+        with simulation.profiler.phase("rendering"):
+            frame = self.renderer.render(simulation)
+        with simulation.profiler.phase("io"):
+            if self.format == "png":
+                write_png(os.path.join(self.directory, f"frame_{simulation.epoch:06d}.png"), frame)
+            else:
+                if self.stream is None:
+                    self.stream = open(os.path.join(self.directory, "frames.rgb"), "wb")
+                self.stream.write(frame.tobytes())
+        self.frame_count += 1
+        return True
+
+    def close(self):
+        """
+        Closes the raw stream and writes the metadata needed to read it back.
+        """
+        if self.stream is None:
+            return
+        self.stream.close()
+        self.stream = None
+        metadata = {
+            "width": self.renderer.width,
+            "height": self.renderer.height,
+            "pixel format": "rgb24",
+            "frames": self.frame_count,
+            "every": self.every,
+        }
+        with open(os.path.join(self.directory, "frames.json"), "w") as json_file:
+            json.dump(metadata, json_file, indent=4)
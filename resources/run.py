@@ -0,0 +1,170 @@
+"""
+Headless runner for machines without a display. It loads a scenario file, runs it for a number of epochs and writes
+metrics, checkpoints and optionally frames. It does not import the GUI, Kivy or pandas.
+
+Run from the project directory:
+
+    python -m resources.run scenario.json --epochs 1000 --seed 1 --out runs/first
+    python -m resources.run scenario.json --epochs 1000 --out runs/frames --frames-every 10 --frame-format raw
+    python -m resources.run --resume runs/first/checkpoint_001000.npz --epochs 500 --out runs/second
+
+The output directory contains:
+
+    metrics.jsonl             one line of metrics every --metrics-every epochs
+    checkpoint_<epoch>.npz    every --checkpoint-every epochs and after the last epoch
+    frames/                   with --frames-every, see renderer.FrameWriter
+    profile.json              with --profile, see profiler.PhaseProfiler
+    summary.json              the run settings, the duration and the final state
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import numpy as np
+from resources.checkpoint import load_checkpoint, save_checkpoint
+from resources.memory import get_memory_report
+from resources.renderer import FrameRenderer, FrameWriter
+from resources.scenario import load_scenario
+from resources.simulation import Simulation
+
+
+def get_metrics(simulation, seconds):
+    """
+    Describes the state of a simulation after an epoch.
+    ----------
+
+    Args:
+    simulation (Simulation):
+        The simulation.
+    seconds (float):
+        The time the last epoch took.
+    ----------
+
+    Returns:
+    dict:
+        The epoch, its duration and the ants, collected food and pheromone cells of every colony and the food left.
+    """
+    return {"epoch": simulation.epoch,
+            "ms": seconds * 1000,
+            "colonies": [{"ants": len(colony.ants),
+                          "carrying": sum(ant.pheromone_status == 1 for ant in colony.ants),
+                          "food counter": float(colony.food_counter),
+                          "pheromone cells": colony.pheromone.count_active_cells()} for colony in simulation.colonies],
+            "food left": float(sum(food.amount_of_food for food in simulation.food))}
+
+
+def run(simulation, epochs, out, metrics_every=1, checkpoint_every=0, frame_writer=None):
+    """
+    Runs a simulation and writes its metrics, checkpoints and frames.
+    ----------
+
+    Args:
+    simulation (Simulation):
+        The filled simulation.
+    epochs (int):
+        The number of epochs to run.
+    out (str):
+        The output directory, it has to exist.
+    metrics_every (int):
+        Metrics are written every this many epochs. Defaults to 1.
+    checkpoint_every (int):
+        A checkpoint is written every this many epochs, 0 only writes one after the last epoch. Defaults to 0.
+    frame_writer (FrameWriter, optional):
+        Writes the frames. Defaults to None, no frames.
+    ----------
+
+    Returns:
+    float:
+        The seconds spent in the epochs.
+    """
+    total = 0.0
+    with open(os.path.join(out, "metrics.jsonl"), "a") as metrics_file:
+        for _ in range(epochs):
+            start = time.perf_counter()
+            simulation.next_epoch()
+            seconds = time.perf_counter() - start
+            total += seconds
+
+            if metrics_every > 0 and simulation.epoch % metrics_every == 0:
+                metrics_file.write(json.dumps(get_metrics(simulation, seconds)) + "\n")
+            if checkpoint_every > 0 and simulation.epoch % checkpoint_every == 0:
+                save_checkpoint(simulation, os.path.join(out, f"checkpoint_{simulation.epoch:06d}.npz"))
+            if frame_writer is not None:
+                frame_writer.capture(simulation)
+
+    if checkpoint_every <= 0 or simulation.epoch % checkpoint_every != 0:
+        save_checkpoint(simulation, os.path.join(out, f"checkpoint_{simulation.epoch:06d}.npz"))
+    if frame_writer is not None:
+        frame_writer.close()
+    return total
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Run a scenario without a display and write metrics, checkpoints and frames.")
+    parser.add_argument("scenario", nargs="?", help="scenario JSON file in the format of statistics.json")
+    parser.add_argument("--resume", help="continue from a checkpoint instead of loading a scenario")
+    parser.add_argument("--epochs", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random generators, ignored with --resume")
+    parser.add_argument("--out", required=True, help="output directory, created if it does not exist")
+    parser.add_argument("--precision", choices=["double", "single", "compact"], help="defaults to double, or the precision of the checkpoint")
+    parser.add_argument("--sensing-model", choices=["max", "gradient", "heading"], help="defaults to max, or the sensing model of the checkpoint")
+    parser.add_argument("--memory-budget", type=int, help="memory budget in bytes, coarser pheromone grids are used to fit it")
+    parser.add_argument("--metrics-every", type=int, default=1)
+    parser.add_argument("--checkpoint-every", type=int, default=0)
+    parser.add_argument("--frames-every", type=int, default=0, help="write a frame every this many epochs, 0 writes no frames")
+    parser.add_argument("--frame-format", choices=["png", "raw"], default="png")
+    parser.add_argument("--frame-scale", type=float, default=1)
+    parser.add_argument("--profile", action="store_true", help="write the phase profile to profile.json")
+    args = parser.parse_args(argv)
+    if (args.scenario is None) == (args.resume is None):
+        parser.error("give either a scenario or --resume")
+    return args
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    os.makedirs(args.out, exist_ok=True)
+
+    if args.resume:
+        simulation = load_checkpoint(args.resume)
+        if args.precision:
+            simulation.set_precision(args.precision)
+    else:
+        np.random.seed(args.seed)
+        random.seed(args.seed)
+        # the precision is set first, so the memory budget is fitted with the size of its pheromone grids
+        simulation = Simulation()
+        simulation.set_precision(args.precision or "double")
+        simulation = load_scenario(args.scenario, simulation=simulation, memory_budget=args.memory_budget)
+    if args.sensing_model:
+        simulation.sensing_model = args.sensing_model
+    simulation.profiler.enabled = args.profile
+
+    frame_writer = None
+    if args.frames_every > 0:
+        renderer = FrameRenderer(simulation.bounds, scale=args.frame_scale)
+        frame_writer = FrameWriter(os.path.join(args.out, "frames"), renderer, every=args.frames_every, format=args.frame_format)
+
+    start_epoch = simulation.epoch
+    seconds = run(simulation, args.epochs, args.out, args.metrics_every, args.checkpoint_every, frame_writer)
+
+    if args.profile:
+        simulation.profiler.to_json(os.path.join(args.out, "profile.json"))
+    summary = {"arguments": vars(args),
+               "start epoch": start_epoch,
+               "epochs": simulation.epoch - start_epoch,
+               "seconds": seconds,
+               "ms per epoch": 1000 * seconds / max(1, simulation.epoch - start_epoch),
+               "precision": simulation.precision.name,
+               "memory bytes": get_memory_report(simulation)["total"],
+               "final": get_metrics(simulation, 0)}
+    with open(os.path.join(args.out, "summary.json"), "w") as json_file:
+        json.dump(summary, json_file, indent=4)
+    print(f"{summary['epochs']} epochs in {seconds:.2f} s ({summary['ms per epoch']:.2f} ms per epoch), output in {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Scenario files describe a simulation setup in the format of statistics/statistics.json, so saved statistics can be
+loaded as scenarios. Obstacles may additionally be polygons:
+
+    {"vertices": [[x1, y1], [x2, y2], [x3, y3], ...]}
+    {"coordinates": [x, y], "size": [width, height], "rotation": 30}
+"""
+import json
+from resources.colony import Colony
+from resources.memory import fit_to_memory_budget
+from resources.food import Food
+from resources.obstacle import Obstacle
+from resources.simulation import Simulation
+
+
+def create_colony(colony_data):
+    """
+    Creates a colony from its scenario entry.
+    ----------
+
+    Args:
+    colony_data (dict):
+        The entry with the keys of statistics.json. Missing ant settings use the defaults of Colony.add_ants().
+    ----------
+
+    Returns:
+    Colony:
+        The colony with its ants.
+    """
+    colony = Colony(grid_pheromone_shape=colony_data.get("pheromone grid", (100, 100)),
+                    amount=colony_data.get("amount", 100),
+                    size=colony_data.get("size", (100, 100)),
+                    coordinates=tuple(colony_data["coordinates"]),
+                    color=tuple(colony_data.get("color", (1, 0, 0, 1))))
+    settings = {"amount_to_carry": colony_data.get("amount to carry"),
+                "step_size": colony_data.get("step size"),
+                "search_radius": colony_data.get("search radius"),
+                "pheromone_influence": colony_data.get("pheromone influence")}
+    settings = {name: value for name, value in settings.items() if value is not None}
+    if settings:
+        colony.ants = []
+        colony.add_ants(**settings)
+    if "pheromone reduction" in colony_data:
+        colony.pheromone.reducing_factor = colony_data["pheromone reduction"]
+    return colony
+
+
+def create_food(food_data):
+    """
+    Creates a food source from its scenario entry.
+    ----------
+
+    Args:
+    food_data (dict):
+        The entry with the keys of statistics.json and optionally "size", "move randomly" and "move after".
+    ----------
+
+    Returns:
+    Food:
+        The food source.
+    """
+    return Food(size=tuple(food_data.get("size", (100, 100))),
+                coordinates=tuple(food_data["coordinates"]),
+                amount_of_food=food_data.get("start amount", food_data.get("amount of food", 1000)),
+                move_after_number_of_epochs=food_data.get("move after", 500),
+                move_randomly=food_data.get("move randomly", False))
+
+
+def create_obstacle(obstacle_data):
+    """
+    Creates an obstacle from its scenario entry, either a box with an optional rotation or a polygon.
+    ----------
+
+    Args:
+    obstacle_data (dict):
+        The entry with "coordinates" and "size" and optionally "rotation", or with "vertices".
+    ----------
+
+    Returns:
+    Obstacle:
+        The obstacle.
+    """
+    if "vertices" in obstacle_data:
+        return Obstacle(coordinates=None, vertices=obstacle_data["vertices"])
+    return Obstacle(coordinates=tuple(obstacle_data["coordinates"]),
+                    size=tuple(obstacle_data.get("size", (50, 50))),
+                    rotation=obstacle_data.get("rotation", 0))
+
+
+def build_simulation(data, simulation=None, memory_budget=None):
+    """
+    Fills a simulation with the objects of a scenario. Existing objects are removed.
+    ----------
+
+    Args:
+    data (dict):
+        The scenario.
+    simulation (Simulation, optional):
+        The simulation to fill. Defaults to a new one.
+    memory_budget (int, optional):
+        Memory budget in bytes. Scenarios that would exceed it get coarser pheromone grids, see
+        memory.fit_to_memory_budget(). Defaults to None, no budget.
+    ----------
+
+    Returns:
+    Simulation:
+        The filled simulation.
+    """
+    simulation = Simulation() if simulation is None else simulation
+    if memory_budget is not None:
+        data = fit_to_memory_budget(data, memory_budget, simulation.precision)
+    simulation.clear()
+    simulation.bounds = tuple(data["simulation"][0]["boundaries"])
+
+    for obstacle_data in data.get("obstacles", []):
+        simulation.add_obstacle(create_obstacle(obstacle_data))
+    for colony_data in data.get("colonies", []):
+        simulation.add_colony(create_colony(colony_data))
+    for food_data in data.get("food", []):
+        simulation.add_food(create_food(food_data))
+    return simulation
+
+
+def load_scenario(path, simulation=None, memory_budget=None):
+    """
+    Loads a scenario file into a simulation.
+    ----------
+
+    Args:
+    path (str):
+        The path of the JSON file.
+    simulation (Simulation, optional):
+        The simulation to fill. Defaults to a new one.
+    memory_budget (int, optional):
+        Memory budget in bytes, see build_simulation(). Defaults to None.
+    ----------
+
+    Returns:
+    Simulation:
+        The filled simulation.
+    """
+    with open(path, "r") as json_file:
+        data = json.load(json_file)
+    return build_simulation(data, simulation, memory_budget)
@@ -0,0 +1,122 @@
+import heapq
+import itertools
+
+
+class ScheduledEvent:
+    """
+    An action that is due at a certain epoch.
+    ----------
+
+    Attributes:
+    epoch (int):
+        The epoch at which the action is executed.
+    action (callable):
+        The function that is called.
+    args (tuple):
+        The arguments the action is called with.
+    cancelled (bool):
+        Cancelled events stay in the queue but are skipped when they are due.
+    ----------
+
+    Methods:
+    cancel():
+        Prevents the action from being executed.
+    """
+    __slots__ = ("epoch", "action", "args", "cancelled")
+
+    def __init__(self, epoch, action, args):
+        self.epoch = epoch
+        self.action = action
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Prevents the action from being executed.
+        """
+        self.cancelled = True
+
+
+class EventScheduler:
+    """
+    Min-heap of actions keyed by the epoch they are due at.
+    Instead of asking every object in every epoch whether something has to happen, the simulation only looks at
+    the top of the heap, so the cost depends on the events that actually fire.
+    ----------
+
+    Methods:
+    schedule():
+        Schedules an action for an epoch.
+    run_due():
+        Executes all actions that are due.
+    get_next_epoch():
+        Returns the epoch of the next pending event.
+    clear():
+        Removes all events.
+    """
+    def __init__(self):
+        self.queue = []
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def schedule(self, epoch, action, *args):
+        """
+        Schedules an action for an epoch. Actions for the same epoch run in the order they were scheduled.
+        ----------
+
+        Args:
+        epoch (int):
+            The epoch at which the action is executed.
+        action (callable):
+            The function to call.
+        *args:
+            The arguments for the action.
+        ----------
+
+        Returns:
+        ScheduledEvent:
+            The event, which can be cancelled.
+        """
+        event = ScheduledEvent(epoch, action, args)
+        heapq.heappush(self.queue, (epoch, next(self.counter), event))
+        return event
+
+    def run_due(self, epoch):
+        """
+        Executes all actions that are due at or before an epoch. Actions may schedule new events,
+        events that become due by that are executed as well.
+        ----------
+
+        Args:
+        epoch (int):
+            The current epoch.
+        ----------
+
+        Returns:
+        int:
+            The number of executed actions.
+        """
+        executed = 0
+        while self.queue and self.queue[0][0] <= epoch:
+            _, _, event = heapq.heappop(self.queue)
+            if event.cancelled:
+                continue
+            event.action(*event.args)
+            executed += 1
+        return executed
+
+    def get_next_epoch(self):
+        """
+        Returns the epoch of the next pending event, or None if there is none.
+        """
+        while self.queue and self.queue[0][2].cancelled:
+            heapq.heappop(self.queue)
+        return self.queue[0][0] if self.queue else None
+
+    def clear(self):
+        """
+        Removes all events.
+        """
+        self.queue.clear()
@@ -1,10 +1,15 @@
 import json
 import numpy as np
-import pandas as pd
 from resources.colony import Colony
 from resources.food import Food
-from statistics.statistics import build_pdf
-from resources.timer_decorator import print_execution_times
+from resources.occupancy import OccupancyGrid
+from resources.freespace import FreeSpaceMap
+from resources.flowfield import FlowField
+from resources.spatial import SpatialHash
+from resources.scheduler import EventScheduler
+from resources.precision import get_precision_policy
+from resources.pheromone import PheromoneField
+from resources.profiler import PhaseProfiler
 
 class Simulation:
     """
@@ -19,6 +24,44 @@ class Simulation:
         A list containing the colonie objects.
     running : bool
         Indicates if the simulation in running.
+    sensing_model : str
+        How ants sense pheromones. "max" steers towards the strongest cell within the search radius,
+        "gradient" steers along the pheromone gradient of the 8 surrounding sectors and "heading" only uses
+        the sectors to the left, ahead and to the right of the ant.
+    use_flow_field : bool
+        If True, ants that carry food home follow a precomputed flow field around the obstacles to their nest
+        instead of the pheromone trace.
+    flow_field_cell_size : float
+        The cell size of the occupancy grid the flow fields are computed on.
+    occupancy : OccupancyGrid
+        All obstacles rasterized for the collision of the ants, built by get_occupancy(). Obstacles have to be
+        added and removed through add_obstacle() and remove_obstacle() to keep it up to date.
+    occupancy_cell_size : float
+        The cell size of the collision grid. Defaults to 5, the size of an ant.
+    free_space : FreeSpaceMap
+        Placement index over the collision grid for colonies and food, built by get_free_space().
+    food_index : SpatialHash
+        Spatial hash of the food sources that still have food, bucketed by the center ants collect from.
+        Food has to be added, removed and changed through add_food(), remove_food() and update_food().
+    interaction : AntInteraction
+        Optional crowding and communication model between ants, applied at the start of every epoch. None disables it.
+    scheduler : EventScheduler
+        Timed world changes (moving food, respawns, new obstacles and colonies) that fire at the start of their epoch.
+    shared_pheromone : bool
+        If True, the pheromone grids of all colonies live in one PheromoneField, evaporate in one operation and
+        can be sensed by the other colonies. All colonies need the same pheromone grid shape.
+    foreign_trail_avoidance : float
+        With a shared pheromone field, the weight of the trails of other colonies that is subtracted from the own
+        trails during sensing. 0 ignores foreign trails.
+    extra_pheromone_channels : tuple
+        With a shared pheromone field, the reduction factor of every channel beyond the two depths of the colony grids.
+    pheromone_field : PheromoneField
+        The shared pheromone field, built by get_pheromone_field().
+    profiler : PhaseProfiler
+        Measures the phases of every epoch (interaction, foraging, sensing, movement, collision, deposition,
+        evaporation, population) when enabled. Disabled by default.
+    precision : PrecisionPolicy
+        The numeric types of positions, pheromone grids and status flags, see set_precision().
     bounds: Tuple
         defines the spatial boundaries of the simulation area (min_x, max_x, min_y, max_y)
     ---------
@@ -26,16 +69,48 @@ class Simulation:
     Methods
     start():
         Start the simulation.
+    set_precision():
+        Selects the numeric types of the simulation.
     next_epoch():
         Calculates the next position of all Ant objects.
     add_colony():
         Add a Colony object to the simulation.
+    remove_colony():
+        Remove a Colony object and its cached flow field and shared pheromone.
+    reconfigure_colony():
+        Change the settings of a running colony, resampling all pheromone grids if they are shared.
     add_food():
         Add a Food object to the simulation.
+    remove_food():
+        Remove a Food object from the simulation.
+    update_food():
+        Update the spatial hash after a Food object was moved, refilled or changed.
+    clear():
+        Remove all colonies, food and obstacles.
+    schedule_food_relocation():
+        Schedule the next random move of a Food object.
+    schedule_food_respawn(), schedule_food(), schedule_obstacle(), schedule_colony():
+        Schedule world changes for a later epoch.
     check_future_position():    
         Adjusts the given position to ensure it stays within the simulation bounds.
+    clamp_to_bounds():
+        Moves positions onto the border of the simulation area.
+    resolve_moves():
+        Checks the moves of many ants against the bounds and obstacles at once.
     add_obstacle():
         Add an Obstacle object to the simulation.
+    add_obstacles():
+        Add many obstacles, checking colonies and food for collisions once.
+    find_objects_near():
+        Find the colonies or food whose bounding box overlaps obstacles.
+    remove_obstacle():
+        Remove an Obstacle object from the simulation.
+    get_occupancy():
+        Returns the collision grid of all obstacles.
+    get_free_space():
+        Returns the placement index for colonies and food.
+    get_pheromone_field():
+        Returns the shared pheromone field of all colonies.
     check_object_collision_with_obstacles():
         Checks for collision between an object defined by its coordinates and size and obstacles in the simulation.
     relocate_object():
@@ -52,6 +127,14 @@ class Simulation:
         Finds the direction of a pheromone trace relative to the given coordinates within the search radius.
     get_pheromone_position():
         Retrieves the position of the maximum value in a slice of the pheromone array within the specified search radius.
+    map_positions_to_pheromone_indices():
+        Maps the coordinates of many ants to their indices in the pheromone grid at once.
+    find_pheromone_gradients():
+        Computes the pheromone gradient direction for all ants of a colony from summed-area tables.
+    get_obstacle_key():
+        Describes the current obstacles, used to notice changes.
+    get_flow_field():
+        Returns the flow field to the nest of a colony, recomputed only if obstacles, bounds or the nest changed.
 
     """
     def __init__(self):
@@ -61,6 +144,22 @@ class Simulation:
         self.running = False
         self.bounds = () #(min_x, max_x, min_y, max_y)
         self.epoch = 0
+        self.sensing_model = "max"
+        self.use_flow_field = False
+        self.flow_field_cell_size = 10
+        self.flow_fields = {}
+        self.occupancy = None
+        self.occupancy_cell_size = 5
+        self.free_space = None
+        self.food_index = SpatialHash(cell_size=50)
+        self.interaction = None
+        self.scheduler = EventScheduler()
+        self.precision = get_precision_policy("double")
+        self.profiler = PhaseProfiler()
+        self.shared_pheromone = False
+        self.foreign_trail_avoidance = 0
+        self.extra_pheromone_channels = ()
+        self.pheromone_field = None
         
     #To find the best parameters for ants to transport the most food units to the colony, use the Grid-Search below. 
     #To do this, the following adjustment must be made:
@@ -68,81 +167,508 @@ class Simulation:
     #Then adjust the calls in the next_epoch method accordingly  
     def next_epoch(self):
 
-        self.epoch += 1
-        active_food_objects = [food for food in self.food if food.amount_of_food != 0]
+        profiler = self.profiler
+        with profiler.phase("epoch"):
+            self.epoch += 1
+            with profiler.phase("events"):
+                self.scheduler.run_due(self.epoch)
+
+            if self.interaction is not None:
+                with profiler.phase("interaction"):
+                    self.interaction.apply(self)
+
+            pheromone_field = self.get_pheromone_field()
+            sensing_arrays = None
+            if pheromone_field is not None and self.foreign_trail_avoidance > 0 and len(self.colonies) > 1:
+                with profiler.phase("sensing"):
+                    sensing_arrays = pheromone_field.get_sensing_arrays(self.foreign_trail_avoidance)
+
+            for colony_index, colony in enumerate(self.colonies):
+                pheromone_array = colony.pheromone.pheromone_array if sensing_arrays is None else sensing_arrays[colony_index]
+                with profiler.phase("foraging"):
+                    for ant in colony.ants:
+                        if ant.pheromone_status == -1:
+                            for food in self.food_index.query(*ant.coordinates):
+                                if ant.try_carry_food(food):
+                                    ant.carry_food(food)
+                                    if food.amount_of_food <= 0:
+                                        self.food_index.remove(food)
+                                    break
+                        if ant.try_drop_food(colony):
+                            ant.drop_food(colony)
+
+                ants = colony.ants
+                with profiler.phase("sensing"):
+                    gradients = None
+                    if self.sensing_model != "max":
+                        gradients = self.find_pheromone_gradients(colony, pheromone_array)
+
+                    flow_field = self.get_flow_field(colony) if self.use_flow_field else None
+
+                    # sensing only reads the pheromone, which does not change before the deposition,
+                    # so all ants sense before the first one moves
+                    pheromone_directions = [None] * len(ants)
+                    for idx, ant in enumerate(ants):
+                        if flow_field is not None and ant.pheromone_status == 1:
+                            flow_direction = flow_field.direction_at(*ant.coordinates)
+                            if flow_direction.any():
+                                ant.direction = flow_direction * ant.step_size
+                        elif gradients is None:
+                            pheromone_directions[idx] = self.find_pheromone_trace(ant.coordinates, ant.pheromone_status, pheromone_array, colony, ant.search_radius)
+                        elif gradients[idx].any():
+                            pheromone_directions[idx] = gradients[idx]
+
+                with profiler.phase("movement"):
+                    starts = np.empty((len(ants), 2), dtype=self.precision.position_dtype)
+                    futures = np.empty((len(ants), 2), dtype=self.precision.position_dtype)
+                    for idx, ant in enumerate(ants):
+                        starts[idx] = ant.coordinates
+                        futures[idx] = ant.move(pheromone_direction=pheromone_directions[idx])
+
+                # the moves of all ants are checked against bounds and obstacles at once
+                with profiler.phase("collision"):
+                    adjusted_positions = self.resolve_moves(starts, futures).astype(self.precision.position_dtype, copy=False)
+
+                with profiler.phase("deposition"):
+                    for ant, adjusted_position in zip(ants, adjusted_positions):
+                        ant.coordinates = adjusted_position
+
+                        idx_row, idx_col = self.map_ant_coordinates_to_pheromone_index(ant_coordinates = ant.coordinates,
+                                                                                       colony = colony)
+
+                        colony.pheromone.leave_pheromone(pos = (idx_row, idx_col),
+                                                         pheromone_status = ant.pheromone_status)
+
+                if pheromone_field is None:
+                    with profiler.phase("evaporation"):
+                        colony.pheromone.reduce_pheromones()
+                with profiler.phase("population"):
+                    colony.update_population()
+
+            if pheromone_field is not None:
+                with profiler.phase("evaporation"):
+                    pheromone_field.reduce_pheromones()
+        profiler.end_epoch()
+
+    def set_precision(self, precision):
+        """
+        Selects the numeric types of the simulation: "double" (float64 everywhere, the default), "single"
+        (float32 positions and pheromone grids) or "compact" (float32 positions and pheromone grids quantized to uint16).
+        The pheromone grids of all colonies are converted, colonies added later are converted by add_colony().
+        --------
 
+        Args:
+        precision (str or PrecisionPolicy):
+            The name of the policy or a policy.
+        """
+        self.precision = get_precision_policy(precision)
         for colony in self.colonies:
-            for ant in colony.ants:
-                for food in active_food_objects:
-                    if ant.try_carry_food(food):
-                        ant.carry_food(food)
-                        break
-                if ant.try_drop_food(colony):
-                    ant.drop_food(colony)
-
-                pheromone_direction = self.find_pheromone_trace(ant.coordinates, ant.pheromone_status, colony.pheromone.pheromone_array, colony, ant.search_radius)
-                future_position = ant.move(pheromone_direction=pheromone_direction)
-                adjusted_position = self.check_future_position(future_position)
-                ant.coordinates = adjusted_position
-                
-                idx_row, idx_col = self.map_ant_coordinates_to_pheromone_index(ant_coordinates = ant.coordinates,
-                                                                               colony = colony)
-                
-                colony.pheromone.leave_pheromone(pos = (idx_row, idx_col),
-                                                 pheromone_status = ant.pheromone_status)    
-
-            colony.pheromone.reduce_pheromones()
+            self.precision.apply_to_colony(colony)
 
     def add_colony(self, colony):
+        self.precision.apply_to_colony(colony)
         if self.check_object_collision_with_obstacles(colony.coordinates, colony.size):
             self.relocate_object(colony)
         self.colonies.append(colony)
 
+    def remove_colony(self, colony):
+        """
+        Removes a Colony object from the simulation with its cached flow field. If the colonies share a pheromone
+        field, the pheromone of the colony is copied out of it and the field is rebuilt without the colony.
+        --------
+
+        Args:
+        colony (Colony):
+            The colony to remove.
+        """
+        self.colonies.remove(colony)
+        self.flow_fields.pop(id(colony), None)
+        if self.pheromone_field is not None and colony in self.pheromone_field.colonies:
+            colony.pheromone.storage = colony.pheromone.storage.copy()
+
+    def reconfigure_colony(self, colony, grid_pheromone_shape=None, **settings):
+        """
+        Changes the settings of a running colony, see Colony.reconfigure(). If the colonies share a pheromone field,
+        which needs the same grid shape for all colonies, a new grid shape resamples the grids of all colonies and
+        the field is rebuilt on its next use.
+        --------
+
+        Args:
+        colony (Colony):
+            The colony to change.
+        grid_pheromone_shape (tuple, optional):
+            The new number of rows and columns of the pheromone grid.
+        **settings:
+            The other settings of Colony.reconfigure().
+        """
+        if (grid_pheromone_shape is not None and self.get_pheromone_field() is not None
+                and tuple(grid_pheromone_shape) != colony.pheromone.storage.shape[1:]):
+            for other in self.colonies:
+                other.pheromone.resample(grid_pheromone_shape)
+            grid_pheromone_shape = None
+        colony.reconfigure(grid_pheromone_shape=grid_pheromone_shape, **settings)
+
     def add_food(self, food):
         if self.check_object_collision_with_obstacles(food.coordinates, food.size):
             self.relocate_object(food)
         self.food.append(food)
+        self.update_food(food)
+        self.schedule_food_relocation(food)
+
+    def remove_food(self, food):
+        """
+        Removes a Food object from the simulation and from the spatial hash.
+        --------
+
+        Args:
+        food (Food):
+            The food source to remove.
+        """
+        self.food.remove(food)
+        self.food_index.remove(food)
+
+    def update_food(self, food):
+        """
+        Updates the spatial hash after a Food object was added, moved, refilled or changed.
+        Food sources without food are not kept in the hash.
+        --------
+
+        Args:
+        food (Food):
+            The changed food source.
+        """
+        if food.amount_of_food > 0:
+            # ants collect food around the center of the source, see Ant.is_near_target()
+            self.food_index.update(food, food.coordinates[0] + 45, food.coordinates[1] + 45)
+        else:
+            self.food_index.remove(food)
+
+    def clear(self):
+        """
+        Removes all colonies, food and obstacles from the simulation.
+        """
+        self.food = []
+        self.colonies = []
+        self.obstacles = []
+        self.occupancy = None
+        self.food_index.clear()
+        self.scheduler.clear()
+        self.pheromone_field = None
+
+    def schedule_food_relocation(self, food):
+        """
+        Schedules the next random move of a Food object, move_after_number_of_epochs after the current epoch.
+        A previously scheduled move of the same food source is replaced. Nothing is scheduled if the food does not move randomly.
+        --------
+
+        Args:
+        food (Food):
+            The food source to move.
+        """
+        if not food.move_randomly or food.move_after_number_of_epochs <= 0:
+            food.next_move_epoch = None
+            return
+        food.next_move_epoch = self.epoch + food.move_after_number_of_epochs
+        self.scheduler.schedule(food.next_move_epoch, self.relocate_food, food, food.next_move_epoch)
+
+    def relocate_food(self, food, due_epoch):
+        """
+        Moves a food source to a random free position and schedules its next move.
+        Events of removed food sources or moves that were rescheduled in the meantime are ignored.
+        --------
+
+        Args:
+        food (Food):
+            The food source to move.
+        due_epoch (int):
+            The epoch the move was scheduled for.
+        """
+        if food.next_move_epoch != due_epoch or not food.move_randomly or food not in self.food:
+            return
+        food.relocate(self.bounds)
+        if self.check_object_collision_with_obstacles(food.coordinates, food.size):
+            self.relocate_object(food)
+        self.update_food(food)
+        self.schedule_food_relocation(food)
+
+    def schedule_food_respawn(self, epoch, food, amount_of_food=None):
+        """
+        Schedules the refill of a food source.
+        --------
+
+        Args:
+        epoch (int):
+            The epoch of the refill.
+        food (Food):
+            The food source to refill.
+        amount_of_food (float, optional):
+            The new amount of food. Defaults to the start amount of the food source.
+        """
+        self.scheduler.schedule(epoch, self.respawn_food, food, amount_of_food)
+
+    def respawn_food(self, food, amount_of_food=None):
+        """
+        Refills a food source that is still part of the simulation.
+        """
+        if food not in self.food:
+            return
+        food.amount_of_food = food.start_amount if amount_of_food is None else amount_of_food
+        self.update_food(food)
+
+    def schedule_food(self, epoch, food):
+        """
+        Schedules the insertion of a new food source.
+        """
+        self.scheduler.schedule(epoch, self.add_food, food)
+
+    def schedule_obstacle(self, epoch, obstacle):
+        """
+        Schedules the insertion of an obstacle.
+        """
+        self.scheduler.schedule(epoch, self.add_obstacle, obstacle)
+
+    def schedule_colony(self, epoch, colony):
+        """
+        Schedules the spawn of a colony.
+        """
+        self.scheduler.schedule(epoch, self.add_colony, colony)
     
     def add_obstacle(self, obstacle):
-        self.obstacles.append(obstacle)
+        """
+        Adds an obstacle and rasterizes it into the collision grid. Colonies and food that overlap the new obstacle
+        are moved to the closest free position.
+        --------
 
-        for food in self.food:
+        Args:
+        obstacle (Obstacle):
+            The obstacle to add.
+        """
+        self.add_obstacles([obstacle])
+
+    def add_obstacles(self, obstacles):
+        """
+        Adds many obstacles at once. Only colonies and food whose bounding box overlaps one of the new obstacles are
+        checked for collisions, so the placement index is rebuilt at most once, after all obstacles are rasterized.
+        --------
+
+        Args:
+        obstacles (list):
+            The obstacles to add.
+        """
+        obstacles = list(obstacles)
+        self.obstacles.extend(obstacles)
+        if self.occupancy is not None:
+            for obstacle in obstacles:
+                self.occupancy.add_obstacle(obstacle)
+
+        for food in self.find_objects_near(obstacles, self.food):
             if self.check_object_collision_with_obstacles(food.coordinates, food.size):
                 self.relocate_object(food)
-        
-        for colony in self.colonies:
+                self.update_food(food)
+
+        for colony in self.find_objects_near(obstacles, self.colonies):
             if self.check_object_collision_with_obstacles(colony.coordinates, colony.size):
                 self.relocate_object(colony)
+
+    def find_objects_near(self, obstacles, objects):
+        """
+        Returns the objects whose bounding box overlaps the bounding box of one of the obstacles. The boxes are
+        widened by one cell of the collision grid, because objects next to an obstacle can share a blocked cell.
+        --------
+
+        Args:
+        obstacles (list):
+            The obstacles.
+        objects (list):
+            Colonies or food, with lower left coordinates and size.
+        ---------
+
+        Returns:
+        list:
+            The objects that may collide with the obstacles.
+        """
+        if not obstacles or not objects:
+            return []
+        boxes = np.array([(*obstacle.coordinates, *obstacle.size) for obstacle in obstacles], dtype=float)
+        margin = self.occupancy_cell_size
+        near = []
+        for obj in objects:
+            (x, y), (width, height) = obj.coordinates, obj.size
+            if np.any((boxes[:, 0] - margin < x + width) & (x < boxes[:, 0] + boxes[:, 2] + margin)
+                      & (boxes[:, 1] - margin < y + height) & (y < boxes[:, 1] + boxes[:, 3] + margin)):
+                near.append(obj)
+        return near
         
-    def check_future_position(self, future_position):
+    def remove_obstacle(self, obstacle):
         """
-        Adjusts the given position to ensure it stays within the simulation bounds.
+        Removes an obstacle and rebuilds the collision grid on its next use.
+        --------
+
+        Args:
+        obstacle (Obstacle):
+            The obstacle to remove.
+        """
+        if obstacle in self.obstacles:
+            self.obstacles.remove(obstacle)
+            self.occupancy = None
+
+    def get_occupancy(self):
+        """
+        Returns the collision grid with all obstacles rasterized. It is built on first use and when the bounds
+        changed, add_obstacle() rasterizes new obstacles into the existing grid.
+        --------
+
+        Returns:
+        OccupancyGrid:
+            The collision grid.
+        """
+        if self.occupancy is None or self.occupancy.bounds != tuple(self.bounds):
+            self.occupancy = OccupancyGrid.from_obstacles(self.bounds, self.obstacles, self.occupancy_cell_size)
+        return self.occupancy
+
+    def get_free_space(self):
+        """
+        Returns the placement index over the collision grid. It is rebuilt on first use after obstacles changed,
+        so adding many obstacles at once only builds it once.
+        --------
+
+        Returns:
+        FreeSpaceMap:
+            The placement index.
+        """
+        occupancy = self.get_occupancy()
+        if self.free_space is None or self.free_space.occupancy is not occupancy or self.free_space.version != occupancy.version:
+            self.free_space = FreeSpaceMap(occupancy)
+        return self.free_space
+
+    def get_pheromone_field(self):
+        """
+        Returns the shared pheromone field of all colonies if shared_pheromone is enabled. The field is rebuilt,
+        keeping the pheromone of the colonies, when colonies were added or removed or a pheromone grid was replaced.
+        --------
+
+        Returns:
+        PheromoneField:
+            The shared pheromone field, or None if the colonies keep separate pheromone grids.
+        """
+        if not self.shared_pheromone:
+            self.pheromone_field = None
+            return None
+        field = self.pheromone_field
+        if field is None or not field.is_attached(self.colonies) or field.extra_channels != tuple(self.extra_pheromone_channels):
+            self.pheromone_field = PheromoneField(self.colonies, self.extra_pheromone_channels, previous=field)
+        return self.pheromone_field
+
+    def check_future_position(self, future_position, current_position=None):
+        """
+        Adjusts the given position to ensure it stays within the simulation bounds and outside of obstacles.
         -----------
 
         Args:
         future_position (np.array):
             The anticipated future position of an ant.
+        current_position (tuple, optional):
+            The position the ant moves from. If given, the whole move is checked against the obstacles
+            and slides along them, see resolve_moves(). Defaults to None.
         -----------
 
         Returns.
         np.array: The adjusted position within the simulation bounds.
         """
+        if current_position is not None:
+            return self.resolve_moves(np.asarray(current_position, dtype=float)[None], np.asarray(future_position, dtype=float)[None])[0]
+        return self.check_for_obstacles(self.clamp_to_bounds(np.asarray(future_position, dtype=float)))
+
+    def clamp_to_bounds(self, positions):
+        """
+        Moves positions that lie outside the simulation bounds onto the border.
+        -----------
+
+        Args:
+        positions (numpy array):
+            One position (x, y) or an array of shape (number of positions, 2).
+        -----------
+
+        Returns:
+        numpy array:
+            The clamped positions.
+        """
         min_x, max_x, min_y, max_y = self.bounds
-        x, y = future_position
-        if x < min_x:
-            x = min_x
-        elif x >= max_x:
-            x = max_x - 1
-        if y <= min_y:
-            y = min_y + 1
-        elif y > max_y:
-            y = max_y
-        return self.check_for_obstacles(np.array([x, y]))
+        positions = np.array(positions, dtype=float)
+        x, y = positions[..., 0], positions[..., 1]
+        x[x < min_x] = min_x
+        x[x >= max_x] = max_x - 1
+        y[y <= min_y] = min_y + 1
+        y[y > max_y] = max_y
+        return positions
+
+    def resolve_moves(self, starts, ends):
+        """
+        Resolves the moves of many ants at once. The end points are kept within the bounds, then every move is traced
+        through the collision grid, so ants with a large step size cannot tunnel through thin obstacles.
+        A move that hits an obstacle stops just before it and the rest of the move slides along the wall, using the
+        outward normal of the hit cell. If the slide hits an obstacle as well, the ant stops at that contact point.
+        --------
+
+        Args:
+        starts (numpy array):
+            The positions the ants move from, of shape (number of ants, 2).
+        ends (numpy array):
+            The positions the ants move to.
+        --------
+
+        Returns:
+        numpy array:
+            The resolved positions, of shape (number of ants, 2).
+        """
+        starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        ends = self.clamp_to_bounds(np.asarray(ends, dtype=float).reshape(-1, 2))
+        if not self.obstacles or len(starts) == 0:
+            return ends
+
+        occupancy = self.get_occupancy()
+        hit, t_hit, rows, cols, faces = occupancy.trace_segments(starts, ends)
+        if not hit.any():
+            return ends
+
+        moves = ends[hit] - starts[hit]
+        contacts, remaining = self.stop_before_contact(starts[hit], moves, t_hit[hit])
+
+        # the smoothed normal of the border cell follows slanted walls, walls that are only one cell thick
+        # have none, then the face the move entered through is used
+        normals = occupancy.get_normals()[rows[hit], cols[hit]]
+        use_face = (remaining * normals).sum(axis=1) >= 0
+        normals[use_face] = faces[hit][use_face]
+        into_wall = (remaining * normals).sum(axis=1)
+        remaining -= np.minimum(into_wall, 0)[:, None] * normals
+        slide_ends = self.clamp_to_bounds(contacts + remaining)
+
+        slide_hit, slide_t, _, _, _ = occupancy.trace_segments(contacts, slide_ends)
+        if slide_hit.any():
+            slide_ends[slide_hit], _ = self.stop_before_contact(contacts[slide_hit], slide_ends[slide_hit] - contacts[slide_hit], slide_t[slide_hit])
+
+        # ants that already stood inside an obstacle, e.g. because it was placed on top of them
+        trapped = occupancy.is_blocked(slide_ends[:, 0], slide_ends[:, 1])
+        for idx in np.flatnonzero(trapped):
+            slide_ends[idx] = occupancy.find_nearest_free(*slide_ends[idx])
+
+        ends[hit] = slide_ends
+        return ends
+
+    def stop_before_contact(self, starts, moves, t_hit, margin=0.01):
+        """
+        Returns the points a small margin before the contact with an obstacle and the remaining part of the moves.
+        """
+        lengths = np.linalg.norm(moves, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_contact = np.where(lengths > 0, np.maximum(t_hit - margin / lengths, 0), 0)
+        return starts + t_contact[:, None] * moves, (1 - t_contact)[:, None] * moves
 
     def check_object_collision_with_obstacles(self, coordinates, size):
         """
-        Checks for collision between an object defined by its coordinates and size
-        and obstacles in the simulation using Axis-Aligned Bounding Box (AABB) collision detection.
+        Checks for collision between an object defined by its coordinates and size and obstacles in the simulation.
+        The rectangle of the object is looked up in the summed-area table of the collision grid, so the check
+        costs the same for any number and shape of obstacles.
         -----------
 
         Args:
@@ -156,23 +682,13 @@ class Simulation:
         bool: 
             True if collision with any obstacle detected, False otherwise.
         """
-        width, height = size
-        bottom_left_x, bottom_left_y = coordinates
-        top_right_x, top_right_y = coordinates[0] + width, coordinates[1] + height
-
-
-        for obstacle in self.obstacles:
-            obstacle_min_x, obstacle_max_x, obstacle_min_y, obstacle_max_y = obstacle.coordinates[0], obstacle.coordinates[0] + obstacle.size[0], obstacle.coordinates[1], obstacle.coordinates[1] + obstacle.size[1] 
-
-            # Axis-Aligned Bounding Box (AABB) collision detection method
-            if (bottom_left_x <= obstacle_max_x and top_right_x >= obstacle_min_x) and (bottom_left_y <= obstacle_max_y and top_right_y >= obstacle_min_y):
-
-                return True #collision
-        return False
+        if not self.obstacles:
+            return False
+        return not self.get_free_space().is_free(coordinates, size)
 
     def relocate_object(self, object):
         """
-        Relocates the given object to a new position within the environment, avoiding collisions with obstacles.
+        Relocates the given object to the closest position within the environment where it does not collide with obstacles.
         --------
 
         Args:
@@ -182,26 +698,14 @@ class Simulation:
 
         Returns:
         bool:
-            True if the object is successfully relocated without collision and within bounds, False otherwise.
-    """
-        step_size = max(object.size)
-
-        directions = {
-        "right": (step_size, 0),
-        "down": (0, -step_size),
-        "left": (-step_size, 0),
-        "up": (0, step_size),
-    }
-        for direction, (dx, dy) in directions.items(): 
-            new_position = (object.coordinates[0] + dx, object.coordinates[1] + dy)
-            # Adjust the new position to ensure it is within bounds
-            adjusted_position = self.adjust_object_position_within_bounds(new_position, object.size)
-            
-            if not self.check_object_collision_with_obstacles(adjusted_position, object.size):
-                object.coordinates = adjusted_position
-                return True  # Successfully relocated without collision and within bounds
-
-        return False 
+            True if the object is successfully relocated without collision and within bounds, False if there is
+            no free space large enough for it.
+        """
+        position = self.get_free_space().find_nearest_position(object.coordinates, object.size)
+        if position is None:
+            return False
+        object.coordinates = position
+        return True
 
     def adjust_object_position_within_bounds(self, coordinates, size):
         """
@@ -239,8 +743,9 @@ class Simulation:
 
     def check_for_obstacles(self, future_position):
         """
-        Checks if the future position of an object intersects with any obstacles in the simulation
-        and adjusts the position accordingly to avoid collision.
+        Checks if a position lies inside an obstacle and moves it to the closest free cell of the collision grid.
+        The obstacles are looked up in the grid, so the cost does not depend on their number or shape.
+        Moves with a known start point are resolved by resolve_moves() instead.
         --------
 
         Args:
@@ -252,22 +757,14 @@ class Simulation:
         numpy array: 
             The adjusted (x, y) coordinates to avoid obstacles.
         """
-        x, y = future_position
-        
-        for obstacle in self.obstacles:
-            min_x, max_x = obstacle.coordinates[0], obstacle.coordinates[0] + obstacle.size[0]
-            min_y, max_y = obstacle.coordinates[1], obstacle.coordinates[1] + obstacle.size[1]
-            
-            if x >= min_x - 2.5 and x <= max_x and y >= min_y - 5 and y <= max_y:
-                x_diff = min(abs(x - min_x), abs(x - max_x))
-                y_diff = min(abs(y - min_y), abs(y - max_y))
-
-                if x_diff < y_diff:
-                    x = min_x - 2.5 if x_diff == abs(x - min_x) else max_x - 2.5
-                else:
-                    y = min_y - 5 if y_diff == abs(y - min_y) else max_y
+        future_position = np.asarray(future_position, dtype=float)
+        if not self.obstacles:
+            return future_position
 
-        return np.array([x, y])
+        occupancy = self.get_occupancy()
+        if not occupancy.is_blocked(*future_position):
+            return future_position
+        return np.array(occupancy.find_nearest_free(*future_position))
 
     def map_ant_coordinates_to_pheromone_index(self, ant_coordinates, colony):
         """
@@ -349,12 +846,18 @@ class Simulation:
                 "coordinates": obstacle.coordinates,
                 "size": obstacle.size
             }
+            if obstacle.is_polygon():
+                obstacle_data["vertices"] = obstacle.get_vertices().round(3).tolist()
             data["obstacles"].append(obstacle_data)
 
-        with open("statistics/statistics.json", "w") as json_file:
-            json.dump(data, json_file, indent=4)
+        # imported here, so headless runs do not load the report dependencies
+        from statistics.statistics import build_pdf
+
+        with self.profiler.phase("io"):
+            with open("statistics/statistics.json", "w") as json_file:
+                json.dump(data, json_file, indent=4)
 
-        build_pdf()
+            build_pdf()
 
     def find_pheromone_trace(self, coordinates, pheromone_status, pheromone_array, colony, search_radius):
         """
@@ -385,7 +888,10 @@ class Simulation:
         scale_y = -self.bounds[2] // pheromone_shape[0]
 
         ant_position = self.map_ant_coordinates_to_pheromone_index(coordinates, colony)
-        pheromone_cell = self.get_pheromone_position(*ant_position, -pheromone_status * pheromone_array[depth], search_radius)
+        if colony.pheromone.multi_resolution and pheromone_array is colony.pheromone.pheromone_array:
+            pheromone_cell = colony.pheromone.find_strongest_cell(depth, *ant_position, search_radius)
+        else:
+            pheromone_cell = self.get_pheromone_position(*ant_position, -pheromone_status * pheromone_array[depth], search_radius)
 
         if pheromone_cell is None or pheromone_cell == ant_position:
             return None
@@ -435,12 +941,141 @@ class Simulation:
         
         return max_pos_in_original_array
 
+    def get_obstacle_key(self):
+        """
+        Describes the current obstacles, used to notice when cached maps have to be rebuilt.
+        --------
+
+        Returns:
+        tuple:
+            The corners of all obstacles.
+        """
+        return tuple(tuple(map(tuple, obstacle.get_vertices().tolist())) for obstacle in self.obstacles)
+
+    def get_flow_field(self, colony):
+        """
+        Returns the flow field that leads around the obstacles to the nest of a colony.
+        It is only recomputed if the bounds, the obstacles or the position of the nest changed.
+        --------
+
+        Args:
+        colony (Colony):
+            The colony whose nest is the target.
+        --------
+
+        Returns:
+        FlowField:
+            The flow field of the colony.
+        """
+        key = (tuple(self.bounds), self.get_obstacle_key(), tuple(colony.coordinates), self.flow_field_cell_size)
+        cached = self.flow_fields.get(id(colony))
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        occupancy = OccupancyGrid.from_obstacles(self.bounds, self.obstacles, self.flow_field_cell_size)
+        # ants drop their food within a radius of 20 around the nest center, see Ant.is_near_target()
+        flow_field = FlowField(occupancy, (colony.coordinates[0] + 45, colony.coordinates[1] + 45), target_radius=20)
+        self.flow_fields[id(colony)] = (key, flow_field)
+        return flow_field
+
+    def map_positions_to_pheromone_indices(self, positions, colony):
+        """
+        Maps the coordinates of many ants to their indices in the pheromone grid at once,
+        in the same way as map_ant_coordinates_to_pheromone_index().
+        --------
+
+        Args:
+        positions (numpy array):
+            Array of shape (number of ants, 2) with the (x, y) coordinates of the ants.
+        colony (Colony):
+            The colony object containing the pheromone grid.
+        --------
+
+        Returns:
+        tuple:
+            Two integer arrays with the row and column indices.
+        """
+        n_row, n_col = colony.pheromone.pheromone_array.shape[1:]
+        width_spot = (self.bounds[1] - self.bounds[0]) / n_col
+        height_spot = (self.bounds[3] - self.bounds[2]) / n_row
+
+        idx_row = -np.trunc(positions[:, 1] / height_spot).astype(int)
+        idx_col = np.trunc(positions[:, 0] / width_spot).astype(int)
+        return idx_row, idx_col
+
+    def find_pheromone_gradients(self, colony, pheromone_array=None):
+        """
+        Computes the direction of the pheromone gradient for all ants of a colony at once.
+        One summed-area table per depth is built per epoch. Around every ant the pheromone strength of 8 sectors
+        (boxes of the search radius in the 8 directions of the compass) is read with four lookups each, and the
+        sector directions weighted with their strength add up to the gradient. With the "heading" sensing model
+        only the sector ahead of the ant and its two neighbours are used. The cost per ant does not depend on the
+        search radius.
+        --------
+
+        Args:
+        colony (Colony):
+            The colony whose ants are sensing.
+        pheromone_array (numpy array, optional):
+            The array to sense instead of the pheromone grid of the colony. Defaults to None.
+        --------
+
+        Returns:
+        numpy array:
+            Array of shape (number of ants, 2) with the pheromone directions in simulation coordinates, scaled to the
+            length of the search radius. Ants that do not sense any pheromone get a zero vector.
+        """
+        ants = colony.ants
+        if not ants:
+            return np.zeros((0, 2))
+
+        tables = colony.pheromone.summed_area_tables(pheromone_array)
+        n_row, n_col = tables.shape[1] - 1, tables.shape[2] - 1
+
+        positions = colony.get_ant_positions()
+        rows, cols = self.map_positions_to_pheromone_indices(positions, colony)
+        statuses = np.array([ant.pheromone_status for ant in ants])
+        radii = np.array([ant.search_radius for ant in ants])
+        depths = np.where(statuses == 1, 0, 1)
+        half = radii // 2
+
+        def box_sum(row_start, row_end, col_start, col_end):
+            row_start, col_start = np.clip(row_start, 0, n_row), np.clip(col_start, 0, n_col)
+            row_end = np.maximum(np.clip(row_end + 1, 0, n_row), row_start)
+            col_end = np.maximum(np.clip(col_end + 1, 0, n_col), col_start)
+            return (tables[depths, row_end, col_end] - tables[depths, row_start, col_end]
+                    - tables[depths, row_end, col_start] + tables[depths, row_start, col_start])
+
+        # sectors counter-clockwise starting east, as (row offset, column offset) on the grid
+        sectors = ((0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (1, 1))
+        row_ranges = {-1: (rows - radii, rows - 1), 0: (rows - half, rows + half), 1: (rows + 1, rows + radii)}
+        col_ranges = {-1: (cols - radii, cols - 1), 0: (cols - half, cols + half), 1: (cols + 1, cols + radii)}
+
+        sums = np.stack([box_sum(*row_ranges[d_row], *col_ranges[d_col]) for d_row, d_col in sectors], axis=1)
+
+        if self.sensing_model == "heading":
+            directions = np.array([ant.direction for ant in ants])
+            ahead = np.round(np.arctan2(directions[:, 1], directions[:, 0]) / (np.pi / 4)).astype(int) % 8
+            visible = (np.arange(8)[None, :] - ahead[:, None]) % 8
+            sums[(visible > 1) & (visible < 7)] = 0
+
+        units = np.array([(d_col, -d_row) for d_row, d_col in sectors], dtype=float)
+        units /= np.linalg.norm(units, axis=1)[:, None]
+        gradients = sums @ units
+
+        norm = np.linalg.norm(gradients, axis=1)
+        cell_size = (self.bounds[1] - self.bounds[0]) / n_col
+        scale = np.divide(radii * cell_size, norm, out=np.zeros_like(norm), where=norm > 0)
+        return gradients * scale[:, None]
+
 
 if  __name__ == "__main__":
     
     parameter_study = False
     
     if parameter_study:
+        import pandas as pd
+
         colony_coords = [(110, -110)]
         food_coords = [(600, -360)]
         colony_amounts = [100, 250, 400]
@@ -489,9 +1124,10 @@ if  __name__ == "__main__":
         sim.add_food(Food(size=(100, 100), coordinates=(130, -400), amount_of_food=100))
         sim.add_food(Food(size=(100, 100), coordinates=(150, -200), amount_of_food=100))
         
+        sim.profiler.enabled = True
         for _ in range(150):
             sim.next_epoch()
         
-        print_execution_times()
+        print(sim.profiler.to_json())
     
 
@@ -0,0 +1,253 @@
+import numpy as np
+
+
+class SpatialHash:
+    """
+    Uniform grid that buckets objects by their position, so that only the objects near a position have to be checked.
+    ----------
+
+    Args:
+    cell_size (float):
+        The edge length of one bucket. It has to be at least as large as the largest query radius. Defaults to 50.
+    ----------
+
+    Attributes:
+    buckets (dict):
+        Maps the (column, row) of a bucket to the list of objects in it.
+    cells (dict):
+        Maps the id of every stored object to its bucket.
+    ----------
+
+    Methods:
+    get_cell():
+        Returns the bucket of a position.
+    insert():
+        Stores an object at a position.
+    remove():
+        Removes an object.
+    update():
+        Moves an object to a new position.
+    query():
+        Returns all objects in the bucket of a position and its 8 neighbouring buckets.
+    clear():
+        Removes all objects.
+    """
+    def __init__(self, cell_size=50):
+        self.cell_size = cell_size
+        self.buckets = {}
+        self.cells = {}
+        self.neighbour_cache = {}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, obj):
+        return id(obj) in self.cells
+
+    def get_cell(self, x, y):
+        """
+        Returns the bucket of a position.
+        ----------
+
+        Args:
+        x, y (float):
+            The position.
+        ----------
+
+        Returns:
+        tuple:
+            The (column, row) of the bucket.
+        """
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, obj, x, y):
+        """
+        Stores an object at a position. An object that is already stored is moved.
+        ----------
+
+        Args:
+        obj (object):
+            The object to store.
+        x, y (float):
+            The position of the object.
+        """
+        if id(obj) in self.cells:
+            self.remove(obj)
+        cell = self.get_cell(x, y)
+        self.buckets.setdefault(cell, []).append(obj)
+        self.cells[id(obj)] = cell
+        self.neighbour_cache.clear()
+
+    def remove(self, obj):
+        """
+        Removes an object. Objects that are not stored are ignored.
+        ----------
+
+        Args:
+        obj (object):
+            The object to remove.
+        """
+        cell = self.cells.pop(id(obj), None)
+        if cell is None:
+            return
+        bucket = self.buckets[cell]
+        bucket.remove(obj)
+        if not bucket:
+            del self.buckets[cell]
+        self.neighbour_cache.clear()
+
+    def update(self, obj, x, y):
+        """
+        Moves an object to a new position.
+        ----------
+
+        Args:
+        obj (object):
+            The object to move.
+        x, y (float):
+            The new position of the object.
+        """
+        if self.cells.get(id(obj)) != self.get_cell(x, y):
+            self.insert(obj, x, y)
+
+    def query(self, x, y):
+        """
+        Returns all objects in the bucket of a position and its 8 neighbouring buckets.
+        The result for a bucket is cached until the next insert or remove, because many ants share a bucket.
+        ----------
+
+        Args:
+        x, y (float):
+            The position.
+        ----------
+
+        Returns:
+        list:
+            The objects near the position. The list must not be modified.
+        """
+        cell = self.get_cell(x, y)
+        result = self.neighbour_cache.get(cell)
+        if result is None:
+            col, row = cell
+            result = []
+            for d_col in (-1, 0, 1):
+                for d_row in (-1, 0, 1):
+                    result.extend(self.buckets.get((col + d_col, row + d_row), ()))
+            self.neighbour_cache[cell] = result
+        return result
+
+    def clear(self):
+        """
+        Removes all objects.
+        """
+        self.buckets.clear()
+        self.cells.clear()
+        self.neighbour_cache.clear()
+
+
+class CellList:
+    """
+    Neighbour search for many moving points. The points are sorted by the grid cell they are in, so the points of a
+    cell are stored next to each other and the neighbours of all points can be found with array operations.
+    Building the list and finding the pairs costs O(N) for evenly spread points instead of O(N^2).
+    ----------
+
+    Args:
+    cell_size (float):
+        The edge length of one cell. Pairs are only found up to this distance.
+    ----------
+
+    Attributes:
+    order (numpy array):
+        Indices of the points sorted by their cell.
+    cell_start (numpy array):
+        The points of cell c are order[cell_start[c]:cell_start[c + 1]].
+    ----------
+
+    Methods:
+    build():
+        Sorts the points by their cell.
+    find_pairs():
+        Returns all pairs of points within a radius.
+    """
+    # half of the 8 neighbour offsets, so that every pair of cells is visited once
+    half_offsets = ((1, 0), (-1, 1), (0, 1), (1, 1))
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.positions = np.zeros((0, 2))
+        self.order = np.zeros(0, dtype=int)
+        self.cell_start = np.zeros(1, dtype=int)
+
+    def build(self, positions):
+        """
+        Sorts the points by their cell.
+        ----------
+
+        Args:
+        positions (numpy array):
+            Array of shape (number of points, 2).
+        """
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        if len(self.positions) == 0:
+            self.order = np.zeros(0, dtype=int)
+            self.cell_start = np.zeros(1, dtype=int)
+            return
+
+        cells = np.floor(self.positions / self.cell_size).astype(np.int64)
+        cells -= cells.min(axis=0)
+        self.n_x, self.n_y = cells.max(axis=0) + 1
+        self.cell_x, self.cell_y = cells[:, 0], cells[:, 1]
+
+        cell_ids = self.cell_y * self.n_x + self.cell_x
+        self.order = np.argsort(cell_ids, kind="stable")
+        counts = np.bincount(cell_ids, minlength=self.n_x * self.n_y)
+        self.cell_start = np.concatenate(([0], np.cumsum(counts)))
+
+    def find_pairs(self, radius=None):
+        """
+        Returns all pairs of points within a radius. Every pair is returned once.
+        ----------
+
+        Args:
+        radius (float):
+            The maximum distance of a pair, at most the cell size. Defaults to the cell size.
+        ----------
+
+        Returns:
+        tuple:
+            Two index arrays i and j of the same length with i != j.
+        """
+        radius = self.cell_size if radius is None else radius
+        if len(self.order) < 2:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+        pairs_i, pairs_j = [], []
+        points = np.arange(len(self.positions))
+        for d_x, d_y in ((0, 0),) + self.half_offsets:
+            neighbour_x, neighbour_y = self.cell_x + d_x, self.cell_y + d_y
+            valid = (neighbour_x >= 0) & (neighbour_x < self.n_x) & (neighbour_y < self.n_y)
+            neighbour_ids = neighbour_y[valid] * self.n_x + neighbour_x[valid]
+
+            starts = self.cell_start[neighbour_ids]
+            counts = self.cell_start[neighbour_ids + 1] - starts
+            total = counts.sum()
+            if total == 0:
+                continue
+
+            idx_i = np.repeat(points[valid], counts)
+            first = np.repeat(np.cumsum(counts) - counts, counts)
+            idx_j = self.order[np.repeat(starts, counts) + np.arange(total) - first]
+
+            if d_x == 0 and d_y == 0:
+                keep = idx_i < idx_j
+                idx_i, idx_j = idx_i[keep], idx_j[keep]
+            pairs_i.append(idx_i)
+            pairs_j.append(idx_j)
+
+        if not pairs_i:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+        idx_i, idx_j = np.concatenate(pairs_i), np.concatenate(pairs_j)
+        distance_squared = ((self.positions[idx_i] - self.positions[idx_j]) ** 2).sum(axis=1)
+        close = distance_squared <= radius ** 2
+        return idx_i[close], idx_j[close]
@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+from resources.aco import EdgePheromone, TSPSolver, ShortestPathSolver, euclidean_distances, nearest_neighbour_length
+
+
+def test_edge_pheromone():
+    pheromone = EdgePheromone(3, initial_value=1.0, reducing_factor=0.5)
+    pheromone.leave_pheromone(np.array([0, 0]), np.array([1, 1]), 2.0)
+    assert pheromone.pheromone_array[0, 1] == 5.0
+    assert pheromone.pheromone_array[1, 0] == 5.0
+
+    pheromone.max_value = 2.0
+    pheromone.min_value = 0.6
+    pheromone.reduce_pheromones()
+    assert pheromone.pheromone_array[0, 1] == 2.0
+    assert pheromone.pheromone_array[0, 2] == 0.6
+
+
+@pytest.mark.parametrize("variant", ["as", "mmas"])
+def test_tsp_solver_circle(variant):
+    angles = np.linspace(0, 2 * np.pi, 10, endpoint=False)
+    distances = euclidean_distances(np.column_stack((np.cos(angles), np.sin(angles))))
+    solver = TSPSolver(distances, variant=variant, seed=1)
+
+    tours, lengths = solver.construct_paths()
+    assert tours.shape == (10, 11)
+    assert all(sorted(tour[:-1]) == list(range(10)) for tour in tours.tolist())
+    assert np.all(tours[:, 0] == tours[:, -1])
+
+    tour, length = solver.solve(30)
+    assert length == pytest.approx(20 * np.sin(np.pi / 10))
+    assert length <= nearest_neighbour_length(distances) + 1e-9
+    assert solver.history == sorted(solver.history, reverse=True)
+
+
+def test_shortest_path_solver():
+    distances = np.full((6, 6), np.inf)
+    for start, end, length in [(0, 1, 1), (1, 2, 1), (2, 5, 1), (0, 3, 1), (3, 4, 5), (4, 5, 1), (0, 5, 10)]:
+        distances[start, end] = distances[end, start] = length
+
+    path, length = ShortestPathSolver(distances, source=0, target=5, seed=0).solve(20)
+    assert path.tolist() == [0, 1, 2, 5]
+    assert length == 3.0
+
+
+if __name__ == "__main__":
+    test_edge_pheromone()
+    for variant in ["as", "mmas"]:
+        test_tsp_solver_circle(variant)
+    test_shortest_path_solver()
@@ -0,0 +1,89 @@
+import pytest
+import numpy as np
+import tempfile
+from pathlib import Path
+from resources.checkpoint import load_checkpoint, save_checkpoint
+from resources.colony import Colony
+from resources.food import Food
+from resources.interaction import AntInteraction
+from resources.obstacle import Obstacle
+from resources.pheromone import Pheromone
+from resources.simulation import Simulation
+
+
+@pytest.mark.parametrize("precision", ["double", "compact"])
+def test_checkpoint_round_trip(tmp_path, precision):
+    np.random.seed(3)
+    simulation = Simulation()
+    simulation.bounds = (0, 720, -480, 0)
+    simulation.set_precision(precision)
+    simulation.add_obstacle(Obstacle(coordinates=(400, -300), size=(60, 40), rotation=30))
+    simulation.add_colony(Colony(grid_pheromone_shape=(96, 144), amount=30, size=(100, 100), coordinates=(300, -250), color=(1, 0, 0, 1)))
+    simulation.add_food(Food(size=(100, 100), coordinates=(500, -150), amount_of_food=1000, move_after_number_of_epochs=15, move_randomly=True))
+    for _ in range(10):
+        simulation.next_epoch()
+
+    path = tmp_path / "checkpoint.npz"
+    save_checkpoint(simulation, path)
+    pheromone = simulation.colonies[0].pheromone.storage.copy()
+    for _ in range(10):
+        simulation.next_epoch()
+
+    # restoring also restores the random generator, so the restored run repeats the last 10 epochs
+    restored = load_checkpoint(path)
+    assert restored.epoch == 10
+    assert restored.precision.name == precision
+    assert restored.obstacles[0].is_polygon()
+    np.testing.assert_array_equal(restored.colonies[0].pheromone.storage, pheromone)
+
+    for _ in range(10):
+        restored.next_epoch()
+    np.testing.assert_allclose(restored.colonies[0].get_ant_positions(), simulation.colonies[0].get_ant_positions())
+    np.testing.assert_array_equal(restored.colonies[0].pheromone.storage, simulation.colonies[0].pheromone.storage)
+    assert restored.food[0].coordinates == simulation.food[0].coordinates
+
+
+def test_checkpoint_keeps_settings(tmp_path):
+    np.random.seed(5)
+    simulation = Simulation()
+    simulation.bounds = (0, 720, -480, 0)
+    simulation.sensing_model = "gradient"
+    simulation.use_flow_field = True
+    simulation.flow_field_cell_size = 20
+    simulation.interaction = AntInteraction(radius=8, repulsion=0.3, communication=0.5)
+    simulation.shared_pheromone = True
+    simulation.extra_pheromone_channels = (0.2,)
+    simulation.add_obstacle(Obstacle(coordinates=(400, -300), size=(60, 40)))
+    for coordinates in ((100, -250), (500, -250)):
+        colony = Colony(grid_pheromone_shape=(48, 72), amount=20, size=(100, 100), coordinates=coordinates, color=(1, 0, 0, 1))
+        colony.pheromone = Pheromone(grid_shape=(48, 72), multi_resolution=True, near_field_radius=2)
+        simulation.add_colony(colony)
+    # food next to the first nest, so ants carry food home and use the flow field before the checkpoint
+    simulation.add_food(Food(size=(100, 100), coordinates=(120, -230), amount_of_food=1000, show_life_bar=False))
+    for _ in range(10):
+        simulation.next_epoch()
+
+    path = tmp_path / "checkpoint.npz"
+    save_checkpoint(simulation, path)
+    simulation.next_epoch()
+
+    restored = load_checkpoint(path)
+    assert restored.sensing_model == "gradient"
+    assert restored.use_flow_field and restored.flow_field_cell_size == 20
+    assert (restored.interaction.radius, restored.interaction.repulsion, restored.interaction.communication) == (8, 0.3, 0.5)
+    assert restored.food[0].show_life_bar is False
+    for colony in restored.colonies:
+        assert colony.pheromone.multi_resolution and colony.pheromone.near_field_radius == 2
+
+    # the restored random generator repeats the epoch after the checkpoint
+    restored.next_epoch()
+    for colony, restored_colony in zip(simulation.colonies, restored.colonies):
+        np.testing.assert_allclose(restored_colony.get_ant_positions(), colony.get_ant_positions())
+        np.testing.assert_array_equal(restored_colony.pheromone.storage, colony.pheromone.storage)
+    np.testing.assert_array_equal(restored.pheromone_field.values, simulation.pheromone_field.values)
+
+
+if __name__ == "__main__":
+    for precision in ["double", "compact"]:
+        test_checkpoint_round_trip(Path(tempfile.mkdtemp()), precision)
+    test_checkpoint_keeps_settings(Path(tempfile.mkdtemp()))
@@ -15,5 +15,81 @@ def test_add_ants():
         assert ant.step_size == step_size
         assert ant.coordinates == (colony.coordinates[0] + 50, colony.coordinates[1] + 50)
 
+def test_get_ant_positions():
+    colony = Colony(grid_pheromone_shape=(10, 10), amount=3, size=(100, 100), coordinates=(100.0, 100.0), color=(1, 1, 1, 1))
+    colony.ants[1].coordinates = (20.0, -30.0)
+    positions = colony.get_ant_positions()
+    assert positions.shape == (3, 2)
+    assert np.array_equal(positions[1], [20.0, -30.0])
+
+    colony.ants = []
+    assert colony.get_ant_positions().shape == (0, 2)
+
+def test_update_population():
+    colony = Colony(grid_pheromone_shape=(10, 10), amount=4, size=(100, 100), coordinates=(100.0, 100.0), color=(1, 1, 1, 1))
+    ants = list(colony.ants)
+    colony.lifespan = 3
+    colony.birth_cost = 2
+    colony.max_population = 6
+
+    ants[3].coordinates = (0.0, 0.0)
+    colony.food_counter = 5
+    assert colony.update_population() == (2, 0)
+    assert colony.food_counter == 1
+    assert len(colony.ants) == 6
+
+    colony.food_counter = 0
+    colony.update_population()
+    assert colony.update_population() == (0, 4)
+    assert len(colony.ants) == 2 and colony.amount == 2
+
+    colony.lifespan = None
+    colony.food_counter = 4
+    colony.update_population()
+    assert len(colony.ants) == 4
+    assert colony.pool.capacity == 8
+    assert sum(ant in ants for ant in colony.ants) == 2
+    assert ants[3] in colony.ants and ants[3].coordinates == (150.0, 150.0)
+
+def test_reconfigure():
+    colony = Colony(grid_pheromone_shape=(10, 10), amount=10, size=(100, 100), coordinates=(0, 0), color=(1, 0, 0, 1))
+    colony.pool.age[:5] = 10
+    moved = colony.ants[0]
+    moved.coordinates = (300, -200)
+    colony.pheromone.leave_pheromone((2, 2), 1)
+
+    colony.reconfigure(amount=5, color=(0, 0, 1, 1), step_size=7, reducing_factor=0.5)
+    assert len(colony.ants) == 5
+    assert colony.amount == 5
+    # the youngest ants are removed, the others keep their state
+    assert colony.ants[0] is moved and moved.coordinates == (300, -200)
+    assert all(ant.step_size == 7 for ant in colony.ants)
+    assert colony.color == (0, 0, 1, 1)
+    assert colony.pheromone.reducing_factor == 0.5
+    assert colony.pheromone.pheromone_array[1, 2, 2] == 1
+
+    colony.reconfigure(amount=8, grid_pheromone_shape=(5, 5))
+    assert len(colony.ants) == 8
+    assert colony.ants[-1].step_size == 7
+    assert colony.pheromone.pheromone_array.shape == (2, 5, 5)
+    assert colony.pheromone.pheromone_array[1, 1, 1] == 0.25
+
+    with pytest.raises(TypeError):
+        colony.reconfigure(speed=3)
+
+def test_kill_ant():
+    colony = Colony(grid_pheromone_shape=(10, 10), amount=4, size=(100, 100), coordinates=(0, 0), color=(1, 0, 0, 1))
+    with pytest.raises(AttributeError):
+        colony.ants.append(colony.ants[0])
+
+    colony.kill_ant(colony.ants[1])
+    assert len(colony.ants) == colony.amount == 3
+    colony.spawn_ant()
+    assert len(colony.ants) == colony.amount == 4
+
 if __name__ == "__main__":
     test_add_ants()
+    test_get_ant_positions()
+    test_update_population()
+    test_reconfigure()
+    test_kill_ant()
@@ -0,0 +1,51 @@
+import numpy as np
+from resources.obstacle import Obstacle
+from resources.occupancy import OccupancyGrid
+from resources.flowfield import FlowField
+from resources.simulation import Simulation
+from resources.colony import Colony
+
+
+def test_flow_field_leads_around_wall():
+    bounds = (0, 200, -200, 0)
+    wall = Obstacle(coordinates=(90, -170), size=(20, 170))
+    grid = OccupancyGrid.from_obstacles(bounds, [wall], cell_size=10)
+    flow_field = FlowField(grid, target=(40, -100), target_radius=15)
+
+    assert flow_field.distance[grid.world_to_cell(40, -100)] == 0
+    assert np.isinf(flow_field.distance[grid.blocked]).all()
+
+    row, col = grid.world_to_cell(160, -100)
+    for _ in range(100):
+        d_x, d_y = np.sign(np.round(flow_field.directions[row, col], 3)).astype(int)
+        if d_x == 0 and d_y == 0:
+            break
+        row, col = row - d_y, col + d_x
+        assert not grid.blocked[row, col]
+    assert flow_field.distance[row, col] == 0
+
+
+def test_simulation_caches_flow_field():
+    sim = Simulation()
+    sim.bounds = (0, 200, -200, 0)
+    sim.use_flow_field = True
+    colony = Colony(grid_pheromone_shape=(10, 10), amount=3, size=(100, 100), coordinates=(0, -100), color=(0, 0, 0, 1))
+    sim.add_colony(colony)
+
+    flow_field = sim.get_flow_field(colony)
+    assert sim.get_flow_field(colony) is flow_field
+
+    sim.add_obstacle(Obstacle(coordinates=(150, -50), size=(20, 20)))
+    assert sim.get_flow_field(colony) is not flow_field
+
+    for ant in colony.ants:
+        ant.pheromone_status = 1
+        ant.coordinates = (180.0, -150.0)
+    sim.next_epoch()
+    for ant in colony.ants:
+        assert ant.coordinates[0] < 180
+
+
+if __name__ == "__main__":
+    test_flow_field_leads_around_wall()
+    test_simulation_caches_flow_field()
@@ -0,0 +1,31 @@
+from resources.obstacle import Obstacle
+from resources.occupancy import OccupancyGrid
+from resources.freespace import FreeSpaceMap
+
+
+def test_clearance_and_is_free():
+    grid = OccupancyGrid.from_obstacles((0, 50, -50, 0), [Obstacle(coordinates=(20, -30), size=(10, 10))], cell_size=5)
+    free_space = FreeSpaceMap(grid)
+
+    assert free_space.clearance[0, 0] == 4
+    assert free_space.clearance[4, 4] == 0
+    assert free_space.clearance[6, 0] == 4
+    assert free_space.clearance[0, 6] == 4
+
+    assert free_space.is_free((0, -20), (20, 20))
+    assert not free_space.is_free((15, -35), (10, 10))
+
+
+def test_find_nearest_position():
+    grid = OccupancyGrid.from_obstacles((0, 100, -100, 0), [Obstacle(coordinates=(0, -100), size=(60, 100))], cell_size=5)
+    free_space = FreeSpaceMap(grid)
+
+    x, y = free_space.find_nearest_position((20, -60), (30, 30))
+    assert (x, y) == (60, -60)
+    assert free_space.is_free((x, y), (30, 30))
+    assert free_space.find_nearest_position((20, -60), (50, 50)) is None
+
+
+if __name__ == "__main__":
+    test_clearance_and_is_free()
+    test_find_nearest_position()
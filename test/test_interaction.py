@@ -0,0 +1,86 @@
+import numpy as np
+from resources.simulation import Simulation
+from resources.colony import Colony
+from resources.interaction import AntInteraction
+from resources.spatial import CellList
+
+
+def test_cell_list_finds_all_pairs():
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(0, 100, (300, 2))
+    cell_list = CellList(cell_size=8)
+    cell_list.build(positions)
+    idx_i, idx_j = cell_list.find_pairs()
+
+    found = set(zip(np.minimum(idx_i, idx_j).tolist(), np.maximum(idx_i, idx_j).tolist()))
+    distance = np.linalg.norm(positions[:, None] - positions[None], axis=2)
+    expected = {(i, j) for i in range(300) for j in range(i + 1, 300) if distance[i, j] <= 8}
+    assert found == expected
+    assert len(found) == len(idx_i)
+
+
+def create_simulation(amount):
+    sim = Simulation()
+    sim.bounds = (0, 720, -480, 0)
+    sim.add_colony(Colony(grid_pheromone_shape=(10, 10), amount=amount, size=(100, 100), coordinates=(300, -300), color=(0, 0, 0, 1)))
+    return sim
+
+
+def test_crowding_pushes_ants_apart():
+    sim = create_simulation(20)
+    interaction = AntInteraction(radius=5, repulsion=1)
+    assert interaction.apply(sim) == 20 * 19 / 2
+
+    positions = sim.colonies[0].get_ant_positions()
+    assert len(np.unique(positions, axis=0)) == 20
+
+    sim.interaction = interaction
+    sim.next_epoch()
+    assert sim.epoch == 1
+
+
+def test_communication_turns_searching_ants():
+    sim = create_simulation(2)
+    searcher, carrier = sim.colonies[0].ants
+    carrier.pheromone_status = 1
+    carrier.direction = np.array([3.0, 0.0])
+    searcher.direction = np.array([0.0, 3.0])
+
+    AntInteraction(radius=5, repulsion=0, communication=1).apply(sim)
+    assert searcher.direction[0] < 0
+    assert np.isclose(np.linalg.norm(searcher.direction), searcher.step_size)
+    assert np.array_equal(carrier.direction, [3.0, 0.0])
+
+
+def test_coincident_ants_are_grouped():
+    sim = create_simulation(5000)
+    interaction = AntInteraction(radius=5, repulsion=1)
+    # every pair of the ants born on one point interacts, but the cell list only holds that point
+    assert interaction.apply(sim) == 5000 * 4999 // 2
+    assert len(interaction.cell_list.positions) == 1
+
+    positions = sim.colonies[0].get_ant_positions()
+    assert len(np.unique(positions, axis=0)) == 5000
+    cell_list = CellList(cell_size=5)
+    cell_list.build(positions)
+    assert len(cell_list.find_pairs()[0]) < 5000 * 5
+
+
+def test_grouped_pairs_match_all_pairs():
+    rng = np.random.default_rng(1)
+    sim = create_simulation(60)
+    positions = rng.uniform(300, 330, (20, 2))[rng.integers(20, size=60)]
+    for ant, position in zip(sim.colonies[0].ants, positions):
+        ant.coordinates = tuple(position)
+
+    distance = np.linalg.norm(positions[:, None] - positions[None], axis=2)
+    expected = sum(distance[i, j] <= 5 for i in range(60) for j in range(i + 1, 60))
+    assert AntInteraction(radius=5, repulsion=0, communication=1).apply(sim) == expected
+
+
+if __name__ == "__main__":
+    test_cell_list_finds_all_pairs()
+    test_crowding_pushes_ants_apart()
+    test_communication_turns_searching_ants()
+    test_coincident_ants_are_grouped()
+    test_grouped_pairs_match_all_pairs()
@@ -0,0 +1,93 @@
+import pytest
+import gc
+import tracemalloc
+from resources.ant import Ant
+from resources.colony import Colony
+from resources.food import Food
+from resources.memory import BYTES_PER_ANT, estimate_memory, fit_to_memory_budget, get_memory_report
+from resources.obstacle import Obstacle
+from resources.simulation import Simulation
+
+
+def scenario(amount=1000, grid=(100, 100)):
+    return {"simulation": [{"boundaries": [0, 720, -480, 0]}],
+            "colonies": [{"coordinates": [100, -250], "amount": amount, "pheromone grid": list(grid)}],
+            "food": [{"coordinates": [500, -150]}],
+            "obstacles": [{"coordinates": [300, -300], "size": [50, 50]}]}
+
+
+def test_entities_have_slots():
+    for entity in (Ant((0, 0), 1), Food((100, 100), (0, 0), 10), Obstacle((0, 0)),
+                   Colony(grid_pheromone_shape=(2, 2), amount=1, size=(100, 100), coordinates=(0, 0), color=(1, 0, 0, 1))):
+        assert not hasattr(entity, "__dict__")
+
+
+def test_bytes_per_ant():
+    sim = Simulation()
+    sim.bounds = (0, 720, -480, 0)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        sim.add_colony(Colony(grid_pheromone_shape=(1, 1), amount=5000, size=(100, 100), coordinates=(300, -250), color=(1, 0, 0, 1)))
+        sim.next_epoch()
+        sim.next_epoch()
+        gc.collect()
+        traced, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert traced / 5000 < BYTES_PER_ANT
+    report = get_memory_report(sim)
+    assert report["colonies"][0]["total"] / 5000 == pytest.approx(traced / 5000, rel=0.5)
+
+
+def test_memory_report():
+    sim = Simulation()
+    sim.bounds = (0, 720, -480, 0)
+    sim.add_obstacle(Obstacle(coordinates=(300, -300)))
+    for x in (100, 500):
+        sim.add_colony(Colony(grid_pheromone_shape=(100, 100), amount=10, size=(100, 100), coordinates=(x, -250), color=(1, 0, 0, 1)))
+    sim.add_food(Food(size=(100, 100), coordinates=(300, -150), amount_of_food=100))
+    sim.next_epoch()
+
+    report = get_memory_report(sim)
+    assert report["colonies"][0]["pheromone"] == 2 * 100 * 100 * 8
+    assert report["caches"]["occupancy"] > 0
+    assert report["food"] > 0 and report["obstacles"] > 0
+
+    # pheromone grids that are views into the shared field are counted once, with the field
+    sim.shared_pheromone = True
+    sim.next_epoch()
+    report = get_memory_report(sim)
+    assert report["colonies"][0]["pheromone"] == 0
+    assert report["caches"]["pheromone field"] == 2 * 2 * 100 * 100 * 8
+
+
+def test_estimate_memory():
+    estimate = estimate_memory(scenario())
+    assert estimate["colonies"][0]["ants"] == 1000 * BYTES_PER_ANT
+    assert estimate["colonies"][0]["pheromone"] == 2 * 100 * 100 * 8
+    assert estimate_memory(scenario(), "compact")["colonies"][0]["pheromone"] == 2 * 100 * 100 * (2 + 4)
+
+
+def test_fit_to_memory_budget():
+    data = scenario(grid=(400, 400))
+    assert fit_to_memory_budget(data, 10 ** 9) is data
+
+    fitted = fit_to_memory_budget(data, 2 * 10 ** 6)
+    assert fitted["colonies"][0]["pheromone grid"] == [200, 200]
+    assert data["colonies"][0]["pheromone grid"] == [400, 400]
+    assert estimate_memory(fitted)["total"] <= 2 * 10 ** 6
+
+    with pytest.raises(ValueError):
+        fit_to_memory_budget(data, 2 * 10 ** 6, downsample=False)
+    with pytest.raises(ValueError):
+        fit_to_memory_budget(scenario(amount=10 ** 6), 2 * 10 ** 6)
+
+
+if __name__ == "__main__":
+    test_entities_have_slots()
+    test_bytes_per_ant()
+    test_memory_report()
+    test_estimate_memory()
+    test_fit_to_memory_budget()
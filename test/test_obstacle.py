@@ -0,0 +1,39 @@
+import pytest
+import numpy as np
+from resources.obstacle import Obstacle
+
+
+def test_box_obstacle():
+    obstacle = Obstacle(coordinates=(10, 20))
+    assert not obstacle.is_polygon()
+    assert obstacle.get_vertices().tolist() == [[10, 20], [60, 20], [60, 70], [10, 70]]
+    assert obstacle.contains(np.array([30, 70]), np.array([40, 40])).tolist() == [True, False]
+
+
+def test_polygon_obstacle():
+    concave = [(0, 0), (40, 0), (40, 40), (20, 10), (0, 40)]
+    obstacle = Obstacle(coordinates=None, vertices=concave)
+    assert obstacle.is_polygon()
+    assert obstacle.coordinates == (0, 0) and obstacle.size == (40, 40)
+    assert obstacle.contains(5, 5)
+    assert not obstacle.contains(20, 30)
+
+    obstacle.coordinates = (100, 100)
+    assert obstacle.contains(105, 105)
+
+    with pytest.raises(ValueError):
+        Obstacle(coordinates=None, vertices=[(0, 0), (1, 1)])
+
+
+def test_rotated_obstacle():
+    obstacle = Obstacle(coordinates=(0, 0), size=(100, 10), rotation=90)
+    assert obstacle.is_polygon()
+    assert np.allclose(obstacle.coordinates, (45, -45))
+    assert np.allclose(obstacle.size, (10, 100))
+    assert obstacle.contains(50, 40) and not obstacle.contains(80, 5)
+
+
+if __name__ == "__main__":
+    test_box_obstacle()
+    test_polygon_obstacle()
+    test_rotated_obstacle()
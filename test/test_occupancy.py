@@ -0,0 +1,64 @@
+import pytest
+import numpy as np
+from resources.obstacle import Obstacle
+from resources.occupancy import OccupancyGrid
+
+
+def test_rasterize_obstacle():
+    grid = OccupancyGrid.from_obstacles((0, 100, -100, 0), [Obstacle(coordinates=(20, -50), size=(30, 20))], cell_size=10)
+
+    assert grid.blocked.shape == (10, 10)
+    assert grid.blocked.sum() == 6
+    assert grid.is_blocked(25, -45)
+    assert not grid.is_blocked(55, -45)
+    assert not grid.is_blocked(25, -25)
+
+
+def test_world_to_cell_and_back():
+    grid = OccupancyGrid((0, 100, -50, 0), cell_size=10)
+    rows, cols = grid.world_to_cell(np.array([5.0, 99.0, -10.0]), np.array([-5.0, -49.0, 10.0]))
+    assert rows.tolist() == [0, 4, 0]
+    assert cols.tolist() == [0, 9, 0]
+
+    x, y = grid.cell_to_world(rows, cols)
+    assert np.allclose(x, [5, 95, 5])
+    assert np.allclose(y, [-5, -45, -5])
+
+
+def test_rasterize_polygon_and_normals():
+    triangle = Obstacle(coordinates=None, vertices=[(20, -80), (80, -80), (20, -20)])
+    grid = OccupancyGrid.from_obstacles((0, 100, -100, 0), [triangle], cell_size=5)
+
+    assert grid.is_blocked(30, -70)
+    assert not grid.is_blocked(70, -30)
+    assert not grid.is_blocked(10, -50)
+
+    normals = grid.get_normals()
+    assert np.allclose(grid.normal_at(20, -50), [-1, 0])
+    assert np.allclose(grid.normal_at(50, -80), [0, -1])
+    hypotenuse = grid.normal_at(50, -50)
+    assert hypotenuse[0] > 0 and hypotenuse[1] > 0
+    assert not normals[~grid.blocked].any()
+
+    x, y = grid.find_nearest_free(22, -50)
+    assert not grid.is_blocked(x, y) and x < 22
+
+
+def test_trace_segments():
+    grid = OccupancyGrid.from_obstacles((0, 100, -100, 0), [Obstacle(coordinates=(50, -100), size=(5, 100))], cell_size=5)
+    starts = np.array([[10.0, -50.0], [10.0, -50.0], [80.0, -10.0], [52.0, -52.0]])
+    ends = np.array([[90.0, -50.0], [40.0, -90.0], [60.0, -90.0], [52.0, -60.0]])
+    hit, t_hit, rows, cols, faces = grid.trace_segments(starts, ends)
+
+    assert hit.tolist() == [True, False, False, True]
+    assert t_hit[0] == pytest.approx(0.5)
+    assert cols[0] == 10 and rows[0] == 10
+    assert faces[0].tolist() == [-1, 0]
+    assert t_hit[3] == 0 and faces[3].tolist() == [0, 0]
+
+
+if __name__ == "__main__":
+    test_rasterize_obstacle()
+    test_world_to_cell_and_back()
+    test_rasterize_polygon_and_normals()
+    test_trace_segments()
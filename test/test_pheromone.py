@@ -1,6 +1,7 @@
 import pytest
 import numpy as np
-from resources.pheromone import Pheromone
+from resources.colony import Colony
+from resources.pheromone import Pheromone, PheromoneField
 
 
 def test_initialization():
@@ -59,5 +60,145 @@ def test_reduce_pheromones():
     # The final values should be exactly 0 after the reduction
     assert pheromone.pheromone_array[1, pos[1], pos[0]] == 0
     assert pheromone.pheromone_array[0, pos[1], pos[0]] == 0
-    
-    
\ No newline at end of file
+
+
+def test_count_active_cells():
+    pheromone = Pheromone((10, 10))
+    assert pheromone.count_active_cells() == 0
+
+    pheromone.leave_pheromone((2, 3), 1)
+    pheromone.leave_pheromone((2, 3), -1)
+    pheromone.leave_pheromone((4, 4), 1)
+    assert pheromone.count_active_cells() == 3
+
+
+def test_pyramid_stays_consistent():
+    pheromone = Pheromone((13, 10), reducing_factor=0.5, multi_resolution=True)
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        pheromone.leave_pheromone((rng.integers(13), rng.integers(10)), rng.choice([-1, 1]))
+        if rng.random() < 0.1:
+            pheromone.reduce_pheromones()
+
+    incremental = [[level.copy() for level in levels] for levels in pheromone.pyramid]
+    pheromone.build_pyramid()
+    for levels, expected_levels in zip(incremental, pheromone.pyramid):
+        assert len(levels) == len(expected_levels)
+        for level, expected in zip(levels, expected_levels):
+            assert np.allclose(level, expected)
+
+
+def test_quantized_pyramid_stays_consistent():
+    pheromone = Pheromone((13, 10), reducing_factor=0.5, multi_resolution=True, dtype=np.uint16)
+    decoded, pyramid = pheromone.pheromone_array, pheromone.pyramid
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        pheromone.leave_pheromone((rng.integers(13), rng.integers(10)), rng.choice([-1, 1]))
+        if rng.random() < 0.1:
+            pheromone.reduce_pheromones()
+        pheromone.find_strongest_cell(0, 6, 5, 8)
+
+    # updated in place, never rebuilt
+    assert pheromone.pheromone_array is decoded and pheromone.pyramid is pyramid
+    assert np.array_equal(decoded, pheromone.decode(pheromone.storage))
+    incremental = [[level.copy() for level in levels] for levels in pheromone.pyramid]
+    pheromone.build_pyramid()
+    for levels, expected_levels in zip(incremental, pheromone.pyramid):
+        for level, expected in zip(levels, expected_levels):
+            assert np.array_equal(level, expected)
+
+
+def test_find_strongest_cell():
+    pheromone = Pheromone((64, 64), multi_resolution=True, near_field_radius=2)
+    pheromone.leave_pheromone((40, 50), -1)
+    pheromone.leave_pheromone((40, 50), -1)
+    pheromone.leave_pheromone((30, 30), -1)
+
+    assert pheromone.find_strongest_cell(0, 32, 32, 1) is None
+    assert pheromone.find_strongest_cell(0, 32, 32, 3) == (30, 30)
+    assert pheromone.find_strongest_cell(0, 32, 32, 20) == (40, 50)
+    assert pheromone.find_strongest_cell(1, 32, 32, 20) is None
+
+
+def test_quantized_storage():
+    pheromone = Pheromone((10, 10), reducing_factor=0.5, dtype=np.uint16, scale=1/256)
+    pheromone.leave_pheromone((5, 5), 1)
+    pheromone.leave_pheromone((5, 5), 1)
+    pheromone.leave_pheromone((2, 3), -1)
+
+    assert pheromone.storage.dtype == np.uint16
+    assert pheromone.storage[1, 5, 5] == 512
+    assert pheromone.pheromone_array[1, 5, 5] == 2
+    assert pheromone.pheromone_array[0, 2, 3] == -1
+
+    pheromone.reduce_pheromones()
+    assert pheromone.pheromone_array[1, 5, 5] == pytest.approx(1.0)
+    assert pheromone.pheromone_array[0, 2, 3] == pytest.approx(-0.5)
+
+
+def test_set_dtype():
+    pheromone = Pheromone((100, 100))
+    pheromone.leave_pheromone((5, 5), 1)
+    pheromone.leave_pheromone((7, 5), -1)
+    double_bytes = pheromone.storage.nbytes
+
+    pheromone.set_dtype(np.float32)
+    assert pheromone.storage.nbytes == double_bytes // 2
+    pheromone.set_dtype(np.uint16)
+    assert pheromone.storage.nbytes == double_bytes // 4
+    assert pheromone.pheromone_array[1, 5, 5] == 1
+    assert pheromone.pheromone_array[0, 7, 5] == -1
+
+
+def test_pheromone_field():
+    colonies = [Colony(grid_pheromone_shape=(10, 10), amount=0, size=(100, 100), coordinates=(0, -100), color=(1, 0, 0, 1)) for _ in range(2)]
+    colonies[0].pheromone.reducing_factor = 0.5
+    colonies[0].pheromone.leave_pheromone((2, 3), 1)
+    field = PheromoneField(colonies, extra_channels=(0.25,))
+
+    assert field.values.shape == (2, 3, 10, 10)
+    assert field.values[0, 1, 2, 3] == 1
+    assert field.is_attached(colonies)
+
+    # the colony grids are views into the field
+    colonies[1].pheromone.leave_pheromone((2, 3), -1)
+    field.leave_pheromone(1, 2, np.array([4, 4]), np.array([4, 4]), 1.0)
+    assert field.values[1, 0, 2, 3] == -1
+    assert field.values[1, 2, 4, 4] == 2
+
+    field.reduce_pheromones()
+    assert colonies[0].pheromone.pheromone_array[1, 2, 3] == 0.5
+    assert colonies[1].pheromone.pheromone_array[0, 2, 3] == pytest.approx(-0.09)
+    assert field.values[1, 2, 4, 4] == 0.5
+
+    colonies[1].pheromone = Pheromone((10, 10))
+    assert not field.is_attached(colonies)
+
+
+def test_foreign_trail_sensing():
+    colonies = [Colony(grid_pheromone_shape=(10, 10), amount=0, size=(100, 100), coordinates=(0, -100), color=(1, 0, 0, 1)) for _ in range(2)]
+    colonies[0].pheromone.leave_pheromone((2, 3), 1)
+    colonies[0].pheromone.leave_pheromone((5, 5), 1)
+    colonies[1].pheromone.leave_pheromone((5, 5), 1)
+    field = PheromoneField(colonies)
+
+    sensing = field.get_sensing_arrays(foreign_trail_avoidance=0.5)
+    assert sensing[0, 1, 2, 3] == 1
+    assert sensing[0, 1, 5, 5] == 0.5
+    assert sensing[1, 1, 2, 3] == 0
+
+
+def test_resample():
+    pheromone = Pheromone((4, 4))
+    pheromone.pheromone_array[1, :2, :2] = 2
+    pheromone.pheromone_array[0, 3, 3] = -1
+
+    pheromone.resample((2, 2))
+    assert pheromone.pheromone_array.shape == (2, 2, 2)
+    assert pheromone.pheromone_array[1, 0, 0] == 2
+    assert pheromone.pheromone_array[0, 1, 1] == -0.25
+
+    pheromone.resample((3, 5))
+    assert pheromone.pheromone_array.shape == (2, 3, 5)
+    # the area-weighted mean keeps the mean strength
+    assert pheromone.pheromone_array[1].mean() == pytest.approx(0.5)
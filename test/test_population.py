@@ -0,0 +1,51 @@
+import numpy as np
+from resources.population import AntPool
+
+
+def test_acquire_release_reuse():
+    pool = AntPool(capacity=2)
+    alive = pool.alive
+    first, second = pool.acquire(), pool.acquire()
+    pool.assign(first, "a")
+    pool.assign(second, "b")
+    assert pool.get_ants() == ("a", "b")
+    assert pool.alive is alive
+
+    pool.release(first)
+    assert pool.get_ants() == ("b",)
+    assert pool.get_slot("b") == second
+
+    slot = pool.acquire()
+    assert slot == first
+    assert pool.slots[slot] == "a"
+    assert pool.alive is alive
+
+
+def test_grow_geometrically():
+    pool = AntPool()
+    capacities = set()
+    for _ in range(100):
+        pool.assign(pool.acquire(), object())
+        capacities.add(pool.capacity)
+    assert len(pool) == 100
+    assert sorted(capacities) == [8, 16, 32, 64, 128]
+
+
+def test_age_and_clear():
+    pool = AntPool(capacity=4)
+    for _ in range(3):
+        pool.assign(pool.acquire(), object())
+    pool.release(1)
+    pool.age_ants()
+    pool.age_ants()
+    assert np.array_equal(pool.age, [2, 0, 2, 0])
+
+    pool.clear()
+    assert len(pool) == 0 and pool.get_ants() == ()
+    assert len(pool.free) == 4
+
+
+if __name__ == "__main__":
+    test_acquire_release_reuse()
+    test_grow_geometrically()
+    test_age_and_clear()
@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+from resources.colony import Colony
+from resources.food import Food
+from resources.precision import get_precision_policy, measure_drift
+from resources.simulation import Simulation
+
+
+def build_simulation():
+    simulation = Simulation()
+    simulation.bounds = (0, 720, -480, 0)
+    simulation.add_colony(Colony(grid_pheromone_shape=(96, 144), amount=50, size=(100, 100), coordinates=(300, -250), color=(1, 0, 0, 1)))
+    simulation.add_food(Food(size=(100, 100), coordinates=(500, -150), amount_of_food=1000))
+    return simulation
+
+
+def test_get_precision_policy():
+    assert get_precision_policy("double").pheromone_dtype == np.float64
+    assert get_precision_policy("compact").pheromone_dtype == np.uint16
+    with pytest.raises(ValueError):
+        get_precision_policy("half")
+
+
+def test_set_precision():
+    simulation = build_simulation()
+    simulation.set_precision("compact")
+    simulation.add_colony(Colony(grid_pheromone_shape=(96, 144), amount=5, size=(100, 100), coordinates=(100, -250), color=(0, 0, 1, 1)))
+    for colony in simulation.colonies:
+        assert colony.pheromone.storage.dtype == np.uint16
+
+    simulation.next_epoch()
+    assert simulation.colonies[0].pheromone.count_active_cells() > 0
+
+
+def test_measure_drift():
+    drift = measure_drift(build_simulation, "single", epochs=20)
+
+    assert len(drift) == 20
+    assert drift[0]["max position error"] < 1e-3
+    assert drift[-1]["relative pheromone error"] < 1e-3
+
+
+if __name__ == "__main__":
+    test_get_precision_policy()
+    test_set_precision()
+    test_measure_drift()
@@ -0,0 +1,71 @@
+import json
+import time
+import tempfile
+from pathlib import Path
+from resources.colony import Colony
+from resources.food import Food
+from resources.profiler import NULL_PHASE, PhaseProfiler
+from resources.simulation import Simulation
+
+
+def test_disabled_profiler():
+    profiler = PhaseProfiler()
+    assert profiler.phase("sensing") is NULL_PHASE
+    with profiler.phase("sensing"):
+        pass
+    profiler.end_epoch()
+    assert profiler.get_summary() == {}
+
+
+def test_phases():
+    profiler = PhaseProfiler(enabled=True)
+    for _ in range(3):
+        with profiler.phase("epoch"):
+            with profiler.phase("sensing"):
+                time.sleep(0.001)
+            with profiler.phase("sensing"):
+                time.sleep(0.001)
+        profiler.end_epoch()
+
+    summary = profiler.get_summary()
+    assert set(summary) == {"epoch", "epoch/sensing"}
+    assert summary["epoch/sensing"]["count"] == 3
+    # both runs of a phase are summed up per epoch
+    assert summary["epoch/sensing"]["p50_ms"] >= 2
+    assert summary["epoch"]["max_ms"] >= summary["epoch/sensing"]["max_ms"]
+
+
+def test_to_json(tmp_path):
+    profiler = PhaseProfiler(enabled=True)
+    with profiler.phase("io"):
+        pass
+    profiler.end_epoch()
+
+    path = tmp_path / "profile.json"
+    text = profiler.to_json(path)
+    assert json.loads(path.read_text()) == json.loads(text)
+    assert set(json.loads(text)["io"]) == {"count", "mean_ms", "p50_ms", "p95_ms", "max_ms"}
+
+    profiler.reset()
+    assert profiler.get_summary() == {}
+
+
+def test_simulation_phases():
+    sim = Simulation()
+    sim.bounds = (0, 720, -480, 0)
+    sim.add_colony(Colony(grid_pheromone_shape=(48, 72), amount=20, size=(100, 100), coordinates=(100, -250), color=(1, 0, 0, 1)))
+    sim.add_food(Food(size=(100, 100), coordinates=(300, -150), amount_of_food=1000))
+    sim.profiler.enabled = True
+    for _ in range(5):
+        sim.next_epoch()
+
+    summary = sim.profiler.get_summary()
+    for phase in ("sensing", "movement", "collision", "deposition", "evaporation"):
+        assert summary[f"epoch/{phase}"]["count"] == 5
+
+
+if __name__ == "__main__":
+    test_disabled_profiler()
+    test_phases()
+    test_to_json(Path(tempfile.mkdtemp()))
+    test_simulation_phases()
@@ -0,0 +1,78 @@
+import pytest
+import numpy as np
+import tempfile
+from pathlib import Path
+from resources.simulation import Simulation
+from resources.colony import Colony
+from resources.food import Food
+from resources.obstacle import Obstacle
+from resources.renderer import FrameRenderer, FrameWriter, interpolate_positions
+
+
+def create_simulation():
+    sim = Simulation()
+    sim.bounds = (0, 200, -100, 0)
+    sim.add_colony(Colony(grid_pheromone_shape=(10, 20), amount=5, size=(100, 100), coordinates=(0, -100), color=(0, 0, 1, 1)))
+    sim.add_food(Food(size=(100, 100), coordinates=(100, -100), amount_of_food=10))
+    return sim
+
+
+def test_render_frame():
+    sim = create_simulation()
+    sim.add_obstacle(Obstacle(coordinates=(150, -100), size=(50, 50)))
+    renderer = FrameRenderer(sim.bounds)
+    frame = renderer.render(sim)
+
+    assert frame.shape == (100, 200, 3)
+    assert frame.dtype == np.uint8
+    assert tuple(frame[0, 0]) == renderer.bounds_color
+    assert tuple(frame[50, 50]) == renderer.colony_color
+    assert tuple(frame[90, 190]) == renderer.obstacle_color
+
+    ant_row, ant_col = renderer.world_to_pixel(50, -50 + 5)
+    assert tuple(frame[ant_row + 1, ant_col + 1]) == (0, 0, 255)
+
+
+def test_render_scale():
+    sim = create_simulation()
+    frame = FrameRenderer(sim.bounds, scale=0.5).render(sim)
+    assert frame.shape == (50, 100, 3)
+
+
+@pytest.mark.parametrize("format", ["png", "raw"])
+def test_frame_writer(tmp_path, format):
+    sim = create_simulation()
+    renderer = FrameRenderer(sim.bounds)
+    writer = FrameWriter(str(tmp_path), renderer, every=2, format=format)
+
+    for _ in range(4):
+        sim.next_epoch()
+        writer.capture(sim)
+    writer.close()
+
+    assert writer.frame_count == 2
+    if format == "png":
+        png = (tmp_path / "frame_000002.png").read_bytes()
+        assert png.startswith(b"\x89PNG")
+        assert (tmp_path / "frame_000004.png").exists()
+    else:
+        assert (tmp_path / "frames.rgb").stat().st_size == 2 * renderer.width * renderer.height * 3
+        assert (tmp_path / "frames.json").exists()
+
+
+def test_interpolate_positions():
+    previous = np.array([[0.0, 0.0], [10.0, -10.0]])
+    current = np.array([[4.0, 2.0], [10.0, -20.0]])
+
+    assert np.allclose(interpolate_positions(previous, current, 0.5), [[2.0, 1.0], [10.0, -15.0]])
+    assert np.allclose(interpolate_positions(previous, current, 2), current)
+    assert interpolate_positions(None, current, 0.5) is current
+    assert interpolate_positions(previous[:1], current, 0.5) is current
+
+
+if __name__ == "__main__":
+    test_render_frame()
+    test_render_scale()
+    for format in ["png", "raw"]:
+        test_frame_writer(Path(tempfile.mkdtemp()), format)
+    test_interpolate_positions()
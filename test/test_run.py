@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from resources.checkpoint import load_checkpoint
+from resources.run import main
+
+scenario = {
+    "simulation": [{"boundaries": [0, 400, -400, 0]}],
+    "colonies": [{"amount": 20, "coordinates": [20, -120], "pheromone grid": [40, 40]}],
+    "food": [{"start amount": 50, "coordinates": [280, -120]}],
+    "obstacles": [{"coordinates": [300, -350]}]
+}
+
+
+def test_run(tmp_path):
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(scenario))
+    out = tmp_path / "out"
+
+    assert main([str(path), "--epochs", "6", "--seed", "1", "--out", str(out), "--checkpoint-every", "4",
+                 "--frames-every", "3", "--frame-scale", "0.25", "--profile"]) == 0
+    metrics = [json.loads(line) for line in (out / "metrics.jsonl").read_text().splitlines()]
+    assert [entry["epoch"] for entry in metrics] == [1, 2, 3, 4, 5, 6]
+    assert metrics[-1]["colonies"][0]["ants"] == 20
+    assert sorted(os.listdir(out / "frames")) == ["frame_000003.png", "frame_000006.png"]
+    assert (out / "checkpoint_000004.npz").exists() and (out / "checkpoint_000006.npz").exists()
+    assert "epoch/movement" in json.loads((out / "profile.json").read_text())
+
+    resumed = tmp_path / "resumed"
+    assert main(["--resume", str(out / "checkpoint_000006.npz"), "--epochs", "2", "--out", str(resumed)]) == 0
+    summary = json.loads((resumed / "summary.json").read_text())
+    assert summary["start epoch"] == 6
+    assert summary["final"]["epoch"] == 8
+
+
+def test_memory_budget_uses_precision(tmp_path):
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(scenario))
+
+    # the budget only fits the 40 x 40 grid with float32 pheromone
+    for precision, shape in (("double", (20, 20)), ("single", (40, 40))):
+        out = tmp_path / precision
+        assert main([str(path), "--epochs", "1", "--out", str(out), "--precision", precision, "--memory-budget", "240000"]) == 0
+        simulation = load_checkpoint(str(out / "checkpoint_000001.npz"))
+        assert simulation.colonies[0].pheromone.storage.shape[1:] == shape
+
+
+def test_run_without_gui_imports():
+    code = ("import sys, resources.run; "
+            "print(sorted({name.split('.')[0] for name in sys.modules} & {'kivy', 'kivymd', 'pandas'}))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+if __name__ == "__main__":
+    test_run(Path(tempfile.mkdtemp()))
+    test_memory_budget_uses_precision(Path(tempfile.mkdtemp()))
+    test_run_without_gui_imports()
@@ -0,0 +1,54 @@
+import pytest
+import json
+import numpy as np
+import tempfile
+from pathlib import Path
+from resources.scenario import build_simulation, load_scenario
+
+
+scenario = {
+    "simulation": [{"boundaries": [0, 400, -400, 0]}],
+    "colonies": [{"amount": 20, "coordinates": [20, -120], "pheromone grid": [40, 40], "step size": 3}],
+    "food": [{"start amount": 50, "coordinates": [280, -120]}],
+    "obstacles": [
+        {"vertices": [[150, -300], [250, -300], [200, -100]]},
+        {"coordinates": [50, -350], "size": [100, 20], "rotation": 45},
+        {"coordinates": [300, -350]}
+    ]
+}
+
+
+def test_build_simulation():
+    sim = build_simulation(scenario)
+    assert sim.bounds == (0, 400, -400, 0)
+    assert len(sim.colonies[0].ants) == 20
+    assert sim.colonies[0].ants[0].step_size == 3
+    assert sim.food[0].amount_of_food == 50
+    assert [obstacle.is_polygon() for obstacle in sim.obstacles] == [True, True, False]
+
+    occupancy = sim.get_occupancy()
+    for _ in range(50):
+        sim.next_epoch()
+        positions = sim.colonies[0].get_ant_positions()
+        assert not occupancy.is_blocked(positions[:, 0], positions[:, 1]).any()
+
+
+def test_load_scenario(tmp_path):
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(scenario))
+    sim = load_scenario(str(path))
+    assert np.allclose(sim.obstacles[0].get_vertices(), scenario["obstacles"][0]["vertices"])
+
+
+def test_memory_budget():
+    # 40 x 40 cells need 25600 bytes, the ants, food, obstacles and the collision grid about 223000
+    sim = build_simulation(scenario, memory_budget=240000)
+    assert sim.colonies[0].pheromone.pheromone_array.shape == (2, 20, 20)
+    with pytest.raises(ValueError):
+        build_simulation(scenario, memory_budget=10000)
+
+
+if __name__ == "__main__":
+    test_build_simulation()
+    test_load_scenario(Path(tempfile.mkdtemp()))
+    test_memory_budget()
@@ -0,0 +1,43 @@
+from resources.scheduler import EventScheduler
+
+
+def test_run_due_order():
+    scheduler = EventScheduler()
+    calls = []
+    scheduler.schedule(5, calls.append, "b")
+    scheduler.schedule(3, calls.append, "a")
+    scheduler.schedule(5, calls.append, "c")
+
+    assert len(scheduler) == 3
+    assert scheduler.get_next_epoch() == 3
+    assert scheduler.run_due(2) == 0
+    assert scheduler.run_due(5) == 3
+    assert calls == ["a", "b", "c"]
+    assert scheduler.get_next_epoch() is None
+
+
+def test_cancel_and_reschedule():
+    scheduler = EventScheduler()
+    calls = []
+    event = scheduler.schedule(1, calls.append, "cancelled")
+
+    def reschedule():
+        calls.append("first")
+        scheduler.schedule(2, calls.append, "second")
+
+    scheduler.schedule(1, reschedule)
+    event.cancel()
+
+    assert scheduler.run_due(1) == 1
+    assert calls == ["first"]
+    assert scheduler.run_due(3) == 1
+    assert calls == ["first", "second"]
+
+    scheduler.schedule(10, calls.append, "cleared")
+    scheduler.clear()
+    assert len(scheduler) == 0
+
+
+if __name__ == "__main__":
+    test_run_due_order()
+    test_cancel_and_reschedule()
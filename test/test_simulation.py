@@ -5,6 +5,7 @@ import json
 from resources.simulation import Simulation
 from resources.colony import Colony
 from resources.food import Food
+from resources.obstacle import Obstacle
 
 
 
@@ -43,6 +44,60 @@ def test_add_colony_and_food():
     
 
 
+def test_food_index():
+    sim = Simulation()
+    sim.bounds = (0, 720, -480, 0)
+    foods = [Food(size=(100, 100), coordinates=(x, -400), amount_of_food=1) for x in range(0, 600, 50)]
+    for food in foods:
+        sim.add_food(food)
+    assert len(sim.food_index) == len(foods)
+
+    colony = Colony(grid_pheromone_shape=(10, 10), amount=1, size=(100, 100), coordinates=(0, 0), color=(0, 0, 0, 1))
+    sim.add_colony(colony)
+    colony.ants[0].coordinates = (300 + 45, -400 + 45)
+    sim.next_epoch()
+
+    assert colony.ants[0].ant_carries == 1
+    assert foods[6].amount_of_food == 0
+    assert foods[6] not in sim.food_index
+    assert len(sim.food_index) == len(foods) - 1
+
+    sim.remove_food(foods[0])
+    assert foods[0] not in sim.food and foods[0] not in sim.food_index
+
+    foods[6].amount_of_food = 1
+    sim.update_food(foods[6])
+    assert foods[6] in sim.food_index
+
+    sim.clear()
+    assert len(sim.food_index) == 0
+
+
+def test_scheduled_world_changes():
+    sim = Simulation()
+    sim.bounds = (0, 720, -480, 0)
+    food = Food(size=(100, 100), coordinates=(300, -300), amount_of_food=5, move_after_number_of_epochs=3, move_randomly=True)
+    sim.add_food(food)
+    food.amount_of_food = 1
+    obstacle = Obstacle(coordinates=(600, -100))
+    sim.schedule_obstacle(2, obstacle)
+
+    sim.next_epoch()
+    assert obstacle not in sim.obstacles
+    sim.next_epoch()
+    assert obstacle in sim.obstacles
+    sim.next_epoch()
+    assert food.amount_of_food == 5
+    assert food.next_move_epoch == 6
+    assert food in sim.food_index
+
+    sim.remove_food(food)
+    sim.next_epoch()
+    sim.next_epoch()
+    sim.next_epoch()
+    assert len(sim.scheduler) == 0
+
+
 def test_check_future_position():
     sim = Simulation()
 
@@ -55,6 +110,122 @@ def test_check_future_position():
     assert np.array_equal(adjusted_position, expected_adjusted_position)
 
 
+def test_check_for_obstacles_slides_along_wall():
+    sim = Simulation()
+    sim.bounds = (0, 200, -200, 0)
+    sim.add_obstacle(Obstacle(coordinates=(100, -200), size=(50, 200)))
+
+    adjusted_position = sim.check_future_position([102, -50], current_position=(97, -54))
+    assert np.allclose(adjusted_position, [100, -50], atol=0.05) and adjusted_position[0] < 100
+
+    adjusted_position = sim.check_future_position([120, -50])
+    assert not sim.get_occupancy().is_blocked(*adjusted_position)
+
+    sim.remove_obstacle(sim.obstacles[0])
+    assert np.array_equal(sim.check_future_position([120, -50]), [120, -50])
+
+
+def test_resolve_moves_prevents_tunneling():
+    sim = Simulation()
+    sim.bounds = (0, 200, -200, 0)
+    sim.add_obstacle(Obstacle(coordinates=(100, -200), size=(5, 200)))
+
+    starts = np.array([[90.0, -50.0], [90.0, -50.0], [110.0, -100.0], [20.0, -20.0]])
+    ends = np.array([[130.0, -50.0], [130.0, -20.0], [80.0, -100.0], [40.0, -40.0]])
+    resolved = sim.resolve_moves(starts, ends)
+
+    assert resolved[0, 0] < 100 and resolved[0, 1] == -50
+    assert resolved[1, 0] < 100 and resolved[1, 1] == -20
+    assert resolved[2, 0] >= 105
+    assert np.array_equal(resolved[3], [40, -40])
+
+
+def test_placement_in_free_space():
+    sim = Simulation()
+    sim.bounds = (0, 720, -480, 0)
+    colony = Colony(grid_pheromone_shape=(10, 10), amount=1, size=(100, 100), coordinates=(300, -300), color=(1, 1, 1, 1))
+    sim.add_colony(colony)
+    sim.add_obstacle(Obstacle(coordinates=(320, -280), size=(50, 50)))
+    assert not sim.check_object_collision_with_obstacles(colony.coordinates, colony.size)
+
+    rng = np.random.default_rng(0)
+    for x, y in rng.uniform((0, -480), (670, -50), (30, 2)):
+        sim.add_obstacle(Obstacle(coordinates=(x, y)))
+    foods = [Food(size=(100, 100), coordinates=tuple(position), amount_of_food=1) for position in rng.uniform((0, -480), (620, -100), (50, 2))]
+    for food in foods:
+        sim.add_food(food)
+    assert not any(sim.check_object_collision_with_obstacles(food.coordinates, food.size) for food in foods)
+
+
+def test_add_obstacles_checks_only_nearby_objects():
+    sim = Simulation()
+    sim.bounds = (0, 720, -480, 0)
+    colony = Colony(grid_pheromone_shape=(10, 10), amount=1, size=(100, 100), coordinates=(50, -150), color=(1, 1, 1, 1))
+    food = Food(size=(100, 100), coordinates=(500, -150), amount_of_food=1)
+    sim.add_colony(colony)
+    sim.add_food(food)
+
+    sim.add_obstacles([Obstacle(coordinates=(x, -450)) for x in range(0, 700, 60)])
+    assert sim.free_space is None
+
+    sim.add_obstacles([Obstacle(coordinates=(60, -140), size=(20, 20)), Obstacle(coordinates=(520, -120), size=(20, 20))])
+    assert sim.free_space is not None and sim.free_space.version == sim.occupancy.version
+    assert not sim.check_object_collision_with_obstacles(colony.coordinates, colony.size)
+    assert not sim.check_object_collision_with_obstacles(food.coordinates, food.size)
+
+
+def test_shared_pheromone_field():
+    def run(shared):
+        np.random.seed(1)
+        sim = Simulation()
+        sim.bounds = (0, 720, -480, 0)
+        sim.shared_pheromone = shared
+        sim.add_colony(Colony(grid_pheromone_shape=(48, 72), amount=20, size=(100, 100), coordinates=(100, -250), color=(1, 0, 0, 1)))
+        sim.add_colony(Colony(grid_pheromone_shape=(48, 72), amount=20, size=(100, 100), coordinates=(500, -250), color=(0, 0, 1, 1)))
+        sim.add_food(Food(size=(100, 100), coordinates=(300, -150), amount_of_food=1000))
+        for _ in range(20):
+            sim.next_epoch()
+        return sim
+
+    separate, shared = run(False), run(True)
+    assert shared.pheromone_field.values.shape == (2, 2, 48, 72)
+    for colony, shared_colony in zip(separate.colonies, shared.colonies):
+        np.testing.assert_allclose(shared_colony.pheromone.pheromone_array, colony.pheromone.pheromone_array)
+        np.testing.assert_allclose(shared_colony.get_ant_positions(), colony.get_ant_positions())
+
+    # a new colony rebuilds the field and keeps the pheromone of the others
+    shared.add_colony(Colony(grid_pheromone_shape=(48, 72), amount=5, size=(100, 100), coordinates=(300, -400), color=(0, 1, 0, 1)))
+    field = shared.get_pheromone_field()
+    assert field.values.shape[0] == 3
+    np.testing.assert_allclose(field.values[0], separate.colonies[0].pheromone.pheromone_array)
+
+
+def test_reconfigure_and_remove_shared_colonies():
+    sim = Simulation()
+    sim.bounds = (0, 720, -480, 0)
+    sim.shared_pheromone = True
+    sim.extra_pheromone_channels = (0.5,)
+    first = Colony(grid_pheromone_shape=(48, 72), amount=10, size=(100, 100), coordinates=(100, -250), color=(1, 0, 0, 1))
+    second = Colony(grid_pheromone_shape=(48, 72), amount=10, size=(100, 100), coordinates=(500, -250), color=(0, 0, 1, 1))
+    sim.add_colony(first)
+    sim.add_colony(second)
+    sim.next_epoch()
+    sim.pheromone_field.values[1, 2] = 1
+
+    with pytest.raises(ValueError):
+        first.reconfigure(grid_pheromone_shape=(24, 36))
+    sim.reconfigure_colony(first, amount=5, grid_pheromone_shape=(24, 36))
+    sim.next_epoch()
+    assert len(first.ants) == 5
+    assert sim.pheromone_field.values.shape == (2, 3, 24, 36)
+    assert np.allclose(sim.pheromone_field.values[1, 2], 0.5)
+
+    sim.remove_colony(first)
+    sim.next_epoch()
+    assert sim.pheromone_field.colonies == [second]
+    assert id(first) not in sim.flow_fields
+
+
 def test_map_ant_coordinates_to_pheromone_index():
     sim = Simulation()
 
@@ -117,6 +288,48 @@ def test_get_pheromone_position():
     assert max_pos_in_original_array is not None
 
 
+def test_map_positions_to_pheromone_indices():
+    sim = Simulation()
+    sim.bounds = (0, 720, -480, 0)
+    colony = Colony(grid_pheromone_shape=(10, 15), amount=1, size=(100, 100), coordinates=(0, 0), color=(0, 0, 0, 1))
+    positions = np.array([[0.5, -0.5], [300.0, -250.0], [719.0, -479.0]])
+
+    rows, cols = sim.map_positions_to_pheromone_indices(positions, colony)
+    for (x, y), row, col in zip(positions, rows, cols):
+        assert (row, col) == sim.map_ant_coordinates_to_pheromone_index((x, y), colony)
+
+
+def test_find_pheromone_gradients():
+    sim = Simulation()
+    sim.bounds = (0, 200, -200, 0)
+    colony = Colony(grid_pheromone_shape=(20, 20), amount=2, size=(100, 100), coordinates=(0, 0), color=(0, 0, 0, 1))
+    for ant in colony.ants:
+        ant.coordinates = (105.0, -105.0)
+        ant.search_radius = 3
+    colony.ants[1].pheromone_status = 1
+    # trail from the food to the east of the ants, trail from the colony to the north
+    colony.pheromone.pheromone_array[1, 10, 12] = 5
+    colony.pheromone.pheromone_array[0, 8, 10] = -5
+
+    sim.sensing_model = "gradient"
+    gradients = sim.find_pheromone_gradients(colony)
+    assert gradients.shape == (2, 2)
+    assert gradients[0, 0] > 0 and np.isclose(gradients[0, 1], 0)
+    assert gradients[1, 1] > 0 and np.isclose(gradients[1, 0], 0)
+    assert np.isclose(np.linalg.norm(gradients[0]), 3 * 10)
+
+    # an ant heading west does not sense the trail behind it
+    sim.sensing_model = "heading"
+    colony.ants[0].direction = np.array([-1.0, 0.0])
+    assert not sim.find_pheromone_gradients(colony)[0].any()
+
+    for _ in range(3):
+        sim.next_epoch()
+    sim.colonies.append(colony)
+    sim.next_epoch()
+    assert sim.epoch == 4
+
+
 def test_create_statistic():
     sim = Simulation()
 
@@ -173,8 +386,18 @@ if __name__ == "__main__":
     test_next_epoch()
     test_simulation_initialisation()
     test_add_colony_and_food()
+    test_food_index()
+    test_scheduled_world_changes()
     test_check_future_position()
+    test_check_for_obstacles_slides_along_wall()
+    test_resolve_moves_prevents_tunneling()
+    test_placement_in_free_space()
+    test_add_obstacles_checks_only_nearby_objects()
+    test_shared_pheromone_field()
+    test_reconfigure_and_remove_shared_colonies()
     test_map_ant_coordinates_to_pheromone_index()
     test_find_pheromone_trace()
     test_get_pheromone_position()
+    test_map_positions_to_pheromone_indices()
+    test_find_pheromone_gradients()
     test_create_statistic()
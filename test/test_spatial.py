@@ -0,0 +1,38 @@
+from resources.spatial import SpatialHash
+
+
+class Item:
+    pass
+
+
+def test_insert_query_remove():
+    spatial_hash = SpatialHash(cell_size=10)
+    near, far = Item(), Item()
+    spatial_hash.insert(near, 12, 12)
+    spatial_hash.insert(far, 55, 55)
+
+    assert len(spatial_hash) == 2
+    assert spatial_hash.query(5, 5) == [near]
+    assert far in spatial_hash.query(49, 61)
+
+    spatial_hash.remove(near)
+    assert near not in spatial_hash
+    assert spatial_hash.query(5, 5) == []
+    spatial_hash.remove(near)
+
+
+def test_update_moves_object():
+    spatial_hash = SpatialHash(cell_size=10)
+    item = Item()
+    spatial_hash.insert(item, 0, 0)
+    assert spatial_hash.query(1, 1) == [item]
+
+    spatial_hash.update(item, 100, -100)
+    assert spatial_hash.query(1, 1) == []
+    assert spatial_hash.query(105, -95) == [item]
+    assert len(spatial_hash) == 1
+
+
+if __name__ == "__main__":
+    test_insert_query_remove()
+    test_update_moves_object()
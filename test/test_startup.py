@@ -0,0 +1,49 @@
+import pytest
+import os
+import subprocess
+import sys
+
+# cumulative import time in milliseconds, measured at about 120 ms (headless) and 550 ms (GUI), with room for slow machines
+HEADLESS_BUDGET_MS = 500
+GUI_BUDGET_MS = 2000
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module, env=None):
+    """
+    Imports a module in a fresh interpreter with -X importtime and returns the cumulative time of every
+    imported module in milliseconds.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=PROJECT_DIR, capture_output=True, text=True, env={**os.environ, **(env or {})})
+    if result.returncode != 0:
+        return None
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def test_headless_import_time():
+    times = import_times("resources.run")
+    assert times is not None
+    assert times["resources.run"] < HEADLESS_BUDGET_MS
+    assert not {name.split(".")[0] for name in times} & {"kivy", "kivymd", "pandas", "matplotlib", "fpdf", "reportlab"}
+
+
+def test_gui_import_time():
+    pytest.importorskip("kivymd")
+    times = import_times("resources.gui", {"SDL_VIDEODRIVER": "offscreen", "KIVY_NO_ARGS": "1", "KIVY_NO_CONSOLELOG": "1"})
+    if times is None:
+        pytest.skip("Kivy can not open a window here")
+    assert times["resources.gui"] < GUI_BUDGET_MS
+    # the dialogs are imported when they are opened for the first time
+    assert not {"kivymd.uix.dialog", "kivymd.uix.textfield", "webbrowser", "pandas"} & set(times)
+
+
+if __name__ == "__main__":
+    test_headless_import_time()
+    test_gui_import_time()